@@ -1,7 +1,15 @@
 from app.apis.auth import api as auth_ns
 from app.apis.classes import api as classes_ns
+from app.apis.health import api as health_ns
+from app.apis.users import api as users_ns
 from app.config import Config
 from app.db import DB
+from app.db.indexes import ensure_and_check_indexes, indexes_cli
+from app.db.migrations import migrate_cli
+from app.codec import init_codec
+from app.services.password_hasher import init_password_hasher
+from app.services.scheduler import init_scheduler
+from app.services.reminders import init_auto_reminders, init_reminder_jobs
 
 from http import HTTPStatus
 from flask import Flask
@@ -14,6 +22,14 @@ def create_app():
     app.config.from_object(Config)
 
     DB.init_app(app)
+    if app.config["ENSURE_INDEXES_ON_STARTUP"]:
+        DB.on_connect(ensure_and_check_indexes)
+    app.cli.add_command(indexes_cli)
+    app.cli.add_command(migrate_cli)
+    init_password_hasher(app)
+    init_scheduler(app)
+    init_reminder_jobs(app)
+    init_auto_reminders(app)
     JWTManager(app)
 
     api = Api(
@@ -33,8 +49,11 @@ def create_app():
     )
 
     api.init_app(app)
+    init_codec(app, api)
     api.add_namespace(auth_ns)
     api.add_namespace(classes_ns)
+    api.add_namespace(users_ns)
+    api.add_namespace(health_ns)
 
     @api.errorhandler(Exception)
     def handle_input_validation_error(error):
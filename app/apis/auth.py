@@ -2,11 +2,33 @@ from flask_restx import Namespace, Resource, fields
 from flask import request
 from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity
 from app.db.users import UserResource, VALID_CHANNELS
+from app.services.password_hasher import PasswordPoolSaturated
 from http import HTTPStatus
 
 
 api = Namespace("auth", description="Authentication operations")
 
+RETRY_AFTER_SECONDS = 1
+
+
+def profile_claims(user: dict) -> dict:
+    """
+    Token claims for a user. name and phone ride along so booking can build
+    the participant snapshot without reading the user back; any endpoint
+    that changes them must issue fresh tokens.
+    """
+    return {
+        "id": user["_id"],
+        "email": user["email"],
+        "role": user["role"],
+        "name": user.get("name", ""),
+        "phone": user.get("phone", ""),
+    }
+
+
+def _password_pool_busy(error):
+    return {"message": str(error)}, HTTPStatus.SERVICE_UNAVAILABLE, {"Retry-After": str(RETRY_AFTER_SECONDS)}
+
 REGISTER_MODEL = api.model("Register", {
     "name": fields.String(required=True, description="User's full name", example="Paulo Opande"),
     "email": fields.String(required=True, description="User's email address", example="paulo@upande.ea"),
@@ -70,6 +92,7 @@ class Register(Resource):
     @api.response(HTTPStatus.CREATED, "User registered successfully")
     @api.response(HTTPStatus.BAD_REQUEST, "Missing required fields")
     @api.response(HTTPStatus.CONFLICT, "User already exists")
+    @api.response(HTTPStatus.SERVICE_UNAVAILABLE, "Too many concurrent password operations")
     def post(self):
         """Register a new user (email, phone, password required)"""
         data = request.json
@@ -105,6 +128,8 @@ class Register(Resource):
                 telegram_chat_id=telegram_chat_id,
             )
             return {"message": "User registered successfully","user_id": user_id}, HTTPStatus.CREATED
+        except PasswordPoolSaturated as e:
+            return _password_pool_busy(e)
         except ValueError as e:
             return {"message": str(e)}, HTTPStatus.CONFLICT
         except Exception as e:
@@ -116,6 +141,7 @@ class Login(Resource):
     @api.expect(LOGIN_MODEL)
     @api.response(HTTPStatus.OK, "Login successful", TOKEN_RESPONSE_MODEL)
     @api.response(HTTPStatus.UNAUTHORIZED, "Invalid credentials")
+    @api.response(HTTPStatus.SERVICE_UNAVAILABLE, "Too many concurrent password operations")
     def post(self):
         """Login with email and password — returns JWT access and refresh tokens"""
         data = request.json
@@ -129,12 +155,15 @@ class Login(Resource):
             return {"message": "email and password are required"}, HTTPStatus.BAD_REQUEST
 
         user_resource = UserResource()
-        user = user_resource.authenticate_user(email, password)
+        try:
+            user = user_resource.authenticate_user(email, password)
+        except PasswordPoolSaturated as e:
+            return _password_pool_busy(e)
 
         if not user:
             return {"message": "Invalid email or password"}, HTTPStatus.UNAUTHORIZED
 
-        claims = {"id": user["_id"], "email": user["email"], "role": user["role"]}
+        claims = profile_claims(user)
         access_token = create_access_token(identity=user["email"], additional_claims=claims)
         refresh_token = create_refresh_token(identity=user["email"], additional_claims=claims)
 
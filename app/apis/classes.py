@@ -1,15 +1,19 @@
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from app.apis import MSG
-from app.db.fitness_classes import FitnessClassResource
+from app.db.fitness_classes import FitnessClassResource, encode_class_cursor, class_datetimes, current_minute
 from app.db.fitness_classes import (
    NAME, DESCRIPTION, DATE, START_TIME, END_TIME,
    LOCATION, TRAINER, CAPACITY, AVAILABLE_SLOTS, PARTICIPANTS, CREATED_BY,
+   START_AT, END_AT, DATE_FORMAT,
 )
 from app.db.users import UserResource
+from app.db.reminder_jobs import ReminderJobResource
+from app.services.reminders import enqueue_reminder_job
 from app.db.booking_result import BookingResult
 from http import HTTPStatus
-from flask import request
+from flask import Response, request, stream_with_context
+from app.codec import current_codec
 from datetime import datetime, timedelta
 
 
@@ -25,13 +29,29 @@ _EXAMPLE_CLASS = {
    TRAINER: "Jane Doe",
    CAPACITY: 10,
    AVAILABLE_SLOTS: 10,
-   PARTICIPANTS: [],
    CREATED_BY: "admin@example.com",
 }
 
 VALID_RECURRENCES = {"daily", "weekly"}
-MAX_RECURRENCE_COUNT = 10
+MAX_RECURRENCE_COUNT = 365
 BOOKING_DEADLINE_MINUTES = 30
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+NDJSON_MIMETYPE = "application/x-ndjson"
+# Clients may store catalogue responses but must revalidate them (cheap 304s)
+CATALOGUE_CACHE_CONTROL = "public, no-cache"
+
+LIST_PARAMS = {
+    "limit": f"Page size (1–{MAX_PAGE_SIZE}, default {DEFAULT_PAGE_SIZE})",
+    "after": "Cursor returned as next_cursor by the previous page",
+    "date_from": "Only classes on or after this date (YYYY-MM-DD)",
+    "date_to": "Only classes on or before this date (YYYY-MM-DD)",
+    "trainer": "Only classes led by this trainer",
+    "location": "Only classes at this location",
+    "upcoming": "Only classes that have not started yet (true/false, default true)",
+}
+STREAMING_NOTE = (f" Send 'Accept: {NDJSON_MIMETYPE}' to stream one JSON document per line instead;"
+                  " streamed listings are not paginated unless a limit is given.")
 
 CLASS_CREATE_FLDS = api.model(
     "NewClassEntry",
@@ -70,6 +90,8 @@ CLASS_VIEW_FLDS = api.model(
        TRAINER: fields.String,
        CAPACITY: fields.Integer,
        AVAILABLE_SLOTS: fields.Integer,
+       START_AT: fields.DateTime(dt_format="iso8601"),
+       END_AT: fields.DateTime(dt_format="iso8601"),
    },
 )
 
@@ -82,17 +104,67 @@ PARTICIPANT_FLDS = api.model(
    },
 )
 
-def _parse_class_datetime(fitness_class: dict) -> datetime | None:
-   try:
-       date_str = fitness_class.get(DATE, "")
-       time_str = fitness_class.get(START_TIME, "")
-       return datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M")
-   except (ValueError, TypeError):
-       return None
+def _parse_list_args(args, streaming: bool = False):
+    limit = None
+    if "limit" in args or not streaming:
+        try:
+            limit = int(args.get("limit", DEFAULT_PAGE_SIZE))
+        except ValueError:
+            limit = 0
+        if streaming and limit < 1:
+            return None, ({MSG: "limit must be a positive integer"}, HTTPStatus.BAD_REQUEST)
+        if not streaming and not 1 <= limit <= MAX_PAGE_SIZE:
+            return None, ({MSG: f"limit must be an integer between 1 and {MAX_PAGE_SIZE}"}, HTTPStatus.BAD_REQUEST)
+
+    for key in ("date_from", "date_to"):
+        if key in args:
+            try:
+                datetime.strptime(args[key], DATE_FORMAT)
+            except ValueError:
+                return None, ({MSG: f"{key} must use YYYY-MM-DD"}, HTTPStatus.BAD_REQUEST)
+
+    return {
+        "limit": limit,
+        "after": args.get("after"),
+        "date_from": args.get("date_from"),
+        "date_to": args.get("date_to"),
+        "trainer": args.get("trainer"),
+        "location": args.get("location"),
+        "upcoming_only": args.get("upcoming", "true").lower() != "false",
+    }, None
+
+
+def _wants_ndjson() -> bool:
+    return request.accept_mimetypes.best_match(["application/json", NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+
+def _ndjson_response(documents):
+    """Stream documents as newline-delimited JSON while they are read from the cursor."""
+    codec = current_codec()
+    lines = (codec.dumps(document) + b"\n" for document in documents)
+    return Response(stream_with_context(lines), mimetype=NDJSON_MIMETYPE)
 
 
-def _fetch_class_or_404(class_id: str):
-    fitness_class = FitnessClassResource().get_fitness_class_by_id(class_id)
+def _catalogue_headers(etag: str) -> dict:
+    return {"ETag": f'"{etag}"', "Cache-Control": CATALOGUE_CACHE_CONTROL}
+
+
+def _not_modified(etag: str):
+    """A 304 for etag if the client already holds it, else None."""
+    if request.if_none_match.contains(etag):
+        return Response(status=HTTPStatus.NOT_MODIFIED, headers=_catalogue_headers(etag))
+    return None
+
+
+def _participant_from_claims(claims):
+   """Booking snapshot (name, email, phone) from token claims; None for tokens issued before those claims"""
+   if "name" not in claims or "phone" not in claims:
+      return None
+   return {"name": claims["name"], "email": claims.get("email", ""), "phone": claims["phone"]}
+
+
+def _fetch_class_or_404(class_id: str, version: int = None):
+    fitness_class = FitnessClassResource().get_fitness_class_by_id(class_id, version=version)
     if fitness_class is None:
         return None, ({MSG: "Class not found"}, HTTPStatus.NOT_FOUND)
     return fitness_class, None
@@ -114,9 +186,8 @@ def _validate_class_fields(data: dict):
     if not isinstance(capacity, int) or capacity <= 0:
         return None, ({MSG: "Capacity must be a positive integer"}, HTTPStatus.BAD_REQUEST)
 
-    try:
-        class_start = datetime.strptime(f"{date} {start_time}", "%Y-%m-%d %H:%M")
-    except ValueError:
+    class_start, _ = class_datetimes(date, start_time, end_time)
+    if class_start is None:
         return None, ({MSG: "Invalid date or start_time format. Use YYYY-MM-DD and HH:MM"}, HTTPStatus.BAD_REQUEST)
 
     if class_start < datetime.now():
@@ -131,15 +202,51 @@ def _validate_class_fields(data: dict):
 
 @api.route("/")
 class FitnessClassList(Resource):
-    @api.doc(description=" Returns all fitness classes. Accessible to guests, members, and admins.")
+    @api.doc(description=" Returns fitness classes one page at a time. Accessible to guests, members, and admins."
+             + STREAMING_NOTE, params=LIST_PARAMS)
     @api.response(
         HTTPStatus.OK,
         "Success")
+    @api.response(HTTPStatus.NOT_MODIFIED, "Client copy is current (If-None-Match)")
+    @api.response(HTTPStatus.BAD_REQUEST, "Invalid filter or cursor")
 
     def get(self):
          """List all upcoming fitness classes (public)"""
-         class_list = FitnessClassResource().get_fitness_classes()
-         return {MSG: class_list}, HTTPStatus.OK
+         streaming = _wants_ndjson()
+         list_args, error = _parse_list_args(request.args, streaming)
+         if error:
+             return error
+
+         if streaming:
+             try:
+                 classes = FitnessClassResource().iter_fitness_classes(**list_args)
+             except ValueError as e:
+                 return {MSG: str(e)}, HTTPStatus.BAD_REQUEST
+             return _ndjson_response(classes)
+
+         fc_resource = FitnessClassResource()
+         # The body is read at the same version, so it always matches the ETag
+         version = fc_resource.catalogue_version()
+         # Upcoming-only pages also change as classes start, which happens on minute boundaries
+         etag = str(version)
+         if list_args["upcoming_only"]:
+             etag += current_minute().strftime("-%Y%m%d%H%M")
+         not_modified = _not_modified(etag)
+         if not_modified:
+             return not_modified
+
+         page_size = list_args["limit"]
+         list_args["limit"] = page_size + 1
+         try:
+             class_list = fc_resource.get_fitness_classes(**list_args, version=version)
+         except ValueError as e:
+             return {MSG: str(e)}, HTTPStatus.BAD_REQUEST
+
+         next_cursor = None
+         if len(class_list) > page_size:
+             class_list = class_list[:page_size]
+             next_cursor = encode_class_cursor(class_list[-1])
+         return {MSG: class_list, "next_cursor": next_cursor}, HTTPStatus.OK, _catalogue_headers(etag)
 
     @api.expect(CLASS_CREATE_FLDS)
     @api.doc(description="Create a new fitness class. Admin only.", security="Bearer Auth")
@@ -191,6 +298,27 @@ class FitnessClassList(Resource):
        )
        return {MSG: f"Fitness class created with id: {class_id}"}, HTTPStatus.CREATED
 
+@api.route("/<string:class_id>")
+@api.param("class_id", "The fitness class identifier")
+class FitnessClassDetail(Resource):
+    @api.doc(description="Returns one fitness class. Accessible to guests, members, and admins.")
+    @api.response(HTTPStatus.OK, "Success")
+    @api.response(HTTPStatus.NOT_MODIFIED, "Client copy is current (If-None-Match)")
+    @api.response(HTTPStatus.NOT_FOUND, "Class not found")
+    def get(self, class_id):
+        """Get a fitness class (public)"""
+        version = FitnessClassResource().catalogue_version()
+        etag = str(version)
+        not_modified = _not_modified(etag)
+        if not_modified:
+            return not_modified
+
+        fitness_class, error = _fetch_class_or_404(class_id, version)
+        if error:
+            return error
+        fitness_class = {k: v for k, v in fitness_class.items() if k != PARTICIPANTS}
+        return {MSG: fitness_class}, HTTPStatus.OK, _catalogue_headers(etag)
+
 @api.route("/<string:class_id>/book")
 @api.param("class_id", "The fitness class identifier")
 class BookClass(Resource):
@@ -207,32 +335,26 @@ class BookClass(Resource):
        if claims.get("role") != "member":
            return {MSG: "Member role required to book a class"}, HTTPStatus.FORBIDDEN
 
-       fitness_class, error = _fetch_class_or_404(class_id)
-       if error:
-           return error
-
-       class_start = _parse_class_datetime(fitness_class)
-       if class_start is not None:
-           booking_deadline = class_start + timedelta(minutes=BOOKING_DEADLINE_MINUTES)
-           if datetime.now() > booking_deadline:
-               return {MSG: "Booking deadline has passed (30 minutes after class start)"}, HTTPStatus.BAD_REQUEST
-
-       user_email = claims.get("email", "")
-       user_resource = UserResource()
-       user = user_resource.get_user_by_email(user_email)
-       if user is None:
-           return {MSG: "User not found"}, HTTPStatus.NOT_FOUND
-
-       participant = {
-           "name": user.get("name", ""),
-           "email": user.get("email", ""),
-           "phone": user.get("phone", ""),
-       }
-
-       result = FitnessClassResource().book_class(class_id, participant)
+       participant = _participant_from_claims(claims)
+       if participant is None:
+           # Tokens issued before profile claims existed still need the lookup
+           user = UserResource().get_user_by_email(claims.get("email", ""))
+           if user is None:
+               return {MSG: "User not found"}, HTTPStatus.NOT_FOUND
+           participant = {
+               "name": user.get("name", ""),
+               "email": user.get("email", ""),
+               "phone": user.get("phone", ""),
+           }
+
+       # Booking stays open until BOOKING_DEADLINE_MINUTES after the class starts
+       starts_after = datetime.now() - timedelta(minutes=BOOKING_DEADLINE_MINUTES)
+       result = FitnessClassResource().book_class(class_id, participant, starts_after=starts_after)
 
        if result == BookingResult.NOT_FOUND:
            return {MSG: "Class not found"}, HTTPStatus.NOT_FOUND
+       if result == BookingResult.DEADLINE_PASSED:
+           return {MSG: "Booking deadline has passed (30 minutes after class start)"}, HTTPStatus.BAD_REQUEST
        if result == BookingResult.ALREADY_BOOKED:
            return {MSG: "You have already booked this class"}, HTTPStatus.BAD_REQUEST
        if result == BookingResult.CLASS_FULL:
@@ -243,7 +365,7 @@ class BookClass(Resource):
 @api.route("/<string:class_id>/participants")
 @api.param("class_id", "The fitness class identifier")
 class ClassParticipants(Resource):
-   @api.doc(description="View participants of a fitness class. Admin only.", security="Bearer Auth")
+   @api.doc(description="View participants of a fitness class. Admin only." + STREAMING_NOTE, security="Bearer Auth")
    @api.response(HTTPStatus.OK, "Success")
    @api.response(HTTPStatus.UNAUTHORIZED, "Not authenticated")
    @api.response(HTTPStatus.FORBIDDEN, "Admin role required")
@@ -257,6 +379,12 @@ class ClassParticipants(Resource):
 
 
        fitness_class_resource = FitnessClassResource()
+       if _wants_ndjson():
+           participants = fitness_class_resource.iter_participants(class_id)
+           if participants is None:
+               return {MSG: "Class not found"}, HTTPStatus.NOT_FOUND
+           return _ndjson_response(participants)
+
        participants = fitness_class_resource.get_participants(class_id)
 
 
@@ -269,14 +397,18 @@ class ClassParticipants(Resource):
 @api.route("/<string:class_id>/remind")
 @api.param("class_id", "The fitness class identifier")
 class ClassReminder(Resource):
-  @api.doc(description="Send reminders to class participants via their chosen channels. Trainer/Admin only.", security="Bearer Auth")
-  @api.response(HTTPStatus.OK, "Reminders sent")
+  @api.doc(
+      description="Queue reminders to class participants via their chosen channels. "
+                  "Returns 202 with a job id; poll /classes/reminders/<job_id> for progress. Trainer/Admin only.",
+      security="Bearer Auth",
+  )
+  @api.response(HTTPStatus.ACCEPTED, "Reminder job queued")
   @api.response(HTTPStatus.NOT_FOUND, "Class not found")
   @api.response(HTTPStatus.BAD_REQUEST, "No participants or class already started")
   @api.response(HTTPStatus.FORBIDDEN, "Trainer or Admin role required")
   @jwt_required()
   def post(self, class_id):
-      """Send reminders to all participants via their chosen channels (trainer/admin, Bearer token required)"""
+      """Queue reminders to all participants via their chosen channels (trainer/admin, Bearer token required)"""
       claims = get_jwt()
       if claims.get("role") not in ("trainer", "admin"):
           return {MSG: "Trainer or Admin role required"}, HTTPStatus.FORBIDDEN
@@ -285,46 +417,36 @@ class ClassReminder(Resource):
       if error:
           return error
 
-      class_start = _parse_class_datetime(fitness_class)
+      class_start = fitness_class.get(START_AT)
       if class_start is not None and datetime.now() > class_start:
           return {MSG: "Cannot send reminders for a class that has already started"}, HTTPStatus.BAD_REQUEST
 
-      fc_resource = FitnessClassResource()
-      if not fc_resource.has_participants(class_id):
+      if not FitnessClassResource().has_participants(class_id):
           return {MSG: "No participants to remind"}, HTTPStatus.BAD_REQUEST
 
-      from app.services.email_service import EmailService
-      from app.services.notifier import EmailNotifier, TelegramNotifier
-      from app.config import Config
-
-      notifier_registry = {
-          "email": EmailNotifier(EmailService()),
-          "telegram": TelegramNotifier(Config.TELEGRAM_BOT_TOKEN),
-      }
-
-      user_resource = UserResource()
-      participants = fitness_class.get(PARTICIPANTS, [])
-      participants_reached = 0
-
-      for participant in participants:
-          email = participant.get("email", "") if isinstance(participant, dict) else participant
-          user = user_resource.get_user_by_email(email)
-          channels = user.get("notification_channels", ["email"]) if user else ["email"]
-          recipient = {
-              **(participant if isinstance(participant, dict) else {"email": participant}),
-              "telegram_chat_id": user.get("telegram_chat_id", "") if user else "",
-          }
-          participant_notified = False
-          for channel in channels:
-              notifier = notifier_registry.get(channel)
-              if notifier is None:
-                  continue
-              try:
-                  notifier.send_reminder(recipient, fitness_class)
-                  participant_notified = True
-              except Exception:
-                  continue
-          if participant_notified:
-              participants_reached += 1
-
-      return {MSG: f"Reminders sent to {participants_reached} participants"}, HTTPStatus.OK
+      job_id = enqueue_reminder_job(class_id, claims.get("email", ""))
+      return (
+          {MSG: "Reminder job queued", "job_id": job_id},
+          HTTPStatus.ACCEPTED,
+          {"Location": self.api.url_for(ReminderJobStatus, job_id=job_id)},
+      )
+
+
+@api.route("/reminders/<string:job_id>")
+@api.param("job_id", "The reminder job identifier")
+class ReminderJobStatus(Resource):
+  @api.doc(description="Progress of a reminder job. Trainer/Admin only.", security="Bearer Auth")
+  @api.response(HTTPStatus.OK, "Job status")
+  @api.response(HTTPStatus.NOT_FOUND, "Job not found")
+  @api.response(HTTPStatus.FORBIDDEN, "Trainer or Admin role required")
+  @jwt_required()
+  def get(self, job_id):
+      """Status, progress and per-channel counts of a reminder job (trainer/admin, Bearer token required)"""
+      claims = get_jwt()
+      if claims.get("role") not in ("trainer", "admin"):
+          return {MSG: "Trainer or Admin role required"}, HTTPStatus.FORBIDDEN
+
+      job = ReminderJobResource().get_job(job_id)
+      if job is None:
+          return {MSG: "Reminder job not found"}, HTTPStatus.NOT_FOUND
+      return {MSG: job}, HTTPStatus.OK
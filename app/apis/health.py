@@ -0,0 +1,66 @@
+from flask_restx import Namespace, Resource
+from flask_jwt_extended import jwt_required, get_jwt
+from app.apis import MSG
+from app.db import DB
+from app.db.indexes import missing_indexes
+from app.db.fitness_classes import class_cache
+from app.db.users import user_cache
+from app.services.password_hasher import password_hasher
+from http import HTTPStatus
+
+
+api = Namespace("health", description="Liveness and readiness probes")
+
+
+@api.route("/live")
+class Liveness(Resource):
+    @api.response(HTTPStatus.OK, "Process is up")
+    def get(self):
+        """Liveness probe; does not touch the database"""
+        return {MSG: "alive"}, HTTPStatus.OK
+
+
+@api.route("/ready")
+class Readiness(Resource):
+    @api.response(HTTPStatus.OK, "Database reachable")
+    @api.response(HTTPStatus.SERVICE_UNAVAILABLE, "Database unreachable or indexes missing")
+    def get(self):
+        """Readiness probe; checks this worker can reach MongoDB and its indexes exist"""
+        try:
+            DB.ping()
+            missing = missing_indexes()
+        except Exception as e:
+            return {MSG: f"Database unavailable: {e}"}, HTTPStatus.SERVICE_UNAVAILABLE
+        if missing:
+            names = ", ".join(f"{collection}.{name}" for collection, names in missing.items() for name in names)
+            return {MSG: f"Missing indexes: {names}"}, HTTPStatus.SERVICE_UNAVAILABLE
+        return {MSG: "ready"}, HTTPStatus.OK
+
+
+@api.route("/cache")
+class CacheStats(Resource):
+    @api.doc(description="Cache counters of the worker that answers. Admin only.", security="Bearer Auth")
+    @api.response(HTTPStatus.OK, "Cache counters for this worker")
+    @api.response(HTTPStatus.UNAUTHORIZED, "Not authenticated")
+    @api.response(HTTPStatus.FORBIDDEN, "Admin role required")
+    @jwt_required()
+    def get(self):
+        """Hit/miss counters of this worker's class catalogue and user profile caches (admin)"""
+        if get_jwt().get("role") != "admin":
+            return {MSG: "Admin role required"}, HTTPStatus.FORBIDDEN
+        return {MSG: {"classes": class_cache.stats(), "users": user_cache.stats()}}, HTTPStatus.OK
+
+
+@api.route("/passwords")
+class PasswordPoolStats(Resource):
+    @api.doc(description="Password hashing pool counters of the worker that answers. Admin only.",
+             security="Bearer Auth")
+    @api.response(HTTPStatus.OK, "Password hashing pool counters for this worker")
+    @api.response(HTTPStatus.UNAUTHORIZED, "Not authenticated")
+    @api.response(HTTPStatus.FORBIDDEN, "Admin role required")
+    @jwt_required()
+    def get(self):
+        """Queue depth and rejection counters of this worker's password hashing pool (admin)"""
+        if get_jwt().get("role") != "admin":
+            return {MSG: "Admin role required"}, HTTPStatus.FORBIDDEN
+        return {MSG: password_hasher.stats()}, HTTPStatus.OK
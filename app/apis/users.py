@@ -0,0 +1,60 @@
+from flask_restx import Namespace, Resource
+from flask_jwt_extended import jwt_required, get_jwt
+from flask import request
+from app.apis import MSG
+from app.db.users import UserResource, encode_user_cursor
+from http import HTTPStatus
+
+
+api = Namespace("users", description="User administration")
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+SEARCH_PARAMS = {
+    "name": "Name search term (case and accent insensitive)",
+    "match": "prefix (full name starts with the term, default) or token (any word starts with it)",
+    "role": "Only users with this role: member, trainer or admin",
+    "limit": f"Page size (1–{MAX_PAGE_SIZE}, default {DEFAULT_PAGE_SIZE})",
+    "after": "Cursor returned as next_cursor by the previous page",
+}
+
+
+@api.route("/")
+class UserSearch(Resource):
+    @api.doc(description="Search users by name and role, one page at a time. Admin only.",
+             params=SEARCH_PARAMS, security="Bearer Auth")
+    @api.response(HTTPStatus.OK, "Success")
+    @api.response(HTTPStatus.BAD_REQUEST, "Invalid search parameters")
+    @api.response(HTTPStatus.UNAUTHORIZED, "Not authenticated")
+    @api.response(HTTPStatus.FORBIDDEN, "Admin role required")
+    @jwt_required()
+    def get(self):
+        """Search users (admin, Bearer token required)"""
+        claims = get_jwt()
+        if claims.get("role") != "admin":
+            return {MSG: "Admin role required"}, HTTPStatus.FORBIDDEN
+
+        try:
+            limit = int(request.args.get("limit", DEFAULT_PAGE_SIZE))
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            return {MSG: f"limit must be an integer between 1 and {MAX_PAGE_SIZE}"}, HTTPStatus.BAD_REQUEST
+
+        try:
+            users = UserResource().get_users(
+                name=request.args.get("name"),
+                role=request.args.get("role"),
+                limit=limit + 1,
+                after=request.args.get("after"),
+                match=request.args.get("match", "prefix"),
+            )
+        except ValueError as e:
+            return {MSG: str(e)}, HTTPStatus.BAD_REQUEST
+
+        next_cursor = None
+        if len(users) > limit:
+            users = users[:limit]
+            next_cursor = encode_user_cursor(users[-1])
+        return {MSG: users, "next_cursor": next_cursor}, HTTPStatus.OK
@@ -0,0 +1,71 @@
+import json
+from abc import ABC, abstractmethod
+
+from flask import current_app, make_response
+
+from app.db.utils import json_default
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+
+class JsonCodec(ABC):
+    """Encodes response payloads; ObjectId, datetime and bytes are handled natively."""
+
+    name = ""
+
+    @abstractmethod
+    def dumps(self, data) -> bytes:
+        pass
+
+
+class StdlibJsonCodec(JsonCodec):
+    name = "json"
+
+    def dumps(self, data) -> bytes:
+        return json.dumps(data, default=json_default, separators=(",", ":")).encode("utf-8")
+
+
+class OrjsonCodec(JsonCodec):
+    name = "orjson"
+
+    def dumps(self, data) -> bytes:
+        # orjson encodes datetime itself; json_default covers ObjectId and bytes
+        return orjson.dumps(data, default=json_default)
+
+
+def create_codec(name: str = "auto") -> JsonCodec:
+    """
+    Build the codec called name. "auto" picks orjson when it is installed and
+    falls back to the standard library otherwise.
+    """
+    if name == "auto":
+        name = "orjson" if orjson is not None else "json"
+    if name == "orjson":
+        if orjson is None:
+            raise ValueError("JSON_CODEC=orjson but orjson is not installed")
+        return OrjsonCodec()
+    if name == "json":
+        return StdlibJsonCodec()
+    raise ValueError(f"Unknown JSON codec: {name}")
+
+
+def current_codec() -> JsonCodec:
+    return current_app.extensions["json_codec"]
+
+
+def init_codec(app, api):
+    """Use the configured codec for the app and every flask-restx JSON response."""
+    codec = create_codec(app.config["JSON_CODEC"])
+    app.extensions["json_codec"] = codec
+
+    def output_json(data, code, headers=None):
+        response = make_response(codec.dumps(data) + b"\n", code)
+        response.headers.extend(headers or {})
+        response.mimetype = "application/json"
+        return response
+
+    api.representations["application/json"] = output_json
+    return codec
@@ -26,6 +26,43 @@ class Config(object):
     DEBUG = get_required_environ("DEBUG").lower() == "true"
     JWT_SECRET_KEY = get_required_environ("JWT_SECRET_KEY")
     AWS_SES_REGION = get_required_environ("AWS_SES_REGION")
+    SES_REMINDER_TEMPLATE = get_optional_environ("SES_REMINDER_TEMPLATE", "FitnessClassReminder")
     TELEGRAM_BOT_TOKEN = get_optional_environ("TELEGRAM_BOT_TOKEN")
+    TELEGRAM_POOL_SIZE = int(get_optional_environ("TELEGRAM_POOL_SIZE", "8"))
+    TELEGRAM_CONNECT_TIMEOUT_SECONDS = float(get_optional_environ("TELEGRAM_CONNECT_TIMEOUT_SECONDS", "3.05"))
+    TELEGRAM_READ_TIMEOUT_SECONDS = float(get_optional_environ("TELEGRAM_READ_TIMEOUT_SECONDS", "10"))
+    TELEGRAM_MAX_RETRIES = int(get_optional_environ("TELEGRAM_MAX_RETRIES", "3"))
+    MONGO_MAX_POOL_SIZE = int(get_optional_environ("MONGO_MAX_POOL_SIZE", "50"))
+    MONGO_MIN_POOL_SIZE = int(get_optional_environ("MONGO_MIN_POOL_SIZE", "0"))
+    MONGO_CONNECT_TIMEOUT_MS = int(get_optional_environ("MONGO_CONNECT_TIMEOUT_MS", "5000"))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = int(get_optional_environ("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+    MONGO_SOCKET_TIMEOUT_MS = int(get_optional_environ("MONGO_SOCKET_TIMEOUT_MS", "30000"))
+    CLASS_CACHE_ENABLED = get_optional_environ("CLASS_CACHE_ENABLED", "true").lower() == "true"
+    CLASS_CACHE_MAX_ENTRIES = int(get_optional_environ("CLASS_CACHE_MAX_ENTRIES", "256"))
+    CLASS_CACHE_TTL_SECONDS = float(get_optional_environ("CLASS_CACHE_TTL_SECONDS", "10"))
+    CLASS_CACHE_VERSION_MAX_AGE_SECONDS = float(get_optional_environ("CLASS_CACHE_VERSION_MAX_AGE_SECONDS", "1"))
+    USER_CACHE_ENABLED = get_optional_environ("USER_CACHE_ENABLED", "true").lower() == "true"
+    USER_CACHE_MAX_ENTRIES = int(get_optional_environ("USER_CACHE_MAX_ENTRIES", "1024"))
+    USER_CACHE_TTL_SECONDS = float(get_optional_environ("USER_CACHE_TTL_SECONDS", "30"))
+    PASSWORD_HASH_WORKERS = int(get_optional_environ("PASSWORD_HASH_WORKERS", "2"))
+    PASSWORD_HASH_MAX_PENDING = int(get_optional_environ("PASSWORD_HASH_MAX_PENDING", "8"))
+    PASSWORD_HASH_TIMEOUT_SECONDS = float(get_optional_environ("PASSWORD_HASH_TIMEOUT_SECONDS", "30"))
+    BCRYPT_ROUNDS = int(get_optional_environ("BCRYPT_ROUNDS") or 0)
+    BCRYPT_TARGET_MS = float(get_optional_environ("BCRYPT_TARGET_MS", "250"))
+    BCRYPT_CALIBRATE_ON_STARTUP = get_optional_environ("BCRYPT_CALIBRATE_ON_STARTUP", "false").lower() == "true"
+    NOTIFY_EMAIL_CONCURRENCY = int(get_optional_environ("NOTIFY_EMAIL_CONCURRENCY", "8"))
+    NOTIFY_TELEGRAM_CONCURRENCY = int(get_optional_environ("NOTIFY_TELEGRAM_CONCURRENCY", "8"))
+    NOTIFY_DEADLINE_SECONDS = float(get_optional_environ("NOTIFY_DEADLINE_SECONDS", "60"))
+    # Sends per second per worker; 0 disables the limiter for that channel
+    NOTIFY_EMAIL_RATE_PER_SECOND = float(get_optional_environ("NOTIFY_EMAIL_RATE_PER_SECOND", "14"))
+    NOTIFY_TELEGRAM_RATE_PER_SECOND = float(get_optional_environ("NOTIFY_TELEGRAM_RATE_PER_SECOND", "25"))
+    REMINDER_JOB_WORKERS = int(get_optional_environ("REMINDER_JOB_WORKERS", "2"))
+    REMINDER_JOB_HEARTBEAT_SECONDS = float(get_optional_environ("REMINDER_JOB_HEARTBEAT_SECONDS", "30"))
+    AUTO_REMINDERS_ENABLED = get_optional_environ("AUTO_REMINDERS_ENABLED", "false").lower() == "true"
+    AUTO_REMINDER_INTERVAL_SECONDS = float(get_optional_environ("AUTO_REMINDER_INTERVAL_SECONDS", "300"))
+    AUTO_REMINDER_WINDOW_MINUTES = float(get_optional_environ("AUTO_REMINDER_WINDOW_MINUTES", "1440"))
+    AUTO_REMINDER_BATCH_SIZE = int(get_optional_environ("AUTO_REMINDER_BATCH_SIZE", "100"))
+    JSON_CODEC = get_optional_environ("JSON_CODEC", "auto")
+    ENSURE_INDEXES_ON_STARTUP = get_optional_environ("ENSURE_INDEXES_ON_STARTUP", "true").lower() == "true"
 
 
@@ -1,29 +1,85 @@
+import logging
+import os
+import threading
+
 from mongomock import MongoClient as mongomockClient
 from pymongo import MongoClient as pyMongoClient
 from pymongo.database import Collection, Database
 
 
 class DB:
+    '''
+    # Per-process MongoDB client manager.
+    # init_app only records the settings; the client is created on first use
+    # in each process, so a gunicorn master can import (--preload) the app
+    # and fork workers without sharing a client or its connection pool.
+    '''
     _db: None | Database = None
+    _client = None
+    _pid: None | int = None
+    _settings: dict = {}
+    _on_connect: list = []
+    _lock = threading.Lock()
 
     @classmethod
     def init_app(cls, app):
         '''
-        # Initialize the database client based on the environment configuration
-        # If USE_MOCK is enabled, then we will use mongomock (in-memory mock DB)
+        # Record the client configuration from the app config.
+        # If MOCK_DB is enabled, then we will use mongomock (in-memory mock DB)
+        '''
+        cls._settings = {
+            "mock": app.config["MOCK_DB"],
+            "uri": app.config["MONGO_URI"],
+            "db_name": app.config["DB_NAME"],
+            "client_options": {
+                "maxPoolSize": app.config["MONGO_MAX_POOL_SIZE"],
+                "minPoolSize": app.config["MONGO_MIN_POOL_SIZE"],
+                "connectTimeoutMS": app.config["MONGO_CONNECT_TIMEOUT_MS"],
+                "serverSelectionTimeoutMS": app.config["MONGO_SERVER_SELECTION_TIMEOUT_MS"],
+                "socketTimeoutMS": app.config["MONGO_SOCKET_TIMEOUT_MS"],
+            },
+        }
+        cls._on_connect = []
+        cls._pid = None
+        cls._db = None
+        cls._client = None
+
+    @classmethod
+    def on_connect(cls, callback):
+        '''
+        # Register a callback run once per process right after its client is created
         '''
-        create_db = mongomockClient if app.config["MOCK_DB"] else pyMongoClient
-        client = create_db(app.config["MONGO_URI"])
+        cls._on_connect.append(callback)
 
-        # check if the database is connected. Else fail.
-        client.server_info()
-        cls._db = client[app.config["DB_NAME"]]
+    @classmethod
+    def _connect(cls):
+        create_db = mongomockClient if cls._settings["mock"] else pyMongoClient
+        client = create_db(cls._settings["uri"], connect=False, **cls._settings["client_options"])
+        cls._client = client
+        cls._db = client[cls._settings["db_name"]]
+        cls._pid = os.getpid()
+        for callback in cls._on_connect:
+            try:
+                callback()
+            except Exception:
+                logging.exception("DB on_connect callback %r failed", callback)
 
     @classmethod
     def _get(cls) -> Database:
-        assert cls._db is not None
+        if cls._pid != os.getpid():
+            with cls._lock:
+                if cls._pid != os.getpid():
+                    assert cls._settings, "DB.init_app must be called first"
+                    cls._connect()
         return cls._db
 
     @classmethod
     def get_collection(cls, collection_name) -> Collection:
         return cls._get()[collection_name]
+
+    @classmethod
+    def ping(cls):
+        '''
+        # Round trip to the server; raises if it cannot be reached
+        '''
+        cls._get().command("ping")
@@ -5,3 +5,4 @@ class BookingResult(str, Enum):
    NOT_FOUND = "not_found"
    ALREADY_BOOKED = "already_booked"
    CLASS_FULL = "class_full"
+   DEADLINE_PASSED = "deadline_passed"
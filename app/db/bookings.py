@@ -0,0 +1,95 @@
+from app.db import DB
+from bson import ObjectId
+from datetime import datetime
+import logging
+import os
+import threading
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import DuplicateKeyError
+
+# Booking Collection Name
+BOOKING_COLLECTION = "bookings"
+
+# Booking fields
+CLASS_ID = "class_id"
+NAME = "name"
+EMAIL = "email"
+PHONE = "phone"
+BOOKED_AT = "booked_at"
+
+# Indexes backing the lookups in BookingResource (see app/db/indexes.py)
+BOOKING_INDEXES = [
+    IndexModel([(CLASS_ID, ASCENDING), (EMAIL, ASCENDING)], name="class_id_email_unique", unique=True),
+]
+
+PARTICIPANT_PROJECTION = {"_id": 0, NAME: 1, EMAIL: 1, PHONE: 1}
+
+# Process that last ensured BOOKING_INDEXES; see _ensure_booking_indexes
+_indexes_ensured = {"pid": None}
+_indexes_lock = threading.Lock()
+
+
+def _ensure_booking_indexes(collection):
+    """
+    Create the unique booking index once per process, whatever
+    ENSURE_INDEXES_ON_STARTUP says: concurrent duplicate bookings are only
+    stopped by it. A failure is logged (and shows in /health/ready) but not retried.
+    """
+    if _indexes_ensured["pid"] == os.getpid():
+        return
+    with _indexes_lock:
+        if _indexes_ensured["pid"] == os.getpid():
+            return
+        try:
+            collection.create_indexes(BOOKING_INDEXES)
+        except Exception:
+            logging.exception("Could not create the booking indexes")
+        _indexes_ensured["pid"] = os.getpid()
+
+
+class BookingResource:
+    """One document per (class, participant) pair; replaces the embedded participants array."""
+
+    def __init__(self):
+        self.collection = DB.get_collection(BOOKING_COLLECTION)
+
+    def create_booking(self, class_oid: ObjectId, participant: dict) -> bool:
+        """
+        Record a booking. Returns False if this email already booked the class.
+
+        The upsert only inserts when no booking matches, so a repeat booking
+        is caught even without the unique index; the index also stops two
+        concurrent ones.
+        """
+        _ensure_booking_indexes(self.collection)
+        booking = {
+            NAME: participant.get(NAME, ""),
+            PHONE: participant.get(PHONE, ""),
+            BOOKED_AT: datetime.now(),
+        }
+        try:
+            result = self.collection.update_one(
+                {CLASS_ID: class_oid, EMAIL: participant.get(EMAIL, "")},
+                {"$setOnInsert": booking}, upsert=True,
+            )
+        except DuplicateKeyError:
+            return False
+        return result.upserted_id is not None
+
+    def delete_booking(self, class_oid: ObjectId, email: str):
+        self.collection.delete_one({CLASS_ID: class_oid, EMAIL: email})
+
+    def get_participants(self, class_oid: ObjectId) -> list:
+        return list(self._participants_cursor(class_oid))
+
+    def iter_participants(self, class_oid: ObjectId, batch_size: int):
+        return self._participants_cursor(class_oid).batch_size(batch_size)
+
+    def _participants_cursor(self, class_oid: ObjectId):
+        return self.collection.find({CLASS_ID: class_oid}, PARTICIPANT_PROJECTION).sort("_id", ASCENDING)
+
+    def has_participants(self, class_oid: ObjectId) -> bool:
+        return self.collection.find_one({CLASS_ID: class_oid}, {"_id": 1}) is not None
+
+    def delete_all_bookings(self):
+        self.collection.delete_many({})
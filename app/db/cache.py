@@ -0,0 +1,72 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class VersionedCache:
+    """
+    Thread-safe in-process LRU cache with a per-entry TTL.
+
+    Writers call invalidate(), which bumps the version and drops every entry,
+    so a value computed before a write can never be served after it. The
+    cache is per process and invalidate() only reaches this one. Callers
+    that must see other workers' writes put a shared version in their keys
+    (as the class catalogue does); otherwise the TTL bounds cross-worker
+    staleness.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 10, enabled: bool = True):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value for key, or None on a miss."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value, version: int):
+        """
+        Store value unless the cache was invalidated since version was read,
+        i.e. while the value was being loaded.
+        """
+        if not self.enabled or value is None:
+            return
+        with self._lock:
+            if version != self.version:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self):
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "version": self.version,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
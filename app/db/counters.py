@@ -0,0 +1,60 @@
+from app.db import DB
+from pymongo import ReturnDocument
+import threading
+import time
+
+# Counter Collection Name
+COUNTER_COLLECTION = "counters"
+
+# Counter fields
+VALUE = "value"
+
+
+class CounterResource:
+    """Named monotonically increasing counters, one document per name."""
+
+    def __init__(self):
+        self.collection = DB.get_collection(COUNTER_COLLECTION)
+
+    def get(self, name: str) -> int:
+        counter = self.collection.find_one({"_id": name}, {VALUE: 1})
+        return counter.get(VALUE, 0) if counter else 0
+
+    def bump(self, name: str) -> int:
+        counter = self.collection.find_one_and_update(
+            {"_id": name}, {"$inc": {VALUE: 1}},
+            upsert=True, return_document=ReturnDocument.AFTER,
+        )
+        return counter[VALUE]
+
+
+class CachedCounter:
+    """
+    Process-local copy of one counter, read from the database at most every
+    max_age seconds (every time when max_age is 0). bump() stores the new
+    value at once, so a worker always sees its own writes; other workers'
+    writes show up within max_age. The value never goes backwards.
+    """
+
+    def __init__(self, name: str, max_age: float):
+        self.name = name
+        self.max_age = max_age
+        self._value = None
+        self._read_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, counters: CounterResource) -> int:
+        with self._lock:
+            if self._value is not None and time.monotonic() - self._read_at < self.max_age:
+                return self._value
+        return self._store(counters.get(self.name))
+
+    def bump(self, counters: CounterResource) -> int:
+        return self._store(counters.bump(self.name))
+
+    def _store(self, value: int) -> int:
+        with self._lock:
+            if self._value is None or value >= self._value:
+                self._value = value
+                self._read_at = time.monotonic()
+            return self._value
@@ -1,7 +1,13 @@
-from app.db.utils import serialize_item, serialize_items
+from app.db.utils import serialize_item, encode_cursor, decode_cursor
 from app.db import DB
 from app.db.booking_result import BookingResult
+from app.db.bookings import BookingResource
+from app.db.cache import VersionedCache
+from app.db.counters import CachedCounter, CounterResource
+from app.config import Config
+from app.db.identity_map import current_identity_map
 from bson import ObjectId
+from pymongo import ASCENDING, IndexModel
 from datetime import datetime, timedelta
 import uuid
 
@@ -18,98 +24,363 @@ LOCATION = "location"
 TRAINER = "trainer"
 CAPACITY = "capacity"
 AVAILABLE_SLOTS = "available_slots"
-PARTICIPANTS = "participants"
+PARTICIPANTS = "participants"  # legacy embedded bookings, see migrate_embedded_participants
 CREATED_BY = "created_by"
 RECURRENCE_GROUP_ID = "recurrence_group_id"
+START_AT = "start_at"
+END_AT = "end_at"
+
+DATE_FORMAT = "%Y-%m-%d"
+TIME_FORMAT = "%H:%M"
+
+# Indexes backing the lookups in FitnessClassResource (see app/db/indexes.py)
+FITNESS_CLASS_INDEXES = [
+   IndexModel([(RECURRENCE_GROUP_ID, ASCENDING)], name="recurrence_group_id"),
+   IndexModel([(START_AT, ASCENDING), ("_id", ASCENDING)], name="start_at_id"),
+   # Filter field first, then the full LISTING_SORT so filtered pages need no in-memory sort
+   IndexModel([(TRAINER, ASCENDING), (START_AT, ASCENDING), ("_id", ASCENDING)], name="trainer_start_at_id"),
+   IndexModel([(LOCATION, ASCENDING), (START_AT, ASCENDING), ("_id", ASCENDING)], name="location_start_at_id"),
+]
+
+# Listing order; also the key encoded in pagination cursors
+LISTING_SORT = [(START_AT, ASCENDING), ("_id", ASCENDING)]
+
+# Read-through cache for catalogue reads, invalidated by every class write
+class_cache = VersionedCache(
+   max_entries=Config.CLASS_CACHE_MAX_ENTRIES,
+   ttl_seconds=Config.CLASS_CACHE_TTL_SECONDS,
+   enabled=Config.CLASS_CACHE_ENABLED,
+)
+
+# This worker's view of the shared class change counter; see catalogue_version
+catalogue_counter = CachedCounter(FITNESS_CLASS, max_age=Config.CLASS_CACHE_VERSION_MAX_AGE_SECONDS)
+
+# Documents fetched per round trip when streaming listings
+STREAM_BATCH_SIZE = 100
 
 RECURRENCE_DELTAS = {
    "daily": timedelta(days=1),
    "weekly": timedelta(weeks=1),
 }
 
+def class_datetimes(date: str, start_time: str, end_time: str) -> tuple:
+   """
+   Combine the date and time strings of a class into native datetimes.
+
+   Args:
+       date (str): YYYY-MM-DD.
+       start_time (str), end_time (str): HH:MM. A class ending at or before
+           its start time is taken to finish the next day.
+
+   Returns:
+       tuple: (start_at, end_at); either is None when it cannot be parsed.
+   """
+   try:
+       start_at = datetime.strptime(f"{date} {start_time}", f"{DATE_FORMAT} {TIME_FORMAT}")
+   except (ValueError, TypeError):
+       return None, None
+   try:
+       end_at = datetime.strptime(f"{date} {end_time}", f"{DATE_FORMAT} {TIME_FORMAT}")
+   except (ValueError, TypeError):
+       return start_at, None
+   if end_at <= start_at:
+       end_at += timedelta(days=1)
+   return start_at, end_at
+
+
+def _build_fitness_class(name: str, description: str, date: str, start_time: str, end_time: str, location: str,
+   trainer: str, capacity: int, created_by: str, recurrence_group_id: str = None) -> dict:
+   start_at, end_at = class_datetimes(date, start_time, end_time)
+   fitness_class = {NAME: name, DESCRIPTION: description, DATE: date, START_TIME: start_time, END_TIME: end_time, LOCATION: location,
+   TRAINER: trainer, CAPACITY: capacity, AVAILABLE_SLOTS: capacity, CREATED_BY: created_by,
+   START_AT: start_at, END_AT: end_at}
+
+   if recurrence_group_id:
+       fitness_class[RECURRENCE_GROUP_ID] = recurrence_group_id
+   return fitness_class
+
+
+def current_minute() -> datetime:
+   return datetime.now().replace(second=0, microsecond=0)
+
+
 class FitnessClassResource:
    def __init__(self):
        self.collection = DB.get_collection(FITNESS_CLASS)
+       self.bookings = BookingResource()
+       self.counters = CounterResource()
 
-   def get_fitness_classes(self):
-      classes = self.collection.find({})
-      classes_without_participants = []
-      for c in classes:
-          c.pop(PARTICIPANTS, None)
-          classes_without_participants.append(c)
-      return serialize_items(classes_without_participants)
+   def catalogue_version(self) -> int:
+       """
+       Change counter of the class collection, shared by all workers. Read
+       from the database at most every CLASS_CACHE_VERSION_MAX_AGE_SECONDS,
+       so cache hits usually need no round trip; the price is that another
+       worker's write can take that long to show here.
+       """
+       return catalogue_counter.get(self.counters)
 
-   def create_fitness_class(self, name: str, description: str, date: str, start_time: str, end_time: str, location: str, trainer: str,
-       capacity: int, created_by: str, recurrence_group_id: str = None):
+   def _record_write(self):
+       class_cache.invalidate()
+       catalogue_counter.bump(self.counters)
+
+   def get_fitness_classes(self, limit: int = None, after: str = None, date_from: str = None,
+       date_to: str = None, trainer: str = None, location: str = None, upcoming_only: bool = False,
+       version: int = None):
+      """
+      List classes in (start_at, _id) order without their participants.
+
+      Args:
+          limit (int): Maximum number of classes to return; all when None.
+          after (str): Cursor from encode_class_cursor; only classes sorting
+              after it are returned. Raises ValueError if malformed.
+          date_from (str), date_to (str): Inclusive YYYY-MM-DD bounds.
+          trainer (str), location (str): Exact-match filters.
+          upcoming_only (bool): Skip classes that have already started.
+          version (int): catalogue_version() the caller already read (e.g.
+              for an ETag); read here when None.
+
+      Returns:
+          list: The classes; _id is left as an ObjectId.
+      """
+      # Keyed by the shared change counter, so writes by other workers are never served stale
+      if version is None:
+          version = self.catalogue_version()
+      # Upcoming-only results change as classes start, so they are also keyed by the minute
+      minute = current_minute() if upcoming_only else None
+      key = ("list", version, minute, limit, after, date_from, date_to, trainer, location, upcoming_only)
+      cached = class_cache.get(key)
+      if cached is not None:
+          return [dict(c) for c in cached]
+
+      local_version = class_cache.version
+      # Documents keep their ObjectId; the response codec encodes it directly
+      classes = list(self._listing_cursor(limit, after, date_from, date_to, trainer, location, upcoming_only,
+                                          minute))
+      class_cache.put(key, classes, local_version)
+      return [dict(c) for c in classes]
+
+   def iter_fitness_classes(self, limit: int = None, after: str = None, date_from: str = None,
+       date_to: str = None, trainer: str = None, location: str = None, upcoming_only: bool = False,
+       batch_size: int = STREAM_BATCH_SIZE):
+      """
+      Like get_fitness_classes, but yields classes straight from
+      the database cursor, batch_size documents at a time, bypassing the
+      cache. Arguments are validated eagerly.
+      """
+      cursor = self._listing_cursor(limit, after, date_from, date_to, trainer, location, upcoming_only)
+      return cursor.batch_size(batch_size)
 
-       fitness_class = {NAME: name, DESCRIPTION: description, DATE: date, START_TIME: start_time, END_TIME: end_time, LOCATION: location,
-       TRAINER: trainer, CAPACITY: capacity, AVAILABLE_SLOTS: capacity, PARTICIPANTS: [], CREATED_BY: created_by}
+   def _listing_cursor(self, limit, after, date_from, date_to, trainer, location, upcoming_only, minute=None):
+      conditions = []
+      if date_from is not None:
+          conditions.append({START_AT: {"$gte": datetime.strptime(date_from, DATE_FORMAT)}})
+      if date_to is not None:
+          conditions.append({START_AT: {"$lt": datetime.strptime(date_to, DATE_FORMAT) + timedelta(days=1)}})
+      if trainer is not None:
+          conditions.append({TRAINER: trainer})
+      if location is not None:
+          conditions.append({LOCATION: location})
+      if upcoming_only:
+          # Minute resolution, like class start times, keeps results stable within a minute
+          conditions.append({START_AT: {"$gte": minute or current_minute()}})
+      if after is not None:
+          start_at, last_id = decode_class_cursor(after)
+          conditions.append(_sorts_after(start_at, last_id))
 
-       if recurrence_group_id:
-           fitness_class[RECURRENCE_GROUP_ID] = recurrence_group_id
+      query = {"$and": conditions} if conditions else {}
+      classes = self.collection.find(query, {PARTICIPANTS: 0}).sort(LISTING_SORT)
+      if limit is not None:
+          classes = classes.limit(limit)
+      return classes
+
+   def iter_classes_starting_between(self, start: datetime, end: datetime,
+       batch_size: int = STREAM_BATCH_SIZE):
+      """Classes with start <= start_at < end in start order; a single range scan of start_at_id."""
+      query = {START_AT: {"$gte": start, "$lt": end}}
+      return self.collection.find(query, {PARTICIPANTS: 0}).sort(LISTING_SORT).batch_size(batch_size)
+
+   def create_fitness_class(self, name: str, description: str, date: str, start_time: str, end_time: str, location: str, trainer: str,
+       capacity: int, created_by: str, recurrence_group_id: str = None):
+       fitness_class = _build_fitness_class(name, description, date, start_time, end_time, location, trainer,
+                                            capacity, created_by, recurrence_group_id)
        result = self.collection.insert_one(fitness_class)
+       self._record_write()
        return str(result.inserted_id)
 
    def create_recurring_classes(self, name: str, description: str, date: str, start_time: str, end_time: str, location: str,
        trainer: str, capacity: int, created_by: str, recurrence: str, count: int) -> list:
        delta = RECURRENCE_DELTAS.get(recurrence, timedelta(days=1))
        group_id = str(uuid.uuid4())
-       base_date = datetime.strptime(date, "%Y-%m-%d")
-       created_ids = []
-       for i in range(count):
-           class_date = (base_date + delta * i).strftime("%Y-%m-%d")
-           class_id = self.create_fitness_class(
-               name, description, class_date, start_time, end_time,
-               location, trainer, capacity, created_by,
-               recurrence_group_id=group_id,
-           )
-           created_ids.append(class_id)
-       return created_ids
-
-   def book_class(self, class_id: str, participant: dict) -> BookingResult:
-       fitness_class = self.get_fitness_class_by_id(class_id)
-       if fitness_class is None:
-           return BookingResult.NOT_FOUND
+       base_date = datetime.strptime(date, DATE_FORMAT)
+       series = [
+           _build_fitness_class(name, description, (base_date + delta * i).strftime(DATE_FORMAT), start_time,
+                                end_time, location, trainer, capacity, created_by, recurrence_group_id=group_id)
+           for i in range(count)
+       ]
+       # One ordered batch: inserted_ids come back in series order
+       result = self.collection.insert_many(series, ordered=True)
+       self._record_write()
+       return [str(inserted_id) for inserted_id in result.inserted_ids]
 
-       email = participant.get("email", "")
-       for p in fitness_class.get(PARTICIPANTS, []):
-           existing_email = p.get("email", "") if isinstance(p, dict) else p
-           if existing_email == email:
-               return BookingResult.ALREADY_BOOKED
-
-       if fitness_class.get(AVAILABLE_SLOTS, 0) <= 0:
-          return BookingResult.CLASS_FULL
+   def book_class(self, class_id: str, participant: dict, starts_after: datetime = None) -> BookingResult:
+       """
+       Book a participant if they have not booked already, the class has a
+       free slot and, when starts_after is given, the class starts at or
+       after that moment. Classes without a known start_at are not subject
+       to the deadline.
 
+       create_booking rejects duplicates (an upsert keyed on class_id and
+       email, backed by their unique index); the slot is then claimed with a conditional decrement, and the booking is
+       withdrawn again if that fails.
+       """
        try:
            oid = ObjectId(class_id)
        except Exception:
            return BookingResult.NOT_FOUND
 
-       self.collection.update_one({"_id": oid},
-           {"$push": {PARTICIPANTS: participant}, "$inc": {AVAILABLE_SLOTS: -1}})
-       return BookingResult.OK
+       email = participant.get("email", "")
+       if not self.bookings.create_booking(oid, participant):
+           return BookingResult.ALREADY_BOOKED
 
-   def has_participants(self, class_id: str) -> bool:
-       fitness_class = self.get_fitness_class_by_id(class_id)
+       query = {"_id": oid, AVAILABLE_SLOTS: {"$gt": 0}}
+       if starts_after is not None:
+           query["$or"] = [{START_AT: None}, {START_AT: {"$gte": starts_after}}]
+
+       claimed = self.collection.find_one_and_update(
+           query, {"$inc": {AVAILABLE_SLOTS: -1}}, projection={"_id": 1},
+       )
+       identity_map = current_identity_map()
+       if identity_map is not None:
+           identity_map.invalidate(FITNESS_CLASS, class_id)
+       if claimed is not None:
+           self._record_write()
+           return BookingResult.OK
+
+       self.bookings.delete_booking(oid, email)
+       return self._booking_failure_reason(oid, starts_after)
+
+   def _booking_failure_reason(self, oid: ObjectId, starts_after: datetime = None) -> BookingResult:
+       fitness_class = self.collection.find_one({"_id": oid}, projection={START_AT: 1})
        if fitness_class is None:
+           return BookingResult.NOT_FOUND
+       start_at = fitness_class.get(START_AT)
+       if starts_after is not None and start_at is not None and start_at < starts_after:
+           return BookingResult.DEADLINE_PASSED
+       return BookingResult.CLASS_FULL
+
+   def has_participants(self, class_id: str) -> bool:
+       try:
+           oid = ObjectId(class_id)
+       except Exception:
            return False
-       return len(fitness_class.get(PARTICIPANTS, [])) > 0
+       return self.bookings.has_participants(oid)
 
    def get_participants(self, class_id: str):
        fitness_class = self.get_fitness_class_by_id(class_id)
        if fitness_class is None:
            return None
-       return fitness_class.get(PARTICIPANTS, [])
+       return self.bookings.get_participants(ObjectId(class_id))
 
-   def get_fitness_class_by_id(self, fitness_class_id: str):
-       try:
-           oid = ObjectId(fitness_class_id)
-       except Exception:
+   def iter_participants(self, class_id: str, batch_size: int = STREAM_BATCH_SIZE):
+       """Participants streamed from the bookings cursor, or None if the class does not exist."""
+       fitness_class = self.get_fitness_class_by_id(class_id)
+       if fitness_class is None:
            return None
-       fitness_class = self.collection.find_one({"_id": oid})
-       return serialize_item(fitness_class)
+       return self.bookings.iter_participants(ObjectId(class_id), batch_size)
+
+   def get_fitness_class_by_id(self, fitness_class_id: str, version: int = None):
+       """
+       One class, or None. Like get_fitness_classes, cached under the
+       catalogue version (read here unless the caller passes it).
+       """
+       identity_map = current_identity_map()
+       if identity_map is not None:
+           cached = identity_map.get(FITNESS_CLASS, fitness_class_id)
+           if cached is not None:
+               return cached
+       if version is None:
+           version = self.catalogue_version()
+       key = ("id", version, fitness_class_id)
+       fitness_class = class_cache.get(key)
+       if fitness_class is not None:
+           fitness_class = dict(fitness_class)
+       else:
+           try:
+               oid = ObjectId(fitness_class_id)
+           except Exception:
+               return None
+           local_version = class_cache.version
+           fitness_class = serialize_item(self.collection.find_one({"_id": oid}))
+           class_cache.put(key, fitness_class, local_version)
+           fitness_class = dict(fitness_class) if fitness_class is not None else None
+       if identity_map is not None:
+           identity_map.put(FITNESS_CLASS, fitness_class_id, fitness_class)
+       return fitness_class
 
    def add_multiple_fitness_classes(self, fitness_classes: list):
        if not fitness_classes:
            return
        self.collection.insert_many(fitness_classes)
+       self._record_write()
+
+   def backfill_class_datetimes(self) -> int:
+       """
+       Set start_at/end_at on classes created before those fields existed.
+
+       Returns:
+           int: The number of classes updated.
+       """
+       pending = self.collection.find({START_AT: {"$exists": False}}, {DATE: 1, START_TIME: 1, END_TIME: 1})
+       updated = 0
+       for fitness_class in pending:
+           start_at, end_at = class_datetimes(fitness_class.get(DATE), fitness_class.get(START_TIME),
+                                              fitness_class.get(END_TIME))
+           result = self.collection.update_one({"_id": fitness_class["_id"]},
+                                               {"$set": {START_AT: start_at, END_AT: end_at}})
+           updated += result.modified_count
+       self._record_write()
+       return updated
+
+   def migrate_embedded_participants(self) -> int:
+       """
+       Move participants embedded in class documents into the bookings
+       collection and drop the embedded array. Safe to re-run: bookings
+       that already exist are skipped.
+
+       Returns:
+           int: The number of classes migrated.
+       """
+       pending = self.collection.find({PARTICIPANTS: {"$exists": True}}, {PARTICIPANTS: 1})
+       migrated = 0
+       for fitness_class in pending:
+           for participant in fitness_class.get(PARTICIPANTS) or []:
+               if not isinstance(participant, dict):
+                   participant = {"email": participant}
+               self.bookings.create_booking(fitness_class["_id"], participant)
+           self.collection.update_one({"_id": fitness_class["_id"]}, {"$unset": {PARTICIPANTS: ""}})
+           migrated += 1
+       self._record_write()
+       return migrated
+
+
+def _sorts_after(start_at: datetime, last_id: ObjectId) -> dict:
+   """Query for classes sorting after (start_at, _id) in LISTING_SORT order."""
+   if start_at is None:
+       # Classes without a start_at sort first (null sorts before dates)
+       return {"$or": [{START_AT: {"$ne": None}}, {START_AT: None, "_id": {"$gt": last_id}}]}
+   return {"$or": [{START_AT: {"$gt": start_at}}, {START_AT: start_at, "_id": {"$gt": last_id}}]}
+
+
+def encode_class_cursor(fitness_class: dict) -> str:
+   """Build an opaque pagination cursor pointing just past the given class."""
+   start_at = fitness_class.get(START_AT)
+   return encode_cursor([start_at.isoformat() if start_at else None, str(fitness_class["_id"])])
+
+
+def decode_class_cursor(cursor: str) -> tuple:
+   """Inverse of encode_class_cursor. Raises ValueError on a malformed cursor."""
+   start_at, last_id = decode_cursor(cursor, 2)
+   try:
+       return (datetime.fromisoformat(start_at) if start_at else None), ObjectId(last_id)
+   except Exception:
+       raise ValueError("Invalid cursor")
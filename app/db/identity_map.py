@@ -0,0 +1,37 @@
+from flask import g, has_request_context
+
+
+class IdentityMap:
+    """
+    Documents already loaded during the current request, keyed by
+    (collection, key). Resources consult it before querying and drop
+    entries when they write, so each document is read at most once per
+    request.
+    """
+
+    def __init__(self):
+        self._documents = {}
+
+    def get(self, collection: str, key):
+        return self._documents.get((collection, key))
+
+    def put(self, collection: str, key, document: dict):
+        if document is not None:
+            self._documents[(collection, key)] = document
+
+    def invalidate(self, collection: str, key=None):
+        """Forget one document, or every document of the collection when key is None."""
+        if key is not None:
+            self._documents.pop((collection, key), None)
+            return
+        for cached in [k for k in self._documents if k[0] == collection]:
+            del self._documents[cached]
+
+
+def current_identity_map() -> IdentityMap | None:
+    """The identity map of the active request, or None outside of one."""
+    if not has_request_context():
+        return None
+    if "identity_map" not in g:
+        g.identity_map = IdentityMap()
+    return g.identity_map
@@ -0,0 +1,167 @@
+import logging
+import time
+from typing import Optional, TypedDict
+
+import click
+from flask.cli import AppGroup
+
+from app.db import DB
+from app.db.bookings import BOOKING_COLLECTION, BOOKING_INDEXES
+from app.db.fitness_classes import FITNESS_CLASS, FITNESS_CLASS_INDEXES
+from app.db.reminder_log import REMINDER_LOG_COLLECTION, REMINDER_LOG_INDEXES
+from app.db.users import USER_COLLECTION, USER_INDEXES
+
+# Every index the application relies on, keyed by collection name.
+INDEX_REGISTRY = {
+    USER_COLLECTION: USER_INDEXES,
+    FITNESS_CLASS: FITNESS_CLASS_INDEXES,
+    BOOKING_COLLECTION: BOOKING_INDEXES,
+    REMINDER_LOG_COLLECTION: REMINDER_LOG_INDEXES,
+}
+
+DEFAULT_INDEX = "_id_"
+
+# A clean index check is trusted for this long before /health/ready checks again
+INDEX_CHECK_INTERVAL_SECONDS = 60
+
+
+class _IndexCheck(TypedDict):
+    report: Optional[dict]  # collection -> missing index names; None until the first check
+    checked_at: float
+
+
+# Missing indexes found by the last check in this process
+_missing_indexes: _IndexCheck = {"report": None, "checked_at": 0.0}
+
+indexes_cli = AppGroup("indexes", help="Create and verify MongoDB indexes.")
+
+
+def _key_of(spec) -> list:
+    """Normalize an index key to a list of (field, direction) pairs."""
+    if isinstance(spec, dict):
+        spec = spec.items()
+    return [(field, direction) for field, direction in spec]
+
+
+def ensure_indexes(registry: dict = None) -> tuple:
+    """
+    Create every registered index. Safe to call repeatedly: MongoDB skips
+    indexes that already exist with the same name and options. Collections
+    are handled one by one, so a failure on one (e.g. a unique index over
+    duplicate data) does not leave the others without their indexes.
+
+    Args:
+        registry (dict): Collection name -> list of IndexModel. Defaults to
+            INDEX_REGISTRY.
+
+    Returns:
+        tuple: (collection name -> list of index names ensured,
+            collection name -> error message for collections that failed).
+    """
+    registry = INDEX_REGISTRY if registry is None else registry
+    created, failed = {}, {}
+    for collection_name, models in registry.items():
+        if not models:
+            continue
+        try:
+            created[collection_name] = DB.get_collection(collection_name).create_indexes(models)
+        except Exception as e:
+            logging.error("Could not create indexes on %s: %s", collection_name, e)
+            failed[collection_name] = str(e)
+    return created, failed
+
+
+def ensure_and_check_indexes():
+    """Startup hook: ensure every index, then verify, so failures show up in /health/ready."""
+    ensure_indexes()
+    check_indexes()
+
+
+def check_indexes() -> dict:
+    """
+    Verify the registry and remember what is missing for missing_indexes().
+
+    Returns:
+        dict: Collection name -> names of its missing indexes; empty when none are.
+    """
+    report = {
+        collection_name: entry["missing"]
+        for collection_name, entry in verify_indexes().items() if entry["missing"]
+    }
+    if report:
+        logging.error("Missing MongoDB indexes: %s", report)
+    _missing_indexes["report"] = report
+    _missing_indexes["checked_at"] = time.monotonic()
+    return report
+
+
+def missing_indexes() -> dict:
+    """
+    Missing indexes as of the last check. Checks again while any are missing,
+    so `flask indexes ensure` clears it without a restart, and otherwise every
+    INDEX_CHECK_INTERVAL_SECONDS.
+    """
+    report = _missing_indexes["report"]
+    if report or report is None or time.monotonic() - _missing_indexes["checked_at"] > INDEX_CHECK_INTERVAL_SECONDS:
+        return check_indexes()
+    return report
+
+
+def verify_indexes(registry: dict = None) -> dict:
+    """
+    Compare the indexes present in the database against the registry.
+
+    An index counts as missing when no index with its name exists, or when
+    one exists with a different key or uniqueness. Any index that is not
+    registered (other than the default _id index) is reported as extra.
+
+    Args:
+        registry (dict): Collection name -> list of IndexModel. Defaults to
+            INDEX_REGISTRY.
+
+    Returns:
+        dict: Collection name -> {"missing": [names], "extra": [names]}.
+    """
+    registry = INDEX_REGISTRY if registry is None else registry
+    report = {}
+    for collection_name, models in registry.items():
+        existing = DB.get_collection(collection_name).index_information()
+        expected = {model.document["name"]: model.document for model in models}
+
+        missing = []
+        for name, document in expected.items():
+            info = existing.get(name)
+            if (info is None
+                    or _key_of(info["key"]) != _key_of(document["key"])
+                    or bool(info.get("unique")) != bool(document.get("unique"))):
+                missing.append(name)
+
+        extra = [name for name in existing if name != DEFAULT_INDEX and name not in expected]
+        report[collection_name] = {"missing": missing, "extra": extra}
+    return report
+
+
+def has_index_drift(report: dict) -> bool:
+    return any(entry["missing"] or entry["extra"] for entry in report.values())
+
+
+@indexes_cli.command("ensure")
+def ensure_indexes_command():
+    """Create all registered indexes; exits non-zero if any collection failed."""
+    created, failed = ensure_indexes()
+    for collection_name, names in created.items():
+        click.echo(f"{collection_name}: {', '.join(names)}")
+    for collection_name, error in failed.items():
+        click.echo(f"{collection_name}: FAILED {error}")
+    if failed:
+        raise SystemExit(1)
+
+
+@indexes_cli.command("verify")
+def verify_indexes_command():
+    """Report missing or extra indexes; exits non-zero on drift."""
+    report = verify_indexes()
+    for collection_name, entry in report.items():
+        click.echo(f"{collection_name}: missing={entry['missing']} extra={entry['extra']}")
+    if has_index_drift(report):
+        raise SystemExit(1)
@@ -0,0 +1,46 @@
+from app.db import DB
+from datetime import datetime, timedelta, timezone
+from pymongo.errors import DuplicateKeyError
+
+# Lease Collection Name
+LEASE_COLLECTION = "leases"
+
+# Lease fields; _id is the lease name
+OWNER = "owner"
+EXPIRES_AT = "expires_at"
+
+
+class LeaseResource:
+    """
+    Named locks shared by every worker. A lease expires unless its owner
+    renews it, so a worker that dies cannot hold one forever.
+    """
+
+    def __init__(self):
+        self.collection = DB.get_collection(LEASE_COLLECTION)
+
+    def acquire(self, name: str, owner: str, ttl_seconds: float) -> bool:
+        """
+        Take the lease, or renew it if owner already holds it, for ttl_seconds.
+
+        Returns:
+            bool: False if another owner holds an unexpired lease.
+        """
+        now = datetime.now(timezone.utc)
+        try:
+            # No match upserts a document with the same _id, which the
+            # _id index rejects while the other owner's lease exists
+            self.collection.update_one(
+                {"_id": name, "$or": [{OWNER: owner}, {EXPIRES_AT: {"$lt": now}}]},
+                {"$set": {OWNER: owner, EXPIRES_AT: now + timedelta(seconds=ttl_seconds)}},
+                upsert=True,
+            )
+        except DuplicateKeyError:
+            return False
+        return True
+
+    def release(self, name: str, owner: str):
+        self.collection.delete_one({"_id": name, OWNER: owner})
+
+    def delete_all_leases(self):
+        self.collection.delete_many({})
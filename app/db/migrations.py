@@ -0,0 +1,28 @@
+import click
+from flask.cli import AppGroup
+
+from app.db.fitness_classes import FitnessClassResource
+from app.db.users import UserResource
+
+migrate_cli = AppGroup("migrate", help="One-off data migrations.")
+
+
+@migrate_cli.command("class-datetimes")
+def backfill_class_datetimes_command():
+    """Backfill start_at/end_at on existing fitness classes."""
+    updated = FitnessClassResource().backfill_class_datetimes()
+    click.echo(f"Backfilled start_at/end_at on {updated} classes")
+
+
+@migrate_cli.command("bookings")
+def migrate_bookings_command():
+    """Move embedded class participants into the bookings collection."""
+    migrated = FitnessClassResource().migrate_embedded_participants()
+    click.echo(f"Moved participants of {migrated} classes into bookings")
+
+
+@migrate_cli.command("user-search")
+def backfill_user_search_command():
+    """Backfill the normalized name fields used by user search."""
+    updated = UserResource().backfill_search_fields()
+    click.echo(f"Backfilled search fields on {updated} users")
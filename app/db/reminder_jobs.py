@@ -0,0 +1,122 @@
+from app.db import DB
+from app.db.utils import serialize_item
+from bson import ObjectId
+from datetime import datetime, timezone
+
+# Reminder Job Collection Name
+REMINDER_JOB_COLLECTION = "reminder_jobs"
+
+# Reminder job fields
+CLASS_ID = "class_id"
+REQUESTED_BY = "requested_by"
+STATUS = "status"
+PARTICIPANTS_TOTAL = "participants_total"
+PARTICIPANTS_REACHED = "participants_reached"
+SENDS_TOTAL = "sends_total"
+SENDS_COMPLETED = "sends_completed"
+CHANNELS = "channels"
+DEADLINE_EXCEEDED = "deadline_exceeded"
+ERROR = "error"
+CREATED_AT = "created_at"
+STARTED_AT = "started_at"
+FINISHED_AT = "finished_at"
+OWNER = "owner"
+HEARTBEAT_AT = "heartbeat_at"
+
+# Job statuses
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+ACTIVE_STATUSES = [QUEUED, RUNNING]
+
+ABANDONED_ERROR = "The worker running this job stopped before it finished"
+
+
+class ReminderJobResource:
+    """
+    Status of background reminder jobs. Kept in MongoDB so any worker can
+    report on a job, whichever worker is running it.
+
+    The job itself lives in its owner's in-memory scheduler, so the owner
+    heartbeats its active jobs; fail_abandoned() closes those whose owner
+    stopped (e.g. a restarted worker) instead of leaving them active forever.
+    """
+
+    def __init__(self):
+        self.collection = DB.get_collection(REMINDER_JOB_COLLECTION)
+
+    def create_job(self, class_id: str, requested_by: str, owner: str) -> str:
+        now = datetime.now(timezone.utc)
+        result = self.collection.insert_one({
+            CLASS_ID: class_id,
+            REQUESTED_BY: requested_by,
+            STATUS: QUEUED,
+            CREATED_AT: now,
+            OWNER: owner,
+            HEARTBEAT_AT: now,
+        })
+        return str(result.inserted_id)
+
+    def get_job(self, job_id: str):
+        try:
+            oid = ObjectId(job_id)
+        except Exception:
+            return None
+        return serialize_item(self.collection.find_one({"_id": oid}))
+
+    def mark_running(self, job_id: str, participants_total: int, sends_total: int):
+        self._set(job_id, {
+            STATUS: RUNNING,
+            STARTED_AT: datetime.now(timezone.utc),
+            HEARTBEAT_AT: datetime.now(timezone.utc),
+            PARTICIPANTS_TOTAL: participants_total,
+            SENDS_TOTAL: sends_total,
+            SENDS_COMPLETED: 0,
+        })
+
+    def update_progress(self, job_id: str, sends_completed: int, channels: dict):
+        self._set(job_id, {
+            SENDS_COMPLETED: sends_completed, CHANNELS: channels, HEARTBEAT_AT: datetime.now(timezone.utc),
+        })
+
+    def finish(self, job_id: str, report: dict, sends_completed: int):
+        self._set(job_id, {
+            STATUS: COMPLETED,
+            FINISHED_AT: datetime.now(timezone.utc),
+            SENDS_COMPLETED: sends_completed,
+            PARTICIPANTS_REACHED: report["participants_reached"],
+            CHANNELS: report["channels"],
+            DEADLINE_EXCEEDED: report["deadline_exceeded"],
+        })
+
+    def fail(self, job_id: str, error: str):
+        self._set(job_id, {STATUS: FAILED, FINISHED_AT: datetime.now(timezone.utc), ERROR: error})
+
+    def heartbeat(self, owner: str) -> int:
+        """Mark owner's queued and running jobs as still alive. Returns how many it has."""
+        result = self.collection.update_many(
+            {OWNER: owner, STATUS: {"$in": ACTIVE_STATUSES}},
+            {"$set": {HEARTBEAT_AT: datetime.now(timezone.utc)}},
+        )
+        return result.matched_count
+
+    def fail_abandoned(self, stale_before: datetime) -> int:
+        """
+        Fail active jobs with no heartbeat since stale_before (or none at
+        all, from before heartbeats were recorded). Returns how many failed.
+        """
+        result = self.collection.update_many(
+            {
+                STATUS: {"$in": ACTIVE_STATUSES},
+                "$or": [{HEARTBEAT_AT: {"$lt": stale_before}}, {HEARTBEAT_AT: {"$exists": False}}],
+            },
+            {"$set": {STATUS: FAILED, FINISHED_AT: datetime.now(timezone.utc), ERROR: ABANDONED_ERROR}},
+        )
+        return result.modified_count
+
+    def delete_all_jobs(self):
+        self.collection.delete_many({})
+
+    def _set(self, job_id: str, fields: dict):
+        self.collection.update_one({"_id": ObjectId(job_id)}, {"$set": fields})
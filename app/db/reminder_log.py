@@ -0,0 +1,93 @@
+from app.db import DB
+from bson import ObjectId
+from datetime import datetime
+import logging
+import os
+import threading
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import BulkWriteError
+
+# Reminder Log Collection Name
+REMINDER_LOG_COLLECTION = "reminder_log"
+
+# Reminder log fields
+CLASS_ID = "class_id"
+EMAIL = "email"
+SENT_AT = "sent_at"
+
+# Marks outlive their class by a month, then MongoDB expires them
+REMINDER_LOG_RETENTION_SECONDS = 60 * 60 * 24 * 31
+
+# Indexes backing the lookups in ReminderLogResource (see app/db/indexes.py)
+REMINDER_LOG_INDEXES = [
+    IndexModel([(CLASS_ID, ASCENDING), (EMAIL, ASCENDING)], name="class_id_email_unique", unique=True),
+    IndexModel([(SENT_AT, ASCENDING)], name="sent_at_ttl", expireAfterSeconds=REMINDER_LOG_RETENTION_SECONDS),
+]
+
+# Process that last ensured REMINDER_LOG_INDEXES; see _ensure_reminder_log_indexes
+_indexes_ensured = {"pid": None}
+_indexes_lock = threading.Lock()
+
+
+def _ensure_reminder_log_indexes(collection):
+    """
+    Create the reminder log indexes once per process, whatever
+    ENSURE_INDEXES_ON_STARTUP says: without the unique one, overlapping
+    scans both claim a participant and remind them twice. A failure is
+    logged (and shows in /health/ready) but not retried.
+    """
+    if _indexes_ensured["pid"] == os.getpid():
+        return
+    with _indexes_lock:
+        if _indexes_ensured["pid"] == os.getpid():
+            return
+        try:
+            collection.create_indexes(REMINDER_LOG_INDEXES)
+        except Exception:
+            logging.exception("Could not create the reminder log indexes")
+        _indexes_ensured["pid"] = os.getpid()
+
+
+class ReminderLogResource:
+    """
+    One document per (class, participant) pair that has been sent an
+    automatic reminder. The unique index makes claiming a pair atomic, so
+    overlapping scans in different workers never remind anyone twice.
+    """
+
+    def __init__(self):
+        self.collection = DB.get_collection(REMINDER_LOG_COLLECTION)
+
+    def claim(self, class_oid: ObjectId, emails: list) -> set:
+        """
+        Mark the given participants as reminded.
+
+        Returns:
+            set: The emails claimed by this call; the rest were already marked.
+        """
+        _ensure_reminder_log_indexes(self.collection)
+        already = {
+            mark[EMAIL]
+            for mark in self.collection.find({CLASS_ID: class_oid, EMAIL: {"$in": emails}}, {EMAIL: 1})
+        }
+        fresh = [email for email in dict.fromkeys(emails) if email not in already]
+        if not fresh:
+            return set()
+        now = datetime.now()
+        try:
+            self.collection.insert_many(
+                [{CLASS_ID: class_oid, EMAIL: email, SENT_AT: now} for email in fresh], ordered=False,
+            )
+        except BulkWriteError as e:
+            # Another scan claimed these between the find and the insert
+            lost = {error["index"] for error in e.details["writeErrors"]}
+            fresh = [email for index, email in enumerate(fresh) if index not in lost]
+        return set(fresh)
+
+    def release(self, class_oid: ObjectId, emails: list):
+        """Drop marks so a later scan retries these participants."""
+        if emails:
+            self.collection.delete_many({CLASS_ID: class_oid, EMAIL: {"$in": emails}})
+
+    def delete_all_marks(self):
+        self.collection.delete_many({})
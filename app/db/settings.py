@@ -0,0 +1,28 @@
+from datetime import datetime, timezone
+
+from app.db import DB
+
+# Settings Collection Name
+SETTINGS_COLLECTION = "settings"
+
+# Setting fields
+VALUE = "value"
+UPDATED_AT = "updated_at"
+
+
+class SettingsResource:
+    """Deployment-wide settings chosen at runtime, one document per name."""
+
+    def __init__(self):
+        self.collection = DB.get_collection(SETTINGS_COLLECTION)
+
+    def get(self, name: str):
+        setting = self.collection.find_one({"_id": name})
+        return setting.get(VALUE) if setting else None
+
+    def put(self, name: str, value, **details):
+        self.collection.update_one(
+            {"_id": name},
+            {"$set": {VALUE: value, UPDATED_AT: datetime.now(timezone.utc), **details}},
+            upsert=True,
+        )
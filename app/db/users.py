@@ -1,6 +1,15 @@
-from app.db.utils import serialize_item, serialize_items
+from app.db.constants import ID
+from app.db.utils import serialize_item, serialize_items, encode_cursor, decode_cursor
+from app.config import Config
 from app.db import DB
-import bcrypt
+from app.db.cache import VersionedCache
+from app.db.identity_map import current_identity_map
+from bson import ObjectId
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import DuplicateKeyError
+from app.services.password_hasher import password_hasher, PasswordPoolSaturated
+import re
+import unicodedata
 
 # User Collection Name
 USER_COLLECTION = "users"
@@ -15,31 +24,107 @@ GENDER = "gender"
 PASSWORD = "password"
 NOTIFICATION_CHANNELS = "notification_channels"
 TELEGRAM_CHAT_ID = "telegram_chat_id"
+NAME_NORMALIZED = "name_normalized"
+NAME_TOKENS = "name_tokens"
 DEFAULT_CHANNELS = ["email"]
 VALID_CHANNELS = {"email", "telegram"}
 
+# Indexes backing the lookups in UserResource (see app/db/indexes.py)
+USER_INDEXES = [
+    IndexModel([(EMAIL, ASCENDING)], name="email_unique", unique=True),
+    IndexModel([(NAME_NORMALIZED, ASCENDING), ("_id", ASCENDING)], name="name_normalized_id"),
+    IndexModel([(ROLE, ASCENDING), (NAME_NORMALIZED, ASCENDING), ("_id", ASCENDING)], name="role_name_normalized_id"),
+    IndexModel([(NAME_TOKENS, ASCENDING)], name="name_tokens"),
+]
+
+# Never returned by user searches
+SEARCH_PROJECTION = {PASSWORD: 0, NAME_NORMALIZED: 0, NAME_TOKENS: 0}
+# Profile lookups never need the password hash, so the cache never holds it
+PROFILE_PROJECTION = {PASSWORD: 0}
+
+# Serialized users keyed by (ID, id) and (EMAIL, email); every user write
+# invalidates it, and the TTL bounds staleness across workers
+user_cache = VersionedCache(
+    max_entries=Config.USER_CACHE_MAX_ENTRIES,
+    ttl_seconds=Config.USER_CACHE_TTL_SECONDS,
+    enabled=Config.USER_CACHE_ENABLED,
+)
+
+
+def normalize_name(name: str) -> str:
+    """Case-fold, strip accents and collapse whitespace so searches are insensitive to all three."""
+    decomposed = unicodedata.normalize("NFKD", name or "")
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())
+
+
+def name_search_fields(name: str) -> dict:
+    normalized = normalize_name(name)
+    return {NAME_NORMALIZED: normalized, NAME_TOKENS: sorted(set(normalized.split()))}
+
+
 class UserResource:
 
     def __init__(self):
         self.collection = DB.get_collection(USER_COLLECTION)
 
-    def get_users(self, name: str = None, role: str = None):
+    def get_users(self, name: str = None, role: str = None, limit: int = None,
+                  after: str = None, match: str = "prefix"):
+        """
+        Search users in (name, _id) order. Passwords are never returned.
+
+        Args:
+            name (str): Search term, compared case- and accent-insensitively.
+                With match="prefix" the full name must start with it; with
+                match="token" any word of the name must start with it.
+            role (str): Only users with this role.
+            limit (int): Page size; all matches when None.
+            after (str): Cursor from encode_user_cursor; only users sorting
+                after it are returned.
+
+        Returns:
+            list: The serialized users.
+
+        Raises:
+            ValueError: If match or the cursor is invalid.
+        """
         query = {}
-        if name is not None:
-            query[NAME] = {"$regex": name}
+        term = normalize_name(name) if name is not None else ""
+        if term:
+            # Anchored, case-sensitive regexes on normalized fields are index range scans
+            pattern = {"$regex": f"^{re.escape(term)}"}
+            if match == "prefix":
+                query[NAME_NORMALIZED] = pattern
+            elif match == "token":
+                query[NAME_TOKENS] = pattern
+            else:
+                raise ValueError("match must be 'prefix' or 'token'")
         if role is not None:
             query[ROLE] = role
+        if after is not None:
+            last_name, last_id = decode_cursor(after, 2)
+            try:
+                last_id = ObjectId(last_id)
+            except Exception:
+                raise ValueError("Invalid cursor")
+            query["$or"] = [
+                {NAME_NORMALIZED: {"$gt": last_name}},
+                {NAME_NORMALIZED: last_name, "_id": {"$gt": last_id}},
+            ]
 
-        users = self.collection.find(query)
+        users = self.collection.find(query, SEARCH_PROJECTION).sort([(NAME_NORMALIZED, ASCENDING), ("_id", ASCENDING)])
+        if limit is not None:
+            users = users.limit(limit)
         return serialize_items(list(users))
 
     def create_user(self, name: str, email: str, phone: str, role: str,
                    password: str, birthdate: str = None, gender: str = None,
                    notification_channels: list = None, telegram_chat_id: str = None):
         
-        hashed_password = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
+        hashed_password = password_hasher.hash(password)
         user = {
             NAME: name,
+            **name_search_fields(name),
             EMAIL: email,
             PHONE: phone,
             ROLE: role,
@@ -51,16 +136,51 @@ class UserResource:
         }
 
         result = self.collection.insert_one(user)
+        self._forget_users()
         return result.inserted_id
 
+    def _remembered(self, field: str, value: str):
+        identity_map = current_identity_map()
+        return identity_map.get(USER_COLLECTION, (field, value)) if identity_map is not None else None
+
+    def _load_user(self, field: str, value: str, query: dict):
+        """
+        Look a user up through the request identity map, then the process-wide
+        user_cache, then MongoDB. Callers get their own copy of cached users.
+        """
+        user = self._remembered(field, value)
+        if user is not None:
+            return user
+        user = user_cache.get((field, value))
+        if user is None:
+            version = user_cache.version
+            user = serialize_item(self.collection.find_one(query, PROFILE_PROJECTION))
+            if user is not None:
+                user_cache.put((ID, user[ID]), user, version)
+                user_cache.put((EMAIL, user.get(EMAIL)), user, version)
+        user = dict(user) if user is not None else None
+        self._remember(user)
+        return user
+
+    def _remember(self, user: dict):
+        identity_map = current_identity_map()
+        if identity_map is not None and user is not None:
+            identity_map.put(USER_COLLECTION, (ID, user[ID]), user)
+            identity_map.put(USER_COLLECTION, (EMAIL, user.get(EMAIL)), user)
+
+    def _forget_users(self):
+        user_cache.invalidate()
+        identity_map = current_identity_map()
+        if identity_map is not None:
+            identity_map.invalidate(USER_COLLECTION)
+
     def get_user_by_id(self, user_id: str):
         from bson import ObjectId
         try:
             oid = ObjectId(user_id)
         except Exception:
             return None
-        user = self.collection.find_one({"_id": oid})
-        return serialize_item(user)
+        return self._load_user(ID, user_id, {"_id": oid})
 
     def register_user(self, name: str, email: str, phone: str, password: str,
                      role: str = "member", notification_channels: list = None,
@@ -69,9 +189,12 @@ class UserResource:
         if existing:
             raise ValueError("A user with this email already exists")
 
-        user_id = self.create_user(name, email, phone, role, password,
-                                  notification_channels=notification_channels,
-                                  telegram_chat_id=telegram_chat_id)
+        try:
+            user_id = self.create_user(name, email, phone, role, password,
+                                      notification_channels=notification_channels,
+                                      telegram_chat_id=telegram_chat_id)
+        except DuplicateKeyError:
+            raise ValueError("A user with this email already exists")
         return str(user_id)
 
     def authenticate_user(self, email: str, password: str):
@@ -83,14 +206,57 @@ class UserResource:
         if isinstance(stored_password, str):
             stored_password = stored_password.encode("utf-8")
 
-        if bcrypt.checkpw(password.encode("utf-8"), stored_password):
-            return serialize_item(user)
-        return None
+        if not password_hasher.verify(password, stored_password):
+            return None
+        if password_hasher.needs_rehash(stored_password):
+            self._rehash_password(user, password)
+        return serialize_item(user)
+
+    def _rehash_password(self, user: dict, password: str):
+        """
+        Re-hash at the current cost after a successful login. Best effort: a
+        busy pool just leaves the old hash for the next login, and the filter
+        on the old hash keeps a concurrent password change from being undone.
+        """
+        try:
+            new_hash = password_hasher.hash(password)
+        except PasswordPoolSaturated:
+            return
+        self.collection.update_one(
+            {"_id": user["_id"], PASSWORD: user.get(PASSWORD)},
+            {"$set": {PASSWORD: new_hash}},
+        )
+        self._forget_users()
+        user[PASSWORD] = new_hash
 
     def get_user_by_email(self, email: str):
-        user = self.collection.find_one({EMAIL: email})
-        return serialize_item(user)
-    
+        return self._load_user(EMAIL, email, {EMAIL: email})
+
+    def get_notification_preferences(self, emails: list) -> dict:
+        """
+        Fetch the notification settings of many users in one query.
+
+        Args:
+            emails (list): Email addresses to look up.
+
+        Returns:
+            dict: Email -> {notification_channels, telegram_chat_id}. Unknown
+                emails are absent.
+        """
+        if not emails:
+            return {}
+        users = self.collection.find(
+            {EMAIL: {"$in": list(set(emails))}},
+            {"_id": 0, EMAIL: 1, NOTIFICATION_CHANNELS: 1, TELEGRAM_CHAT_ID: 1},
+        )
+        return {
+            user[EMAIL]: {
+                NOTIFICATION_CHANNELS: user.get(NOTIFICATION_CHANNELS) or list(DEFAULT_CHANNELS),
+                TELEGRAM_CHAT_ID: user.get(TELEGRAM_CHAT_ID, ""),
+            }
+            for user in users
+        }
+
     def update_preferences(self, email: str, notification_channels: list,
                           telegram_chat_id: str):
        self.collection.update_one(
@@ -100,12 +266,36 @@ class UserResource:
                TELEGRAM_CHAT_ID: telegram_chat_id,
            }},
        )
+       self._forget_users()
 
     def delete_all_users(self):
         self.collection.delete_many({})
+        self._forget_users()
 
     def add_multiple_users(self, users: list):
         if not users:
             return
 
+        users = [{**user, **name_search_fields(user.get(NAME, ""))} for user in users]
         self.collection.insert_many(users)
+        self._forget_users()
+
+    def backfill_search_fields(self) -> int:
+        """
+        Set the normalized name fields on users created before they existed.
+
+        Returns:
+            int: The number of users updated.
+        """
+        pending = self.collection.find({NAME_NORMALIZED: {"$exists": False}}, {NAME: 1})
+        updated = 0
+        for user in pending:
+            result = self.collection.update_one({"_id": user["_id"]}, {"$set": name_search_fields(user.get(NAME, ""))})
+            updated += result.modified_count
+        self._forget_users()
+        return updated
+
+
+def encode_user_cursor(user: dict) -> str:
+    """Build an opaque pagination cursor pointing just past the given user."""
+    return encode_cursor([normalize_name(user.get(NAME, "")), str(user[ID])])
@@ -1,3 +1,9 @@
+import base64
+import json
+from datetime import datetime
+
+from bson import ObjectId
+
 from app.db.constants import ID
 
 
@@ -40,3 +46,62 @@ def serialize_items(items):
         list: A list of serialized items.
     """
     return [serialize_item(item) for item in items]
+
+
+def json_default(value):
+    """
+    Fallback encoder for values the json module cannot serialize natively.
+
+    Args:
+        value: The value being encoded.
+
+    Returns:
+        str: ISO-8601 text for datetimes, the hex string for ObjectIds,
+            base64 text for bytes.
+
+    Raises:
+        TypeError: For any other type, as json.dumps expects.
+    """
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, ObjectId):
+        return serialize_oid(value)
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode("ascii")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_cursor(key: list) -> str:
+    """
+    Encode a keyset pagination position as an opaque URL-safe token.
+
+    Args:
+        key (list): JSON-serializable values of the sort key of the last item.
+
+    Returns:
+        str: The cursor token.
+    """
+    return base64.urlsafe_b64encode(json.dumps(key).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, length: int) -> list:
+    """
+    Decode a token made by encode_cursor.
+
+    Args:
+        cursor (str): The cursor token.
+        length (int): The expected number of key values.
+
+    Returns:
+        list: The key values.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(key, list) or len(key) != length:
+        raise ValueError("Invalid cursor")
+    return key
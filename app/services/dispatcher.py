@@ -0,0 +1,155 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from app.services.notifier import NotifierThrottled
+from app.services.rate_limiter import DEFAULT_BACKOFF_SECONDS
+
+DEFAULT_CHANNEL_CONCURRENCY = 4
+
+
+class NotificationDispatcher:
+   """
+   Sends reminders to many recipients concurrently. Each channel gets its own
+   thread pool, so its concurrency cap holds no matter how the work is mixed,
+   and the whole fan-out stops waiting once deadline_seconds have passed.
+   Notifiers with a bulk API receive recipients batch_size at a time.
+
+   A channel with a rate limiter takes one token per recipient before each
+   send. Recipients the provider throttles are queued again behind the
+   limiter's backoff instead of being counted as failed. The deadline is
+   extended by the time the slowest limited channel needs to drain its queue
+   at the limiter's min_rate, so waiting for tokens never drops a reminder.
+   """
+
+   def __init__(self, notifiers: dict, channel_limits: dict = None,
+                deadline_seconds: float = 60, rate_limiters: dict = None):
+      self._notifiers = notifiers
+      self._channel_limits = channel_limits or {}
+      self._deadline_seconds = deadline_seconds
+      self._rate_limiters = rate_limiters or {}
+
+   @property
+   def channels(self) -> list:
+      return list(self._notifiers)
+
+   def dispatch(self, recipients: list, fitness_class: dict, on_result=None) -> dict:
+      """
+      Send the reminder for fitness_class to every recipient.
+
+      Args:
+         recipients (list): (recipient dict, list of channel names) pairs.
+            Channels without a notifier are skipped.
+         fitness_class (dict): The class being reminded about.
+         on_result (callable): Optional on_result(channel, ok) called as each
+            send finishes, for progress reporting.
+
+      Returns:
+         dict: participants_reached (recipients with at least one successful
+            send), reached (their indexes in recipients), failed (indexes of
+            recipients whose every send failed, none timing out), per-channel
+            sent/failed/timed_out counts, and whether the deadline cut the
+            fan-out short.
+      """
+      channels = {
+         channel: {"sent": 0, "failed": 0, "timed_out": 0}
+         for channel in self._notifiers
+      }
+      pools = {
+         channel: ThreadPoolExecutor(
+            max_workers=self._channel_limits.get(channel, DEFAULT_CHANNEL_CONCURRENCY),
+            thread_name_prefix=f"notify-{channel}",
+         )
+         for channel in self._notifiers
+      }
+      pending = {channel: [] for channel in self._notifiers}
+      for index, (recipient, recipient_channels) in enumerate(recipients):
+         for channel in recipient_channels:
+            if channel in pending:
+               pending[channel].append(index)
+
+      # Each task sends one notifier-sized batch; batch_size is 1 unless the
+      # channel has a bulk API
+      # Limited channels drain in parallel, each at no less than its limiter's min_rate
+      deadline_seconds = self._deadline_seconds + max(
+         (len(indexes) / self._rate_limiters[channel].min_rate
+          for channel, indexes in pending.items() if indexes and channel in self._rate_limiters),
+         default=0,
+      )
+      deadline = time.monotonic() + deadline_seconds
+      sends = []
+      for channel, indexes in pending.items():
+         size = max(1, self._notifiers[channel].batch_size)
+         for start in range(0, len(indexes), size):
+            batch = indexes[start:start + size]
+            future = pools[channel].submit(
+               self._send_batch, channel, [recipients[index][0] for index in batch], fitness_class,
+               on_result, deadline,
+            )
+            sends.append((batch, channel, future))
+
+      done, not_done = wait([future for _, _, future in sends], timeout=deadline_seconds)
+      for pool in pools.values():
+         pool.shutdown(wait=False, cancel_futures=True)
+
+      reached, failed, timed_out = set(), set(), set()
+      for batch, channel, future in sends:
+         if future not in done:
+            channels[channel]["timed_out"] += len(batch)
+            timed_out.update(batch)
+            continue
+         for index, ok in zip(batch, future.result()):
+            if ok is None:
+               channels[channel]["timed_out"] += 1
+               timed_out.add(index)
+            elif ok:
+               channels[channel]["sent"] += 1
+               reached.add(index)
+            else:
+               channels[channel]["failed"] += 1
+               failed.add(index)
+
+      return {
+         "participants_reached": len(reached),
+         "reached": sorted(reached),
+         "failed": sorted(failed - reached - timed_out),
+         "channels": channels,
+         "deadline_exceeded": bool(not_done),
+      }
+
+   def _send_batch(self, channel: str, batch: list, fitness_class: dict, on_result, deadline: float) -> list:
+      """Send batch, retrying throttled recipients until the deadline. None marks a recipient never sent."""
+      notifier = self._notifiers[channel]
+      limiter = self._rate_limiters.get(channel)
+      results = [None] * len(batch)
+      pending = list(range(len(batch)))
+      while pending:
+         if limiter is not None and not limiter.acquire(len(pending), timeout=deadline - time.monotonic()):
+            break
+         throttled = None
+         try:
+            sent = notifier.send_reminders([batch[i] for i in pending], fitness_class)
+         except NotifierThrottled as e:
+            throttled = e
+            sent = e.results or [None] * len(pending)
+         except Exception:
+            logging.warning("%s reminder batch of %d failed", channel, len(pending), exc_info=True)
+            sent = [False] * len(pending)
+         for i, ok in zip(pending, sent):
+            results[i] = ok
+            if ok is not None and on_result is not None:
+               on_result(channel, ok)
+         pending = [i for i in pending if results[i] is None]
+         if throttled is None:
+            if limiter is not None:
+               limiter.record_success()
+            break
+         logging.info("%s throttled, %d reminders queued again", channel, len(pending))
+         if limiter is not None:
+            limiter.backoff(throttled.retry_after)
+         else:
+            pause = throttled.retry_after or DEFAULT_BACKOFF_SECONDS
+            if time.monotonic() + pause > deadline:
+               break
+            time.sleep(pause)
+      return results
@@ -1,12 +1,34 @@
+import json
+import logging
 import os
 import boto3
+from botocore.exceptions import ClientError
 from app.config import Config
 
+# SES accepts at most this many destinations per bulk call
+BULK_DESTINATIONS_LIMIT = 50
+SES_SUCCESS = "Success"
+# Per-destination status and API error code SES uses when we exceed the send rate
+SES_THROTTLED = {"AccountThrottled", "Throttling"}
+
+REMINDER_SUBJECT = "Reminder: {{class_name}} on {{date}}"
+REMINDER_TEXT = (
+    "Hi {{name}},\n\n"
+    "This is a reminder for your upcoming fitness class:\n\n"
+    "Class: {{class_name}}\n"
+    "Date: {{date}}\n"
+    "Time: {{start_time}}\n"
+    "Location: {{location}}\n\n"
+    "See you there!"
+)
+
 
 class EmailService:
-    def __init__(self, ses_client=None, sender=None):
+    def __init__(self, ses_client=None, sender=None, template_name=None):
         self.region = Config.AWS_SES_REGION
         self.sender = sender or os.environ.get("SES_SENDER_EMAIL", "")
+        self.template_name = template_name or Config.SES_REMINDER_TEMPLATE
+        self._template_ready = False
         if ses_client is not None:
             self.client = ses_client
         else:
@@ -30,3 +52,84 @@ class EmailService:
                 "Body": {"Text": {"Data": body}},
             },
         )
+
+    def send_bulk_reminders(self, recipients, class_name, date, start_time, location):
+        """
+        Send the reminder template to many recipients, BULK_DESTINATIONS_LIMIT
+        per SES call. Class details go in the default template data and each
+        destination carries its own name.
+
+        Args:
+            recipients (list): Dicts with "email" and optionally "name".
+
+        Returns:
+            list: One {"email", "status", "error"} per recipient, in order;
+                status is "Success" when SES accepted the message. Once SES
+                throttles a chunk, the remaining chunks are not sent and are
+                reported as "Throttling".
+        """
+        self.ensure_reminder_template()
+        default_data = json.dumps({
+            "name": "there", "class_name": class_name, "date": date,
+            "start_time": start_time, "location": location,
+        })
+        results = []
+        throttled = False
+        for start in range(0, len(recipients), BULK_DESTINATIONS_LIMIT):
+            chunk = recipients[start:start + BULK_DESTINATIONS_LIMIT]
+            if throttled:
+                results += [
+                    {"email": recipient.get("email", ""), "status": "Throttling", "error": "Not sent"}
+                    for recipient in chunk
+                ]
+                continue
+            destinations = [
+                {
+                    "Destination": {"ToAddresses": [recipient.get("email", "")]},
+                    "ReplacementTemplateData": json.dumps({"name": recipient.get("name") or "there"}),
+                }
+                for recipient in chunk
+            ]
+            try:
+                response = self.client.send_bulk_templated_email(
+                    Source=self.sender,
+                    Template=self.template_name,
+                    DefaultTemplateData=default_data,
+                    Destinations=destinations,
+                )
+                statuses = response.get("Status", [])
+            except ClientError as e:
+                code = e.response.get("Error", {}).get("Code", "")
+                statuses = [{"Status": code if code in SES_THROTTLED else "Failed", "Error": str(e)}] * len(chunk)
+            except Exception as e:
+                statuses = [{"Status": "Failed", "Error": str(e)}] * len(chunk)
+            statuses += [{"Status": "Failed", "Error": "No status returned"}] * (len(chunk) - len(statuses))
+            throttled = any(status.get("Status") in SES_THROTTLED for status in statuses)
+            for recipient, status in zip(chunk, statuses):
+                results.append({
+                    "email": recipient.get("email", ""),
+                    "status": status.get("Status", "Failed"),
+                    "error": status.get("Error", ""),
+                })
+        return results
+
+    def ensure_reminder_template(self):
+        """Create or refresh the SES reminder template once per service instance."""
+        if self._template_ready:
+            return
+        template = {
+            "TemplateName": self.template_name,
+            "SubjectPart": REMINDER_SUBJECT,
+            "TextPart": REMINDER_TEXT,
+        }
+        try:
+            try:
+                self.client.create_template(Template=template)
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") != "AlreadyExists":
+                    raise
+                self.client.update_template(Template=template)
+        except ClientError as e:
+            # Lacking ses:CreateTemplate is fine when the template was provisioned separately
+            logging.warning("Could not create or update SES template %s: %s", self.template_name, e)
+        self._template_ready = True
@@ -1,14 +1,58 @@
 from abc import ABC, abstractmethod
+from http import HTTPStatus
+import logging
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from app.services.email_service import BULK_DESTINATIONS_LIMIT, SES_SUCCESS, SES_THROTTLED
 
 TELEGRAM_BASE_URL = "https://api.telegram.org"
+# Recipients per Telegram batch; each batch is sent over one warm connection
+TELEGRAM_BATCH_SIZE = 20
+
+class NotifierThrottled(Exception):
+   """
+   The provider is rate limiting us. For batch sends, results holds one entry
+   per recipient: True/False where the send finished, None where nothing was
+   sent and the recipient should be retried once the limiter allows.
+   """
+
+   def __init__(self, message: str, retry_after: float = None, results: list = None):
+       super().__init__(message)
+       self.retry_after = retry_after
+       self.results = results
+
 
 class BaseNotifier(ABC):
+   # Recipients the dispatcher hands to send_reminders at once
+   batch_size = 1
+
    @abstractmethod
    def send_reminder(self, recipient: dict, fitness_class: dict) -> None:
        pass
 
+   def send_reminders(self, recipients: list, fitness_class: dict) -> list:
+       """
+       Send the reminder to several recipients. Returns one bool per
+       recipient, True where the send succeeded, or raises NotifierThrottled
+       when the provider throttles. Notifiers with a native batch API
+       override this; the default sends one at a time.
+       """
+       results = []
+       for recipient in recipients:
+           try:
+               self.send_reminder(recipient, fitness_class)
+               results.append(True)
+           except NotifierThrottled as e:
+               _raise_throttled(e, results, len(recipients))
+           except Exception:
+               logging.warning("Reminder to %s failed", recipient.get("email", ""), exc_info=True)
+               results.append(False)
+       return results
+
 class EmailNotifier(BaseNotifier):
+   batch_size = BULK_DESTINATIONS_LIMIT
+
    def __init__(self, email_service):
        self._service = email_service
 
@@ -22,21 +66,111 @@ class EmailNotifier(BaseNotifier):
            location=fitness_class.get("location", ""),
        )
 
+   def send_reminders(self, recipients: list, fitness_class: dict) -> list:
+       statuses = self._service.send_bulk_reminders(
+           recipients,
+           class_name=fitness_class.get("name", ""),
+           date=fitness_class.get("date", ""),
+           start_time=fitness_class.get("start_time", ""),
+           location=fitness_class.get("location", ""),
+       )
+       throttled = False
+       results = []
+       for status in statuses:
+           if status["status"] in SES_THROTTLED:
+               throttled = True
+               results.append(None)
+               continue
+           if status["status"] != SES_SUCCESS:
+               logging.warning("Reminder email to %s failed: %s %s", status["email"], status["status"], status["error"])
+           results.append(status["status"] == SES_SUCCESS)
+       if throttled:
+           raise NotifierThrottled("SES maximum send rate exceeded", results=results)
+       return results
+
+class TelegramRateLimited(NotifierThrottled):
+   """Telegram kept answering 429 after the allowed retries."""
+
+   def __init__(self, retry_after: float):
+       super().__init__(f"Telegram rate limit, retry after {retry_after}s", retry_after=retry_after)
+
+
+def _raise_throttled(error: NotifierThrottled, results: list, total: int):
+   """Re-raise a throttled single send for the whole batch; unsent recipients get None."""
+   raise NotifierThrottled(
+      str(error), retry_after=error.retry_after, results=results + [None] * (total - len(results)),
+   ) from error
+
+
+def _pooled_session(pool_size: int) -> requests.Session:
+   session = requests.Session()
+   adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+   session.mount("https://", adapter)
+   session.mount("http://", adapter)
+   return session
+
+
 class TelegramNotifier(BaseNotifier):
-   def __init__(self, bot_token: str, base_url: str = TELEGRAM_BASE_URL):
+   batch_size = TELEGRAM_BATCH_SIZE
+
+   def __init__(self, bot_token: str, base_url: str = TELEGRAM_BASE_URL, session: requests.Session = None,
+                pool_size: int = 8, connect_timeout: float = 3.05, read_timeout: float = 10,
+                max_retries: int = 3, max_retry_after: float = 30):
        self._token = bot_token
        self._base_url = base_url
+       # One keep-alive session per notifier, so sends reuse warm connections
+       self._session = session or _pooled_session(pool_size)
+       self._timeout = (connect_timeout, read_timeout)
+       self._max_retries = max_retries
+       self._max_retry_after = max_retry_after
 
 
    def send_reminder(self, recipient: dict, fitness_class: dict) -> None:
        chat_id = recipient.get("telegram_chat_id", "")
        if not chat_id:
            return
-       text = (
+       self._send_message(chat_id, self._reminder_text(fitness_class))
+
+   def send_reminders(self, recipients: list, fitness_class: dict) -> list:
+       text = self._reminder_text(fitness_class)
+       results = []
+       for recipient in recipients:
+           chat_id = recipient.get("telegram_chat_id", "")
+           try:
+               if chat_id:
+                   self._send_message(chat_id, text)
+               results.append(True)
+           except TelegramRateLimited as e:
+               _raise_throttled(e, results, len(recipients))
+           except Exception:
+               logging.warning("Telegram reminder to %s failed", recipient.get("email", ""), exc_info=True)
+               results.append(False)
+       return results
+
+   def _reminder_text(self, fitness_class: dict) -> str:
+       return (
            f"Reminder: {fitness_class.get('name', '')} on "
            f"{fitness_class.get('date', '')} at "
            f"{fitness_class.get('start_time', '')} "
            f"@ {fitness_class.get('location', '')}"
        )
+
+   def _send_message(self, chat_id: str, text: str):
+       """POST sendMessage, waiting out 429s for as long as Telegram's retry_after asks."""
        url = f"{self._base_url}/bot{self._token}/sendMessage"
-       requests.post(url, json={"chat_id": chat_id, "text": text}, timeout=10)
\ No newline at end of file
+       for attempt in range(self._max_retries + 1):
+           response = self._session.post(url, json={"chat_id": chat_id, "text": text}, timeout=self._timeout)
+           if response.status_code != HTTPStatus.TOO_MANY_REQUESTS:
+               response.raise_for_status()
+               return
+           retry_after = _retry_after(response)
+           if attempt == self._max_retries or retry_after > self._max_retry_after:
+               raise TelegramRateLimited(retry_after)
+           time.sleep(retry_after)
+
+
+def _retry_after(response) -> float:
+   try:
+       return float(response.json()["parameters"]["retry_after"])
+   except (ValueError, KeyError, TypeError):
+       return float(response.headers.get("Retry-After", 1))
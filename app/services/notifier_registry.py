@@ -0,0 +1,100 @@
+import os
+import threading
+
+from app.config import Config
+from app.services import email_service
+from app.services.notifier import BaseNotifier, EmailNotifier, TelegramNotifier
+from app.services.rate_limiter import TokenBucket
+
+
+def _email_notifier() -> BaseNotifier:
+    return EmailNotifier(email_service.EmailService())
+
+
+def _telegram_notifier() -> BaseNotifier:
+    # With a rate limiter every 429 goes straight back to it, so the whole
+    # channel slows down instead of one thread sleeping and retrying alone
+    limited = Config.NOTIFY_TELEGRAM_RATE_PER_SECOND > 0
+    return TelegramNotifier(
+        Config.TELEGRAM_BOT_TOKEN,
+        pool_size=Config.TELEGRAM_POOL_SIZE,
+        connect_timeout=Config.TELEGRAM_CONNECT_TIMEOUT_SECONDS,
+        read_timeout=Config.TELEGRAM_READ_TIMEOUT_SECONDS,
+        max_retries=0 if limited else Config.TELEGRAM_MAX_RETRIES,
+    )
+
+
+DEFAULT_FACTORIES = {
+    "email": _email_notifier,
+    "telegram": _telegram_notifier,
+}
+
+
+class NotifierRegistry:
+    """
+    One notifier per channel, shared by every reminder sent from this worker.
+    Each notifier (and the boto3 client or HTTP session behind it) is built
+    on first use and reused after that. Clients do not survive fork, so the
+    registry starts over in a new process.
+
+    Provider rate limits are per account or bot, so each channel also gets
+    one TokenBucket (rate_limits, sends per second) shared by every dispatch.
+
+    Tests swap in fakes with override() and drop them again with reset().
+    """
+
+    def __init__(self, factories: dict, rate_limits: dict = None):
+        self._factories = dict(factories)
+        self._rate_limits = rate_limits or {}
+        self._instances = {}
+        self._limiters = {}
+        self._pid = None
+        self._lock = threading.Lock()
+
+    @property
+    def channels(self) -> list:
+        return list(self._factories)
+
+    def get(self, channel: str) -> BaseNotifier:
+        with self._lock:
+            self._check_pid()
+            notifier = self._instances.get(channel)
+            if notifier is None:
+                notifier = self._factories[channel]()
+                self._instances[channel] = notifier
+            return notifier
+
+    def all(self) -> dict:
+        return {channel: self.get(channel) for channel in self._factories}
+
+    def limiters(self) -> dict:
+        """The rate limiter of every channel that has a limit configured."""
+        with self._lock:
+            self._check_pid()
+            for channel, rate in self._rate_limits.items():
+                if rate > 0 and channel not in self._limiters:
+                    self._limiters[channel] = TokenBucket(rate)
+            return dict(self._limiters)
+
+    def override(self, channel: str, notifier: BaseNotifier):
+        """Use notifier for channel in this process until reset()."""
+        with self._lock:
+            self._check_pid()
+            self._instances[channel] = notifier
+
+    def reset(self):
+        with self._lock:
+            self._instances = {}
+            self._limiters = {}
+
+    def _check_pid(self):
+        if self._pid != os.getpid():
+            self._instances = {}
+            self._limiters = {}
+            self._pid = os.getpid()
+
+
+notifier_registry = NotifierRegistry(DEFAULT_FACTORIES, rate_limits={
+    "email": Config.NOTIFY_EMAIL_RATE_PER_SECOND,
+    "telegram": Config.NOTIFY_TELEGRAM_RATE_PER_SECOND,
+})
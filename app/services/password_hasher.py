@@ -0,0 +1,212 @@
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+
+import bcrypt
+import click
+from flask.cli import AppGroup
+
+from app.config import Config
+from app.db import DB
+from app.db.settings import SettingsResource
+
+DEFAULT_ROUNDS = 12
+# Calibration never goes below MIN_ROUNDS however slow the node is
+MIN_ROUNDS = 10
+MAX_ROUNDS = 16
+ROUNDS_SETTING = "bcrypt_rounds"
+
+passwords_cli = AppGroup("passwords", help="Calibrate the bcrypt work factor.")
+
+
+class PasswordPoolSaturated(Exception):
+    """Raised instead of queueing when too many hash operations are already pending."""
+
+
+def _hash(password: bytes, rounds: int) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds))
+
+
+def _verify(password: bytes, hashed: bytes) -> bool:
+    return bcrypt.checkpw(password, hashed)
+
+
+def hash_rounds(hashed: bytes) -> int:
+    """Cost factor of a bcrypt hash such as b"$2b$12$..."."""
+    return int(hashed.split(b"$")[2])
+
+
+def calibrate_rounds(target_ms: float, min_rounds: int = MIN_ROUNDS, max_rounds: int = MAX_ROUNDS):
+    """
+    Find the highest cost whose hash takes no longer than target_ms on this
+    machine. Each extra round doubles the work, so rounds are only raised
+    while twice the last measurement still fits the target.
+
+    Returns:
+        tuple: (rounds, measured milliseconds at that cost)
+    """
+    def measure(rounds):
+        started = time.perf_counter()
+        _hash(b"calibration-password", rounds)
+        return (time.perf_counter() - started) * 1000
+
+    rounds = min_rounds
+    elapsed_ms = measure(rounds)
+    while rounds < max_rounds and elapsed_ms * 2 <= target_ms:
+        rounds += 1
+        elapsed_ms = measure(rounds)
+    return rounds, elapsed_ms
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a bounded pool of worker processes so its CPU cost does not
+    land on request threads. At most max_pending operations may be running or
+    queued; beyond that callers get PasswordPoolSaturated straight away.
+    A caller that waits longer than timeout also gets PasswordPoolSaturated,
+    but the operation keeps its slot until the worker process finishes it.
+    With workers=0 operations run inline but the same limit applies.
+    """
+
+    def __init__(self, workers: int, max_pending: int, timeout: float = 30,
+                 rounds: int = DEFAULT_ROUNDS):
+        self.workers = workers
+        self.rounds = rounds
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    def hash(self, password: str, rounds: int = None) -> bytes:
+        return self._run(_hash, password.encode("utf-8"), rounds or self.rounds)
+
+    def verify(self, password: str, hashed: bytes) -> bool:
+        return self._run(_verify, password.encode("utf-8"), hashed)
+
+    def needs_rehash(self, hashed: bytes) -> bool:
+        return hash_rounds(hashed) != self.rounds
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "rounds": self.rounds,
+                "max_pending": self.max_pending,
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+            }
+
+    def _pool(self) -> ProcessPoolExecutor:
+        # One pool per process; a pool inherited across fork is unusable
+        with self._lock:
+            if self._pid != os.getpid():
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"),
+                )
+                self._pid = os.getpid()
+            return self._executor
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordPoolSaturated("Too many concurrent password operations, try again shortly")
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        if self.workers == 0:
+            try:
+                return fn(*args)
+            finally:
+                self._release()
+
+        try:
+            future = self._pool().submit(fn, *args)
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            # Frees the slot now if the operation never started; otherwise it is freed when the worker finishes
+            future.cancel()
+            with self._lock:
+                self.timed_out += 1
+            raise PasswordPoolSaturated("Password operation timed out, try again shortly") from None
+
+    def _release(self):
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+        self._slots.release()
+
+
+password_hasher = PasswordHasher(
+    workers=Config.PASSWORD_HASH_WORKERS,
+    max_pending=Config.PASSWORD_HASH_MAX_PENDING,
+    timeout=Config.PASSWORD_HASH_TIMEOUT_SECONDS,
+    rounds=Config.BCRYPT_ROUNDS or DEFAULT_ROUNDS,
+)
+
+
+def record_rounds(rounds: int, elapsed_ms: float, target_ms: float):
+    SettingsResource().put(ROUNDS_SETTING, rounds, measured_ms=round(elapsed_ms, 1), target_ms=target_ms)
+
+
+def load_recorded_rounds():
+    """Adopt the cost recorded by the last calibration, if there is one."""
+    rounds = SettingsResource().get(ROUNDS_SETTING)
+    if rounds:
+        password_hasher.rounds = rounds
+
+
+def init_password_hasher(app):
+    """
+    Settle the bcrypt cost for this deployment. BCRYPT_ROUNDS wins when set;
+    otherwise BCRYPT_CALIBRATE_ON_STARTUP measures this machine and records
+    the result, and failing both each worker adopts the recorded cost when
+    it first connects.
+    """
+    app.cli.add_command(passwords_cli)
+    if app.config["BCRYPT_ROUNDS"]:
+        password_hasher.rounds = app.config["BCRYPT_ROUNDS"]
+    elif app.config["BCRYPT_CALIBRATE_ON_STARTUP"]:
+        target_ms = app.config["BCRYPT_TARGET_MS"]
+        rounds, elapsed_ms = calibrate_rounds(target_ms)
+        logging.info("bcrypt calibrated to %d rounds (%.1f ms, target %.0f ms)", rounds, elapsed_ms, target_ms)
+        password_hasher.rounds = rounds
+        DB.on_connect(lambda: record_rounds(rounds, elapsed_ms, target_ms))
+    else:
+        DB.on_connect(load_recorded_rounds)
+
+
+@passwords_cli.command("calibrate")
+@click.option("--target-ms", type=float, default=None, help="Target hash time; defaults to BCRYPT_TARGET_MS.")
+@click.option("--dry-run", is_flag=True, help="Measure only, do not record the cost.")
+def calibrate_command(target_ms, dry_run):
+    """Measure this machine and record the bcrypt cost new hashes should use."""
+    target_ms = target_ms or Config.BCRYPT_TARGET_MS
+    rounds, elapsed_ms = calibrate_rounds(target_ms)
+    click.echo(f"rounds={rounds} measured_ms={elapsed_ms:.1f} target_ms={target_ms:.0f}")
+    if not dry_run:
+        record_rounds(rounds, elapsed_ms, target_ms)
+
+
+@passwords_cli.command("show")
+def show_command():
+    """Print the recorded bcrypt cost."""
+    click.echo(f"rounds={SettingsResource().get(ROUNDS_SETTING)}")
@@ -0,0 +1,72 @@
+import threading
+import time
+
+# Share of max_rate regained after each unthrottled send
+RECOVERY_STEP = 0.1
+# Pause after a throttling error that names no retry delay
+DEFAULT_BACKOFF_SECONDS = 1.0
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket whose rate adapts to provider throttling.
+
+    acquire() blocks until enough tokens have accumulated. A request larger
+    than the bucket waits for a full bucket and leaves it in debt, so bulk
+    calls still average out to the configured rate. backoff() halves the
+    rate (down to min_rate) and pauses the bucket; record_success() wins the
+    rate back in small steps.
+    """
+
+    def __init__(self, rate: float, burst: float = None, min_rate: float = None):
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate or rate / 8
+        self.capacity = burst or max(1.0, rate)
+        self.throttled = 0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self, tokens: float = 1, timeout: float = None) -> bool:
+        """Take tokens, waiting as needed. Returns False if that would take longer than timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self._paused_until - now
+                if wait <= 0:
+                    needed = min(tokens, self.capacity)
+                    if self._tokens >= needed:
+                        self._tokens -= tokens
+                        return True
+                    wait = (needed - self._tokens) / self.rate
+                if deadline is not None and now + wait > deadline:
+                    return False
+                self._cond.wait(wait)
+
+    def backoff(self, retry_after: float = None):
+        """The provider throttled us: slow down and pause for retry_after seconds."""
+        with self._cond:
+            now = time.monotonic()
+            self.throttled += 1
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = 0.0
+            self._updated = now
+            self._paused_until = max(self._paused_until, now + (retry_after or DEFAULT_BACKOFF_SECONDS))
+
+    def record_success(self):
+        with self._cond:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * RECOVERY_STEP)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {"rate": self.rate, "max_rate": self.max_rate, "throttled": self.throttled}
+
+    def _refill(self, now: float):
+        if now > self._paused_until:
+            start = max(self._updated, self._paused_until)
+            self._tokens = min(self.capacity, self._tokens + (now - start) * self.rate)
+        self._updated = now
@@ -0,0 +1,207 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from app.config import Config
+from app.db import DB
+from app.db.fitness_classes import FitnessClassResource
+from app.db.reminder_jobs import ReminderJobResource
+from app.db.reminder_log import ReminderLogResource
+from app.db.users import UserResource, DEFAULT_CHANNELS
+from app.services.dispatcher import NotificationDispatcher
+from app.services.notifier_registry import notifier_registry
+from app.services.scheduler import get_scheduler, register_periodic_job, worker_id
+
+# Running jobs write their progress at most this often
+PROGRESS_FLUSH_SECONDS = 1.0
+AUTO_REMINDER_JOB_ID = "auto-reminders"
+REMINDER_JOB_CHECK_ID = "reminder-job-check"
+# Missed heartbeats after which a job's worker is taken to be gone
+STALE_HEARTBEATS = 3
+
+reminders_cli = AppGroup("reminders", help="Send automatic class reminders.")
+
+
+def build_dispatcher() -> NotificationDispatcher:
+    return NotificationDispatcher(
+        notifiers=notifier_registry.all(),
+        channel_limits={
+            "email": Config.NOTIFY_EMAIL_CONCURRENCY,
+            "telegram": Config.NOTIFY_TELEGRAM_CONCURRENCY,
+        },
+        deadline_seconds=Config.NOTIFY_DEADLINE_SECONDS,
+        rate_limiters=notifier_registry.limiters(),
+    )
+
+
+def build_recipients(participants: list) -> list:
+    """Pair each participant with their channels, fetching all preferences in one query."""
+    preferences = UserResource().get_notification_preferences(
+        [participant.get("email", "") for participant in participants]
+    )
+    recipients = []
+    for participant in participants:
+        user = preferences.get(participant.get("email", ""), {})
+        recipient = {
+            **participant,
+            "telegram_chat_id": user.get("telegram_chat_id", ""),
+        }
+        recipients.append((recipient, user.get("notification_channels", list(DEFAULT_CHANNELS))))
+    return recipients
+
+
+class _JobProgress:
+    """Counts finished sends and writes them to the job document, throttled."""
+
+    def __init__(self, jobs: ReminderJobResource, job_id: str, channels):
+        self._jobs = jobs
+        self._job_id = job_id
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self.completed = 0
+        self.channels = {channel: {"sent": 0, "failed": 0} for channel in channels}
+
+    def record(self, channel: str, ok: bool):
+        with self._lock:
+            self.completed += 1
+            self.channels[channel]["sent" if ok else "failed"] += 1
+            if time.monotonic() - self._last_flush >= PROGRESS_FLUSH_SECONDS:
+                self._jobs.update_progress(self._job_id, self.completed, self.channels)
+                self._last_flush = time.monotonic()
+
+
+def run_reminder_job(app, job_id: str):
+    """Send the reminders for a queued job, recording progress and the final report."""
+    with app.app_context():
+        jobs = ReminderJobResource()
+        try:
+            class_id = jobs.get_job(job_id)["class_id"]
+            fitness_classes = FitnessClassResource()
+            fitness_class = fitness_classes.get_fitness_class_by_id(class_id)
+            if fitness_class is None:
+                raise ValueError("Class not found")
+            recipients = build_recipients(fitness_classes.get_participants(class_id) or [])
+
+            dispatcher = build_dispatcher()
+            sends_total = sum(
+                1 for _, channels in recipients for channel in channels if channel in dispatcher.channels
+            )
+            jobs.mark_running(job_id, len(recipients), sends_total)
+            progress = _JobProgress(jobs, job_id, dispatcher.channels)
+            report = dispatcher.dispatch(recipients, fitness_class, on_result=progress.record)
+            jobs.finish(job_id, report, progress.completed)
+        except Exception as e:
+            logging.exception("Reminder job %s failed", job_id)
+            jobs.fail(job_id, str(e))
+
+
+def enqueue_reminder_job(class_id: str, requested_by: str) -> str:
+    """Record a reminder job and hand it to this worker's scheduler. Returns the job id."""
+    job_id = ReminderJobResource().create_job(class_id, requested_by, owner=worker_id())
+    app = current_app._get_current_object()
+    get_scheduler(app).add_job(
+        id=f"reminder-{job_id}", func=run_reminder_job, args=[app, job_id], trigger="date",
+    )
+    return job_id
+
+
+def check_reminder_jobs(heartbeat_seconds: float = None) -> int:
+    """
+    Heartbeat this worker's active jobs, then fail every job whose worker
+    has missed STALE_HEARTBEATS heartbeats. Returns how many were failed.
+    """
+    heartbeat_seconds = heartbeat_seconds or Config.REMINDER_JOB_HEARTBEAT_SECONDS
+    jobs = ReminderJobResource()
+    jobs.heartbeat(worker_id())
+    failed = jobs.fail_abandoned(
+        datetime.now(timezone.utc) - timedelta(seconds=heartbeat_seconds * STALE_HEARTBEATS),
+    )
+    if failed:
+        logging.warning("Marked %d abandoned reminder jobs as failed", failed)
+    return failed
+
+
+def run_reminder_job_check(app):
+    with app.app_context():
+        try:
+            check_reminder_jobs()
+        except Exception:
+            logging.exception("Reminder job check failed")
+
+
+def init_reminder_jobs(app):
+    """Keep this worker's jobs alive and clear up after workers that stopped, at startup and periodically."""
+    DB.on_connect(check_reminder_jobs)
+    register_periodic_job(app, REMINDER_JOB_CHECK_ID, run_reminder_job_check,
+                          app.config["REMINDER_JOB_HEARTBEAT_SECONDS"])
+
+
+def scan_upcoming_classes(window_minutes: float = None, batch_size: int = None, now: datetime = None) -> dict:
+    """
+    Remind everyone booked on a class starting within the next window_minutes
+    who has not been reminded yet. Classes come from one range query on
+    start_at; participants are claimed in the reminder log and sent to
+    batch_size at a time. Participants whose every send failed are released
+    so a later scan retries them while the class is still in the window.
+
+    Returns:
+        dict: Number of classes scanned, participants claimed and reached.
+    """
+    window_minutes = window_minutes or Config.AUTO_REMINDER_WINDOW_MINUTES
+    batch_size = batch_size or Config.AUTO_REMINDER_BATCH_SIZE
+    now = now or datetime.now()
+
+    fitness_classes = FitnessClassResource()
+    reminder_log = ReminderLogResource()
+    dispatcher = build_dispatcher()
+    summary = {"classes": 0, "claimed": 0, "participants_reached": 0}
+
+    for fitness_class in fitness_classes.iter_classes_starting_between(now, now + timedelta(minutes=window_minutes)):
+        summary["classes"] += 1
+        class_oid = fitness_class["_id"]
+        participants = fitness_classes.bookings.iter_participants(class_oid, batch_size)
+        while batch := list(islice(participants, batch_size)):
+            claimed = reminder_log.claim(class_oid, [participant["email"] for participant in batch])
+            batch = [participant for participant in batch if participant["email"] in claimed]
+            if not batch:
+                continue
+            recipients = build_recipients(batch)
+            report = dispatcher.dispatch(recipients, fitness_class)
+            # Timed-out sends may still arrive, so only outright failures are retried
+            reminder_log.release(class_oid, [recipients[index][0]["email"] for index in report["failed"]])
+            summary["claimed"] += len(batch)
+            summary["participants_reached"] += report["participants_reached"]
+    return summary
+
+
+def run_reminder_scan(app):
+    with app.app_context():
+        try:
+            summary = scan_upcoming_classes()
+        except Exception:
+            logging.exception("Automatic reminder scan failed")
+            return
+        if summary["claimed"]:
+            logging.info("Automatic reminders: %s", summary)
+
+
+def init_auto_reminders(app):
+    app.cli.add_command(reminders_cli)
+    if app.config["AUTO_REMINDERS_ENABLED"]:
+        register_periodic_job(app, AUTO_REMINDER_JOB_ID, run_reminder_scan,
+                              app.config["AUTO_REMINDER_INTERVAL_SECONDS"], exclusive=True)
+
+
+@reminders_cli.command("scan")
+@click.option("--window-minutes", type=float, default=None, help="Defaults to AUTO_REMINDER_WINDOW_MINUTES.")
+def scan_command(window_minutes):
+    """Run one automatic reminder scan now."""
+    summary = scan_upcoming_classes(window_minutes=window_minutes)
+    click.echo(f"classes={summary['classes']} claimed={summary['claimed']} "
+               f"reached={summary['participants_reached']}")
@@ -0,0 +1,99 @@
+import logging
+import os
+import socket
+import threading
+
+from flask_apscheduler import APScheduler
+
+from app.db.leases import LeaseResource
+
+_lock = threading.Lock()
+
+# Periodic jobs get their own threads so long reminder jobs cannot starve them
+PERIODIC_EXECUTOR = "periodic"
+PERIODIC_JOB_WORKERS = 4
+# An exclusive job's lease outlives this many of its intervals, so a worker
+# that stops holding it hands the job over after at most that long
+EXCLUSIVE_LEASE_INTERVALS = 3
+
+
+def worker_id() -> str:
+    """Identifies this process across hosts, e.g. as the owner of a job or lease."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def init_scheduler(app):
+    """
+    Configure Flask-APScheduler for the app. The scheduler itself starts on
+    first use, or on the first request when periodic jobs are registered.
+    """
+    app.config.setdefault("SCHEDULER_API_ENABLED", False)
+    app.config.setdefault("SCHEDULER_EXECUTORS", {
+        "default": {"type": "threadpool", "max_workers": app.config["REMINDER_JOB_WORKERS"]},
+        PERIODIC_EXECUTOR: {"type": "threadpool", "max_workers": PERIODIC_JOB_WORKERS},
+    })
+    app.config.setdefault("SCHEDULER_JOB_DEFAULTS", {"coalesce": True, "misfire_grace_time": None})
+    app.extensions["scheduler_periodic_jobs"] = []
+
+    @app.before_request
+    def _start_periodic_jobs():
+        if app.extensions["scheduler_periodic_jobs"]:
+            get_scheduler(app)
+
+
+def register_periodic_job(app, job_id: str, func, seconds: float, exclusive: bool = False):
+    """
+    Run func(app) every `seconds` in each worker once its scheduler has
+    started. With exclusive, only the worker holding the job's lease runs it.
+    """
+    if exclusive:
+        func = _run_exclusively(job_id, func, seconds * EXCLUSIVE_LEASE_INTERVALS)
+    app.extensions["scheduler_periodic_jobs"].append((job_id, func, seconds))
+
+
+def _run_exclusively(job_id: str, func, ttl_seconds: float):
+    """
+    Wrap func so it only runs while this worker holds the job_id lease. The
+    holder renews it on every run (and after a long one) rather than
+    releasing it, so the job stays in one worker until that worker stops.
+    """
+    def run(app):
+        leases = LeaseResource()
+        try:
+            if not leases.acquire(job_id, worker_id(), ttl_seconds):
+                return
+        except Exception:
+            logging.exception("Could not take the %s lease", job_id)
+            return
+        try:
+            func(app)
+        finally:
+            try:
+                leases.acquire(job_id, worker_id(), ttl_seconds)
+            except Exception:
+                logging.exception("Could not renew the %s lease", job_id)
+    return run
+
+
+def get_scheduler(app) -> APScheduler:
+    """
+    Return the app's scheduler for this process, starting it if needed.
+    Scheduler threads do not survive fork, so each worker (pid) gets its own.
+    """
+    entry = app.extensions.get("scheduler")
+    if entry is not None and entry[0] == os.getpid():
+        return entry[1]
+    with _lock:
+        entry = app.extensions.get("scheduler")
+        if entry is None or entry[0] != os.getpid():
+            scheduler = APScheduler()
+            scheduler.init_app(app)
+            for job_id, func, seconds in app.extensions.get("scheduler_periodic_jobs", []):
+                scheduler.add_job(id=job_id, func=func, args=[app], trigger="interval", seconds=seconds,
+                                  executor=PERIODIC_EXECUTOR)
+            # Start the underlying scheduler directly: APScheduler.start() is a
+            # no-op under `flask run --debug` without the reloader
+            scheduler.scheduler.start()
+            entry = (os.getpid(), scheduler)
+            app.extensions["scheduler"] = entry
+        return entry[1]
@@ -0,0 +1,74 @@
+"""
+Micro-benchmark: encode a 10k-class listing with each JSON codec.
+
+The "json + serialize pass" row reproduces the old response path, which
+converted every _id to a string before handing the list to json.dumps.
+
+Run from the project root:
+
+    python -m benchmarks.json_codec [--classes 10000] [--repeat 5]
+"""
+import argparse
+import json
+import timeit
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+from app.codec import OrjsonCodec, StdlibJsonCodec, orjson
+from app.db.utils import serialize_items
+
+
+def build_listing(count: int) -> list:
+    start = datetime(2026, 1, 1, 7, 0)
+    listing = []
+    for i in range(count):
+        start_at = start + timedelta(hours=i)
+        listing.append({
+            "_id": ObjectId(),
+            "name": f"Class {i}",
+            "description": "A relaxing pilates class",
+            "date": start_at.strftime("%Y-%m-%d"),
+            "start_time": start_at.strftime("%H:%M"),
+            "end_time": (start_at + timedelta(hours=1)).strftime("%H:%M"),
+            "location": "Rec Center",
+            "trainer": "Ryan Opande",
+            "capacity": 20,
+            "available_slots": i % 20,
+            "created_by": "admin@example.com",
+            "start_at": start_at,
+            "end_at": start_at + timedelta(hours=1),
+        })
+    return listing
+
+
+def legacy_encode(listing: list) -> bytes:
+    items = serialize_items([dict(c) for c in listing])
+    for item in items:
+        item["start_at"] = item["start_at"].isoformat()
+        item["end_at"] = item["end_at"].isoformat()
+    return json.dumps({"message": items}).encode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--classes", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    listing = build_listing(args.classes)
+    candidates = [("json + serialize pass", legacy_encode)]
+    stdlib = StdlibJsonCodec()
+    candidates.append(("json codec", lambda data: stdlib.dumps({"message": data})))
+    if orjson is not None:
+        fast = OrjsonCodec()
+        candidates.append(("orjson codec", lambda data: fast.dumps({"message": data})))
+
+    print(f"{args.classes} classes, best of {args.repeat}")
+    for label, encode in candidates:
+        best = min(timeit.repeat(lambda: encode(listing), number=1, repeat=args.repeat))
+        print(f"{label:<24} {best * 1000:8.1f} ms  {args.classes / best:12,.0f} classes/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,9 +10,15 @@ from pathlib import Path
 # to force mock db for tests
 os.environ["MOCK_DB"] = "true" 
 os.environ["TESTING"] = "true"
+# hash passwords inline; the process pool itself is covered in test_password_hasher
+os.environ["PASSWORD_HASH_WORKERS"] = "0"
 
 from app import create_app
 from app.db import DB
+from app.db.fitness_classes import class_cache
+from app.db.users import user_cache
+from app.services.notifier import EmailNotifier, TelegramNotifier
+from app.services.notifier_registry import notifier_registry
 import app.apis.classes as classes_module
 import app.apis.auth as auth_module
 from tests.utils import auth_header, sample_class_data
@@ -38,6 +44,9 @@ def app(mock_db):
 def clean_db(app):
     DB.get_collection("users").delete_many({})
     DB.get_collection("fitness_class").delete_many({})
+    DB.get_collection("bookings").delete_many({})
+    class_cache.invalidate()
+    user_cache.invalidate()
     yield
 
 @pytest.fixture
@@ -51,26 +60,34 @@ def runner(app):
 
 @pytest.fixture(autouse=True)
 def mock_email_service():
-    import app.services.email_service as email_module
-    original_cls = email_module.EmailService
-
-    mock_cls = MagicMock()
     mock_instance = MagicMock()
-    mock_cls.return_value = mock_instance
     mock_instance.send_reminder.return_value = None
 
-    email_module.EmailService = mock_cls
+    # Bulk sends go through send_reminder so tests can assert on, or make
+    # fail, individual recipients either way
+    def send_bulk_reminders(recipients, **class_fields):
+        statuses = []
+        for recipient in recipients:
+            try:
+                mock_instance.send_reminder(to_email=recipient.get("email", ""), **class_fields)
+                statuses.append({"email": recipient.get("email", ""), "status": "Success", "error": ""})
+            except Exception as e:
+                statuses.append({"email": recipient.get("email", ""), "status": "Failed", "error": str(e)})
+        return statuses
+    mock_instance.send_bulk_reminders.side_effect = send_bulk_reminders
+
+    notifier_registry.override("email", EmailNotifier(mock_instance))
     yield mock_instance
-    email_module.EmailService = original_cls
+    notifier_registry.reset()
 
 
 @pytest.fixture(autouse=True)
 def mock_telegram_requests():
-    import app.services.notifier as notifier_module
-    original_post = notifier_module.requests.post
-    notifier_module.requests.post = MagicMock(return_value=MagicMock(status_code=200))
-    yield notifier_module.requests.post
-    notifier_module.requests.post = original_post
+    session = MagicMock()
+    session.post.return_value = MagicMock(status_code=200)
+    notifier_registry.override("telegram", TelegramNotifier("test-token", session=session))
+    yield session.post
+    notifier_registry.reset()
 
 
 def _get_token(client, name, email, phone, password, role="member"):
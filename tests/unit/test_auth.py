@@ -1,6 +1,8 @@
 from http import HTTPStatus
 from unittest.mock import MagicMock
 
+from flask_jwt_extended import decode_token
+
 import app.apis.auth as auth_module
 
 
@@ -100,6 +102,20 @@ def test_login_success(client):
     assert data["message"] == "Login successful"
 
 
+def test_login_token_carries_profile_claims(app, client):
+    client.post("/auth/register", json={
+        "name": "John", "email": "claims@test.com",
+        "phone": "+123", "password": "pass123",
+    })
+    token = client.post("/auth/login", json={
+        "email": "claims@test.com", "password": "pass123",
+    }).get_json()["access_token"]
+    with app.app_context():
+        claims = decode_token(token)
+    assert (claims["name"], claims["email"], claims["phone"], claims["role"]) == \
+        ("John", "claims@test.com", "+123", "member")
+
+
 def test_login_wrong_password(client):
     client.post("/auth/register", json={
         "name": "John", "email": "wrong@test.com",
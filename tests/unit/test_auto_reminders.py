@@ -0,0 +1,146 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from flask import Flask
+
+import app.db.reminder_log as reminder_log_module
+from app.db import DB
+from app.db.fitness_classes import FitnessClassResource
+from app.db.leases import LeaseResource
+from app.db.reminder_log import ReminderLogResource
+from app.services.dispatcher import NotificationDispatcher
+from app.services.reminders import reminders_cli, scan_upcoming_classes
+from app.services.scheduler import get_scheduler, init_scheduler, register_periodic_job, worker_id
+
+
+@pytest.fixture(autouse=True)
+def clean_reminder_log():
+    ReminderLogResource().delete_all_marks()
+    yield
+    ReminderLogResource().delete_all_marks()
+
+
+def _class_starting_in(hours, *emails):
+    start = datetime.now() + timedelta(hours=hours)
+    fc = FitnessClassResource()
+    class_id = fc.create_fitness_class(
+        "Spin", "desc", start.strftime("%Y-%m-%d"), start.strftime("%H:%M"),
+        (start + timedelta(hours=1)).strftime("%H:%M"), "Gym", "Jane", 10, "admin@test.com",
+    )
+    for email in emails:
+        fc.book_class(class_id, {"name": email, "email": email, "phone": "1"})
+    return class_id
+
+
+def test_scan_reminds_classes_inside_window_once(mock_email_service):
+    _class_starting_in(2, "a@test.com", "b@test.com")
+    _class_starting_in(72, "c@test.com")
+
+    summary = scan_upcoming_classes(window_minutes=24 * 60)
+    assert summary == {"classes": 1, "claimed": 2, "participants_reached": 2}
+    reminded = sorted(call.kwargs["to_email"] for call in mock_email_service.send_reminder.call_args_list)
+    assert reminded == ["a@test.com", "b@test.com"]
+
+    assert scan_upcoming_classes(window_minutes=24 * 60)["claimed"] == 0
+    assert mock_email_service.send_reminder.call_count == 2
+
+
+def test_scan_picks_up_late_bookings(mock_email_service):
+    class_id = _class_starting_in(2, "a@test.com")
+    scan_upcoming_classes(window_minutes=60 * 3)
+    FitnessClassResource().book_class(class_id, {"name": "L", "email": "late@test.com", "phone": "1"})
+    summary = scan_upcoming_classes(window_minutes=60 * 3)
+    assert summary["claimed"] == 1
+    assert mock_email_service.send_reminder.call_args.kwargs["to_email"] == "late@test.com"
+
+
+def test_scan_sends_in_batches(mock_email_service):
+    _class_starting_in(1, *[f"u{i}@test.com" for i in range(5)])
+    summary = scan_upcoming_classes(window_minutes=120, batch_size=2)
+    assert summary["claimed"] == summary["participants_reached"] == 5
+    assert mock_email_service.send_reminder.call_count == 5
+
+
+def test_failed_reminders_are_retried(mock_email_service):
+    _class_starting_in(2, "a@test.com")
+    mock_email_service.send_reminder.side_effect = Exception("SES down")
+    assert scan_upcoming_classes(window_minutes=180)["participants_reached"] == 0
+
+    mock_email_service.send_reminder.side_effect = None
+    assert scan_upcoming_classes(window_minutes=180)["participants_reached"] == 1
+
+
+def test_timed_out_reminders_are_not_retried(mock_email_service):
+    _class_starting_in(2, "a@test.com")
+    timed_out = {"participants_reached": 0, "reached": [], "failed": [],
+                 "channels": {"email": {"sent": 0, "failed": 0, "timed_out": 1}}, "deadline_exceeded": True}
+    with patch.object(NotificationDispatcher, "dispatch", return_value=timed_out):
+        assert scan_upcoming_classes(window_minutes=180)["claimed"] == 1
+    assert scan_upcoming_classes(window_minutes=180)["claimed"] == 0
+    mock_email_service.send_reminder.assert_not_called()
+
+
+def test_claim_recreates_missing_unique_index():
+    marks = DB.get_collection("reminder_log")
+    marks.drop_index("class_id_email_unique")
+    reminder_log_module._indexes_ensured["pid"] = None
+    class_oid = FitnessClassResource().collection.insert_one({}).inserted_id
+    assert ReminderLogResource().claim(class_oid, ["a@test.com"]) == {"a@test.com"}
+    assert "class_id_email_unique" in marks.index_information()
+
+
+def test_claim_skips_marked_participants():
+    class_oid = FitnessClassResource().collection.insert_one({}).inserted_id
+    log = ReminderLogResource()
+    assert log.claim(class_oid, ["a@test.com", "b@test.com"]) == {"a@test.com", "b@test.com"}
+    assert log.claim(class_oid, ["a@test.com", "c@test.com", "c@test.com"]) == {"c@test.com"}
+    log.release(class_oid, ["a@test.com"])
+    assert log.claim(class_oid, ["a@test.com"]) == {"a@test.com"}
+
+
+def test_reminders_scan_cli(app, mock_email_service):
+    _class_starting_in(2, "a@test.com")
+    result = app.test_cli_runner().invoke(reminders_cli, ["scan", "--window-minutes", "180"])
+    assert result.exit_code == 0
+    assert "classes=1 claimed=1 reached=1" in result.output
+
+
+def test_periodic_jobs_start_with_scheduler():
+    app = Flask(__name__)
+    app.config["REMINDER_JOB_WORKERS"] = 1
+    init_scheduler(app)
+    register_periodic_job(app, "scan", lambda app: None, seconds=60)
+    scheduler = get_scheduler(app)
+    try:
+        assert scheduler.running
+        assert scheduler.get_job("scan").trigger.interval == timedelta(seconds=60)
+        assert get_scheduler(app) is scheduler
+    finally:
+        scheduler.shutdown(wait=False)
+
+
+def test_exclusive_periodic_job_runs_in_one_worker():
+    LeaseResource().delete_all_leases()
+    app = Flask(__name__)
+    app.config["REMINDER_JOB_WORKERS"] = 1
+    init_scheduler(app)
+    runs = []
+    register_periodic_job(app, "scan", runs.append, seconds=60, exclusive=True)
+    (_, run, _), = app.extensions["scheduler_periodic_jobs"]
+    try:
+        run(app)
+        with patch("app.services.scheduler.worker_id", return_value="other-host:1"):
+            run(app)
+        run(app)
+        assert runs == [app, app]
+
+        leases = LeaseResource()
+        leases.collection.update_one({"_id": "scan"}, {"$set": {"expires_at": datetime(2000, 1, 1, tzinfo=timezone.utc)}})
+        with patch("app.services.scheduler.worker_id", return_value="other-host:1"):
+            run(app)
+        assert len(runs) == 3
+        assert leases.collection.find_one({"_id": "scan"})["owner"] == "other-host:1"
+        assert not leases.acquire("scan", worker_id(), 60)
+    finally:
+        LeaseResource().delete_all_leases()
@@ -1,8 +1,11 @@
 from http import HTTPStatus
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
+
+from flask_jwt_extended import create_access_token
 
 from app.db import DB
 from app.db.fitness_classes import FitnessClassResource
+from app.db.users import UserResource
 import app.apis.classes as classes_module
 from tests.utils import auth_header, sample_class_data, past_date_str, future_date_str
 
@@ -89,14 +92,50 @@ def test_book_class_no_auth(client, created_class_id):
                                 HTTPStatus.INTERNAL_SERVER_ERROR)
 
 
-def test_book_class_user_deleted(client, member_token, created_class_id):
+def _legacy_member_token(app):
+    # Tokens issued before name/phone were added to the claims
+    with app.app_context():
+        return create_access_token(identity="member@test.com",
+                                   additional_claims={"email": "member@test.com", "role": "member"})
+
+
+def test_book_class_user_deleted(app, client, member_token, created_class_id):
     DB.get_collection("users").delete_many({"email": "member@test.com"})
     resp = client.post(f"/classes/{created_class_id}/book",
-                       headers=auth_header(member_token))
+                       headers=auth_header(_legacy_member_token(app)))
     assert resp.status_code == HTTPStatus.NOT_FOUND
     assert "User not found" in resp.get_json()["message"]
 
 
+def test_book_class_uses_token_profile_without_user_read(client, member_token, admin_token, created_class_id):
+    with patch.object(UserResource, "get_user_by_email", side_effect=AssertionError("unexpected user read")):
+        resp = client.post(f"/classes/{created_class_id}/book",
+                           headers=auth_header(member_token))
+    assert resp.status_code == HTTPStatus.OK
+    participants = client.get(f"/classes/{created_class_id}/participants",
+                              headers=auth_header(admin_token)).get_json()["message"]
+    assert participants == [{"name": "Test Member", "email": "member@test.com", "phone": "+1234567890"}]
+
+
+def test_book_class_legacy_token_falls_back_to_lookup(app, client, member_token, admin_token, created_class_id):
+    resp = client.post(f"/classes/{created_class_id}/book",
+                       headers=auth_header(_legacy_member_token(app)))
+    assert resp.status_code == HTTPStatus.OK
+    participants = client.get(f"/classes/{created_class_id}/participants",
+                              headers=auth_header(admin_token)).get_json()["message"]
+    assert participants[0]["name"] == "Test Member"
+
+
+def test_book_class_legacy_token_user_without_profile_fields(app, client, admin_token, created_class_id):
+    UserResource().add_multiple_users([{"email": "member@test.com", "role": "member"}])
+    resp = client.post(f"/classes/{created_class_id}/book",
+                       headers=auth_header(_legacy_member_token(app)))
+    assert resp.status_code == HTTPStatus.OK
+    participants = client.get(f"/classes/{created_class_id}/participants",
+                              headers=auth_header(admin_token)).get_json()["message"]
+    assert participants == [{"name": "", "email": "member@test.com", "phone": ""}]
+
+
 def test_book_class_with_invalid_stored_datetime(client, member_token):
     fc = FitnessClassResource()
     class_id = fc.create_fitness_class(
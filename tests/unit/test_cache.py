@@ -0,0 +1,110 @@
+from unittest.mock import MagicMock, patch
+
+from app.db.cache import VersionedCache
+from app.db.fitness_classes import class_cache
+from app.db.users import UserResource, user_cache
+from tests.utils import auth_header, sample_class_data
+
+
+def test_cache_hit_and_miss_counters():
+    cache = VersionedCache()
+    assert cache.get("k") is None
+    cache.put("k", [1], cache.version)
+    assert cache.get("k") == [1]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_cache_entry_expires_after_ttl():
+    cache = VersionedCache(ttl_seconds=5)
+    with patch("app.db.cache.time.monotonic", return_value=100):
+        cache.put("k", "v", cache.version)
+    with patch("app.db.cache.time.monotonic", return_value=106):
+        assert cache.get("k") is None
+
+
+def test_cache_evicts_least_recently_used():
+    cache = VersionedCache(max_entries=2)
+    cache.put("a", 1, cache.version)
+    cache.put("b", 2, cache.version)
+    cache.get("a")
+    cache.put("c", 3, cache.version)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+
+def test_cache_ignores_values_loaded_before_invalidation():
+    cache = VersionedCache()
+    version = cache.version
+    cache.invalidate()
+    cache.put("k", "stale", version)
+    assert cache.get("k") is None
+
+
+def test_disabled_cache_never_stores():
+    cache = VersionedCache(enabled=False)
+    cache.put("k", "v", cache.version)
+    assert cache.get("k") is None
+
+
+def test_class_listing_served_from_cache(client, admin_token):
+    client.post("/classes/", json=sample_class_data(), headers=auth_header(admin_token))
+    client.get("/classes/")
+    hits = class_cache.hits
+    resp = client.get("/classes/")
+    assert len(resp.get_json()["message"]) == 1
+    assert class_cache.hits == hits + 1
+
+
+def test_booking_invalidates_cached_class(client, member_token, created_class_id):
+    client.get("/classes/")
+    version = class_cache.version
+    client.post(f"/classes/{created_class_id}/book", headers=auth_header(member_token))
+    assert class_cache.version > version
+    slots = client.get("/classes/").get_json()["message"][0]["available_slots"]
+    assert slots == 9
+
+
+def test_cache_stats_endpoint(client, admin_token):
+    resp = client.get("/health/cache", headers=auth_header(admin_token))
+    stats = resp.get_json()["message"]
+    assert set(stats) == {"classes", "users"}
+    assert set(stats["classes"]) >= {"hits", "misses", "hit_rate"}
+    assert set(stats["users"]) >= {"hits", "misses", "hit_rate"}
+
+
+def test_cache_stats_endpoint_admin_only(client, member_token):
+    assert client.get("/health/cache", headers=auth_header(member_token)).status_code == 403
+    assert client.get("/health/cache").status_code in (401, 500)
+
+
+def test_user_lookups_served_from_cache():
+    ur = UserResource()
+    user_id = str(ur.create_user("Alice", "alice@test.com", "+1", "member", "pass123"))
+    ur.collection = MagicMock(wraps=ur.collection)
+    first = ur.get_user_by_email("alice@test.com")
+    assert "password" not in first
+    assert ur.get_user_by_email("alice@test.com") == first
+    assert ur.get_user_by_id(user_id)["email"] == "alice@test.com"
+    assert ur.collection.find_one.call_count == 1
+    assert user_cache.stats()["hits"] >= 2
+
+
+def test_cached_user_is_a_copy():
+    ur = UserResource()
+    ur.create_user("Alice", "alice@test.com", "+1", "member", "pass123")
+    ur.get_user_by_email("alice@test.com")["name"] = "Mallory"
+    assert ur.get_user_by_email("alice@test.com")["name"] == "Alice"
+
+
+def test_user_writes_invalidate_cache():
+    ur = UserResource()
+    ur.create_user("Alice", "alice@test.com", "+1", "member", "pass123")
+    assert ur.get_user_by_email("alice@test.com")["notification_channels"] == ["email"]
+    ur.update_preferences("alice@test.com", ["telegram"], "42")
+    assert ur.get_user_by_email("alice@test.com")["notification_channels"] == ["telegram"]
+    ur.delete_all_users()
+    assert ur.get_user_by_email("alice@test.com") is None
+    ur.create_user("Alice", "alice@test.com", "+1", "member", "pass123")
+    assert ur.get_user_by_email("alice@test.com") is not None
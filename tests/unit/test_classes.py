@@ -1,5 +1,6 @@
 from http import HTTPStatus
-from tests.utils import auth_header, sample_class_data, past_date_str
+from app.db.fitness_classes import FitnessClassResource
+from tests.utils import auth_header, sample_class_data, past_date_str, future_date_str
 
 
 def test_get_all_classes_returns_ok(client):
@@ -116,3 +117,88 @@ def test_create_class_non_dict_body(client, admin_token):
     assert resp.status_code == HTTPStatus.BAD_REQUEST
 
 
+
+
+def test_get_classes_paginates_with_cursor(client, admin_token):
+    for day in range(1, 6):
+        client.post("/classes/", json=sample_class_data(name=f"C{day}", date=future_date_str(days=day)),
+                    headers=auth_header(admin_token))
+
+    first = client.get("/classes/?limit=2").get_json()
+    assert [c["name"] for c in first["message"]] == ["C1", "C2"]
+    assert first["next_cursor"]
+
+    second = client.get(f"/classes/?limit=2&after={first['next_cursor']}").get_json()
+    assert [c["name"] for c in second["message"]] == ["C3", "C4"]
+
+    third = client.get(f"/classes/?limit=2&after={second['next_cursor']}").get_json()
+    assert [c["name"] for c in third["message"]] == ["C5"]
+    assert third["next_cursor"] is None
+
+
+def test_get_classes_cursor_breaks_ties_on_same_slot(client, admin_token):
+    for name in ("A", "B", "C"):
+        client.post("/classes/", json=sample_class_data(name=name),
+                    headers=auth_header(admin_token))
+    first = client.get("/classes/?limit=2").get_json()
+    second = client.get(f"/classes/?limit=2&after={first['next_cursor']}").get_json()
+    names = [c["name"] for c in first["message"] + second["message"]]
+    assert sorted(names) == ["A", "B", "C"]
+
+
+def test_get_classes_filters(client, admin_token):
+    client.post("/classes/", json=sample_class_data(name="Yoga", trainer="Jane", location="Gym",
+                                                    date=future_date_str(days=3)),
+                headers=auth_header(admin_token))
+    client.post("/classes/", json=sample_class_data(name="Spin", trainer="Ryan", location="Studio",
+                                                    date=future_date_str(days=10)),
+                headers=auth_header(admin_token))
+
+    by_trainer = client.get("/classes/?trainer=Jane").get_json()["message"]
+    assert [c["name"] for c in by_trainer] == ["Yoga"]
+
+    by_location = client.get("/classes/?location=Studio").get_json()["message"]
+    assert [c["name"] for c in by_location] == ["Spin"]
+
+    in_range = client.get(f"/classes/?date_from={future_date_str(days=5)}").get_json()["message"]
+    assert [c["name"] for c in in_range] == ["Spin"]
+
+    in_range = client.get(f"/classes/?date_to={future_date_str(days=5)}").get_json()["message"]
+    assert [c["name"] for c in in_range] == ["Yoga"]
+
+
+def test_get_classes_upcoming_only_by_default(client):
+    fc = FitnessClassResource()
+    fc.create_fitness_class("Old", "desc", past_date_str(), "10:00", "11:00",
+                            "Gym", "Jane", 10, "admin@test.com")
+    fc.create_fitness_class("New", "desc", future_date_str(), "10:00", "11:00",
+                            "Gym", "Jane", 10, "admin@test.com")
+
+    upcoming = client.get("/classes/").get_json()["message"]
+    assert [c["name"] for c in upcoming] == ["New"]
+
+    everything = client.get("/classes/?upcoming=false").get_json()["message"]
+    assert [c["name"] for c in everything] == ["Old", "New"]
+
+
+def test_get_classes_invalid_limit(client):
+    assert client.get("/classes/?limit=0").status_code == HTTPStatus.BAD_REQUEST
+    assert client.get("/classes/?limit=abc").status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_get_classes_invalid_date_filter(client):
+    resp = client.get("/classes/?date_from=tomorrow")
+    assert resp.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_get_classes_invalid_cursor(client):
+    resp = client.get("/classes/?after=not-a-cursor")
+    assert resp.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_get_classes_includes_iso_start_at(client, admin_token):
+    date = future_date_str()
+    client.post("/classes/", json=sample_class_data(date=date, start_time="10:00"),
+                headers=auth_header(admin_token))
+    classes = client.get("/classes/").get_json()["message"]
+    assert classes[0]["start_at"] == f"{date}T10:00:00"
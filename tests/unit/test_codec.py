@@ -0,0 +1,40 @@
+import json
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from app.codec import OrjsonCodec, StdlibJsonCodec, create_codec
+
+DOCUMENT = {
+    "_id": ObjectId("64b7f0c2a1b2c3d4e5f60718"),
+    "start_at": datetime(2026, 5, 1, 10, 0),
+    "blob": b"\x00\x01",
+    "name": "Yoga",
+}
+EXPECTED = {
+    "_id": "64b7f0c2a1b2c3d4e5f60718",
+    "start_at": "2026-05-01T10:00:00",
+    "blob": "AAE=",
+    "name": "Yoga",
+}
+
+
+@pytest.mark.parametrize("codec", [StdlibJsonCodec(), OrjsonCodec()])
+def test_codecs_encode_bson_types(codec):
+    assert json.loads(codec.dumps(DOCUMENT)) == EXPECTED
+
+
+def test_create_codec_auto_prefers_orjson():
+    assert create_codec("auto").name == "orjson"
+    assert create_codec("json").name == "json"
+
+
+def test_create_codec_unknown():
+    with pytest.raises(ValueError):
+        create_codec("yaml")
+
+
+def test_listing_encodes_object_ids(client, created_class_id):
+    classes = client.get("/classes/").get_json()["message"]
+    assert classes[0]["_id"] == created_class_id
@@ -1,11 +1,16 @@
 """Direct tests for DB resource classes to cover methods not hit by API tests."""
 import os
+from datetime import datetime
 
 import bcrypt
 import pytest
+from unittest.mock import patch
 
+from app.db import DB
+from app.db import bookings as bookings_module
 from app.db.users import UserResource
 from app.db.fitness_classes import FitnessClassResource
+from app.db.migrations import migrate_cli
 from app.config import get_required_environ
 
 
@@ -119,6 +124,7 @@ def test_book_class_string_participant_duplicate():
         {"_id": ObjectId(class_id)},
         {"$push": {"participants": "user@test.com"}},
     )
+    fc.migrate_embedded_participants()
     result = fc.book_class(class_id, {"email": "user@test.com"})
     assert result == "already_booked"
 
@@ -154,3 +160,142 @@ def test_get_required_environ_empty_value():
             get_required_environ("_TEST_EMPTY_VAR_")
     finally:
         os.environ.pop("_TEST_EMPTY_VAR_", None)
+
+
+def test_book_class_full_does_not_push_participant():
+    fc = FitnessClassResource()
+    class_id = fc.create_fitness_class(
+        "Yoga", "desc", "2026-04-01", "10:00", "11:00",
+        "Gym", "Jane", 1, "admin@test.com",
+    )
+    assert fc.book_class(class_id, {"email": "a@test.com"}) == "ok"
+    assert fc.book_class(class_id, {"email": "b@test.com"}) == "class_full"
+    assert fc.get_fitness_class_by_id(class_id)["available_slots"] == 0
+    assert [p["email"] for p in fc.get_participants(class_id)] == ["a@test.com"]
+
+
+def test_book_class_duplicate_reported_before_full():
+    fc = FitnessClassResource()
+    class_id = fc.create_fitness_class(
+        "Yoga", "desc", "2026-04-01", "10:00", "11:00",
+        "Gym", "Jane", 1, "admin@test.com",
+    )
+    fc.book_class(class_id, {"email": "a@test.com"})
+    assert fc.book_class(class_id, {"email": "a@test.com"}) == "already_booked"
+
+
+def test_book_class_missing_class():
+    fc = FitnessClassResource()
+    result = fc.book_class("000000000000000000000000", {"email": "a@test.com"})
+    assert result == "not_found"
+
+
+def test_create_fitness_class_sets_start_and_end_at():
+    fc = FitnessClassResource()
+    class_id = fc.create_fitness_class(
+        "Late Yoga", "desc", "2026-04-01", "23:30", "00:30",
+        "Gym", "Jane", 10, "admin@test.com",
+    )
+    fitness_class = fc.get_fitness_class_by_id(class_id)
+    assert fitness_class["start_at"] == datetime(2026, 4, 1, 23, 30)
+    assert fitness_class["end_at"] == datetime(2026, 4, 2, 0, 30)
+
+
+def test_book_class_deadline_passed():
+    fc = FitnessClassResource()
+    class_id = fc.create_fitness_class(
+        "Yoga", "desc", "2026-04-01", "10:00", "11:00",
+        "Gym", "Jane", 10, "admin@test.com",
+    )
+    result = fc.book_class(class_id, {"email": "a@test.com"}, starts_after=datetime(2026, 4, 1, 10, 1))
+    assert result == "deadline_passed"
+    assert fc.get_participants(class_id) == []
+
+
+def test_backfill_class_datetimes():
+    fc = FitnessClassResource()
+    fc.add_multiple_fitness_classes([
+        {"name": "Yoga", "date": "2026-04-01", "start_time": "10:00", "end_time": "11:00"},
+        {"name": "Broken", "date": "someday", "start_time": "10:00", "end_time": "11:00"},
+    ])
+    assert fc.backfill_class_datetimes() == 2
+    classes = {c["name"]: c for c in fc.get_fitness_classes()}
+    assert classes["Yoga"]["start_at"] == datetime(2026, 4, 1, 10, 0)
+    assert classes["Broken"]["start_at"] is None
+    assert fc.backfill_class_datetimes() == 0
+
+
+def test_migrate_class_datetimes_cli(app):
+    fc = FitnessClassResource()
+    fc.add_multiple_fitness_classes([
+        {"name": "Yoga", "date": "2026-04-01", "start_time": "10:00", "end_time": "11:00"},
+    ])
+    result = app.test_cli_runner().invoke(migrate_cli, ["class-datetimes"])
+    assert "1 classes" in result.output
+
+
+def test_migrate_embedded_participants():
+    fc = FitnessClassResource()
+    fc.add_multiple_fitness_classes([
+        {"name": "Yoga", "capacity": 10, "available_slots": 8, "participants": [
+            {"name": "A", "email": "a@test.com", "phone": "1"}, "b@test.com",
+        ]},
+    ])
+    class_id = str(fc.collection.find_one({"name": "Yoga"})["_id"])
+    assert fc.migrate_embedded_participants() == 1
+    assert "participants" not in fc.get_fitness_class_by_id(class_id)
+    emails = [p["email"] for p in fc.get_participants(class_id)]
+    assert emails == ["a@test.com", "b@test.com"]
+    assert fc.migrate_embedded_participants() == 0
+
+
+def test_get_participants_missing_class():
+    fc = FitnessClassResource()
+    assert fc.get_participants("000000000000000000000000") is None
+    assert fc.has_participants("bad-id") is False
+
+
+def test_get_notification_preferences_bulk():
+    ur = UserResource()
+    ur.create_user("Alice", "alice@test.com", "+1", "member", "pass123")
+    ur.create_user("Bob", "bob@test.com", "+2", "member", "pass123",
+                   notification_channels=["telegram"], telegram_chat_id="42")
+    prefs = ur.get_notification_preferences(["alice@test.com", "bob@test.com", "ghost@test.com"])
+    assert prefs == {
+        "alice@test.com": {"notification_channels": ["email"], "telegram_chat_id": ""},
+        "bob@test.com": {"notification_channels": ["telegram"], "telegram_chat_id": "42"},
+    }
+    assert ur.get_notification_preferences([]) == {}
+
+
+def test_book_class_recreates_missing_booking_index():
+    fc = FitnessClassResource()
+    class_id = fc.create_fitness_class(
+        "Yoga", "desc", "2026-04-01", "10:00", "11:00",
+        "Gym", "Jane", 10, "admin@test.com",
+    )
+    DB.get_collection("bookings").drop_index("class_id_email_unique")
+    bookings_module._indexes_ensured["pid"] = None
+    assert fc.book_class(class_id, {"email": "x@test.com"}) == "ok"
+    assert fc.book_class(class_id, {"email": "x@test.com"}) == "already_booked"
+    assert fc.get_fitness_class_by_id(class_id)["available_slots"] == 9
+    assert "class_id_email_unique" in DB.get_collection("bookings").index_information()
+
+
+def test_book_class_rejects_duplicate_without_booking_index():
+    fc = FitnessClassResource()
+    class_id = fc.create_fitness_class(
+        "Yoga", "desc", "2026-04-01", "10:00", "11:00",
+        "Gym", "Jane", 10, "admin@test.com",
+    )
+    bookings = DB.get_collection("bookings")
+    bookings.drop_index("class_id_email_unique")
+    bookings_module._indexes_ensured["pid"] = None
+    try:
+        with patch.object(bookings, "create_indexes", side_effect=Exception("duplicate key")):
+            assert fc.book_class(class_id, {"email": "x@test.com"}) == "ok"
+            assert fc.book_class(class_id, {"email": "x@test.com"}) == "already_booked"
+        assert fc.get_fitness_class_by_id(class_id)["available_slots"] == 9
+    finally:
+        bookings_module._indexes_ensured["pid"] = None
+        bookings_module._ensure_booking_indexes(bookings)
@@ -0,0 +1,170 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+from app.services.dispatcher import NotificationDispatcher
+from app.services.notifier import BaseNotifier, NotifierThrottled
+from app.services.rate_limiter import TokenBucket
+
+FITNESS_CLASS = {"name": "Yoga", "date": "2026-05-01", "start_time": "10:00", "location": "Gym"}
+
+
+class _TrackingNotifier(BaseNotifier):
+   """Records the peak number of concurrent sends."""
+
+   def __init__(self, delay=0.02, fail_for=()):
+      self.delay = delay
+      self.fail_for = set(fail_for)
+      self.active = 0
+      self.peak = 0
+      self.sent = []
+      self._lock = threading.Lock()
+
+   def send_reminder(self, recipient, fitness_class):
+      with self._lock:
+         self.active += 1
+         self.peak = max(self.peak, self.active)
+      try:
+         time.sleep(self.delay)
+         if recipient["email"] in self.fail_for:
+            raise RuntimeError("send failed")
+         self.sent.append(recipient["email"])
+      finally:
+         with self._lock:
+            self.active -= 1
+
+
+def _recipients(n, channels=("email",)):
+   return [({"email": f"u{i}@test.com"}, list(channels)) for i in range(n)]
+
+
+def test_dispatch_counts_participants_reached():
+   email, telegram = _TrackingNotifier(), _TrackingNotifier(fail_for={"u0@test.com", "u1@test.com"})
+   dispatcher = NotificationDispatcher({"email": email, "telegram": telegram})
+   recipients = [({"email": "u0@test.com"}, ["telegram"]),
+                 ({"email": "u1@test.com"}, ["email", "telegram"]),
+                 ({"email": "u2@test.com"}, ["email", "sms"])]
+   report = dispatcher.dispatch(recipients, FITNESS_CLASS)
+   assert report["participants_reached"] == 2
+   assert report["channels"]["email"] == {"sent": 2, "failed": 0, "timed_out": 0}
+   assert report["channels"]["telegram"] == {"sent": 0, "failed": 2, "timed_out": 0}
+   assert report["failed"] == [0]
+   assert report["deadline_exceeded"] is False
+
+
+def test_dispatch_respects_per_channel_limits():
+   email, telegram = _TrackingNotifier(), _TrackingNotifier()
+   dispatcher = NotificationDispatcher({"email": email, "telegram": telegram},
+                                       channel_limits={"email": 3, "telegram": 1})
+   report = dispatcher.dispatch(_recipients(12, ("email", "telegram")), FITNESS_CLASS)
+   assert report["participants_reached"] == 12
+   assert 1 < email.peak <= 3
+   assert telegram.peak == 1
+
+
+def test_dispatch_stops_waiting_at_deadline():
+   slow = _TrackingNotifier(delay=0.3)
+   dispatcher = NotificationDispatcher({"email": slow}, channel_limits={"email": 1},
+                                       deadline_seconds=0.1)
+   started = time.monotonic()
+   report = dispatcher.dispatch(_recipients(5), FITNESS_CLASS)
+   assert time.monotonic() - started < 0.3
+   assert report["deadline_exceeded"] is True
+   assert report["channels"]["email"]["timed_out"] == 5
+   assert report["participants_reached"] == 0
+   assert report["failed"] == []
+
+
+def test_dispatch_reports_progress():
+   on_result = MagicMock()
+   dispatcher = NotificationDispatcher({"email": _TrackingNotifier(delay=0, fail_for={"u1@test.com"})})
+   dispatcher.dispatch(_recipients(3), FITNESS_CLASS, on_result=on_result)
+   assert sorted(call.args for call in on_result.call_args_list) == [
+      ("email", False), ("email", True), ("email", True),
+   ]
+
+
+class _BulkNotifier(BaseNotifier):
+   batch_size = 3
+
+   def __init__(self):
+      self.batches = []
+
+   def send_reminder(self, recipient, fitness_class):
+      raise AssertionError("bulk notifier should be sent batches")
+
+   def send_reminders(self, recipients, fitness_class):
+      self.batches.append([r["email"] for r in recipients])
+      return [r["email"] != "u4@test.com" for r in recipients]
+
+
+def test_dispatch_batches_for_bulk_notifiers():
+   bulk = _BulkNotifier()
+   dispatcher = NotificationDispatcher({"email": bulk})
+   report = dispatcher.dispatch(_recipients(7), FITNESS_CLASS)
+   assert sorted(len(batch) for batch in bulk.batches) == [1, 3, 3]
+   assert report["participants_reached"] == 6
+   assert report["channels"]["email"] == {"sent": 6, "failed": 1, "timed_out": 0}
+   assert 4 not in report["reached"]
+   assert report["failed"] == [4]
+
+
+class _ThrottlingNotifier(BaseNotifier):
+   """Throttles the first `throttles` batches after sending their first recipient."""
+
+   batch_size = 10
+
+   def __init__(self, throttles=1):
+      self.throttles = throttles
+      self.sent = []
+
+   def send_reminder(self, recipient, fitness_class):
+      self.sent.append(recipient["email"])
+
+   def send_reminders(self, recipients, fitness_class):
+      if self.throttles:
+         self.throttles -= 1
+         self.sent.append(recipients[0]["email"])
+         raise NotifierThrottled("slow down", retry_after=0.05,
+                                 results=[True] + [None] * (len(recipients) - 1))
+      return super().send_reminders(recipients, fitness_class)
+
+
+def test_dispatch_queues_throttled_recipients_again():
+   notifier = _ThrottlingNotifier(throttles=2)
+   limiter = TokenBucket(rate=1000)
+   dispatcher = NotificationDispatcher({"email": notifier}, rate_limiters={"email": limiter})
+   report = dispatcher.dispatch(_recipients(5), FITNESS_CLASS)
+   assert report["channels"]["email"] == {"sent": 5, "failed": 0, "timed_out": 0}
+   assert sorted(notifier.sent) == [f"u{i}@test.com" for i in range(5)]
+   assert limiter.throttled == 2
+   assert limiter.rate < limiter.max_rate
+
+
+def test_dispatch_sends_at_limiter_rate():
+   dispatcher = NotificationDispatcher({"email": _TrackingNotifier(delay=0)}, channel_limits={"email": 4},
+                                       rate_limiters={"email": TokenBucket(rate=100, burst=1)})
+   started = time.monotonic()
+   report = dispatcher.dispatch(_recipients(11), FITNESS_CLASS)
+   assert report["participants_reached"] == 11
+   assert time.monotonic() - started >= 0.09
+
+
+def test_dispatch_extends_deadline_to_drain_the_rate_limited_queue():
+   dispatcher = NotificationDispatcher({"email": _TrackingNotifier(delay=0)}, deadline_seconds=0.1,
+                                       rate_limiters={"email": TokenBucket(rate=20, burst=1, min_rate=20)})
+   report = dispatcher.dispatch(_recipients(10), FITNESS_CLASS)
+   assert report["channels"]["email"] == {"sent": 10, "failed": 0, "timed_out": 0}
+   assert report["deadline_exceeded"] is False
+
+
+def test_dispatch_times_out_sends_still_throttled_at_deadline():
+   notifier = MagicMock(batch_size=10)
+   notifier.send_reminders.side_effect = NotifierThrottled("slow down", retry_after=0.05)
+   dispatcher = NotificationDispatcher({"email": notifier}, deadline_seconds=0.2,
+                                       rate_limiters={"email": TokenBucket(rate=1000)})
+   started = time.monotonic()
+   report = dispatcher.dispatch(_recipients(3), FITNESS_CLASS)
+   assert time.monotonic() - started < 0.5
+   assert report["channels"]["email"] == {"sent": 0, "failed": 0, "timed_out": 3}
+   assert notifier.send_reminders.call_count > 1
@@ -1,6 +1,11 @@
+import json
 from unittest.mock import MagicMock
 
+from botocore.exceptions import ClientError
+import pytest
+
 from app.services.email_service import EmailService
+from app.services.notifier import EmailNotifier, NotifierThrottled
 
 def test_send_reminder_calls_ses():
     mock_client = MagicMock()
@@ -20,3 +25,90 @@ def test_send_reminder_subject_contains_date():
     service.send_reminder("user@test.com", "Pilates", "2026-05-10", "09:00", "Studio")
     call_kwargs = mock_client.send_email.call_args[1]
     assert "2026-05-10" in call_kwargs["Message"]["Subject"]["Data"]
+
+
+def _bulk_client(fail_emails=()):
+    client = MagicMock()
+
+    def send_bulk_templated_email(**kwargs):
+        return {"Status": [
+            {"Status": "MessageRejected", "Error": "Email address is not verified."}
+            if d["Destination"]["ToAddresses"][0] in fail_emails else {"Status": "Success", "MessageId": "m"}
+            for d in kwargs["Destinations"]
+        ]}
+    client.send_bulk_templated_email.side_effect = send_bulk_templated_email
+    return client
+
+
+def test_send_bulk_reminders_chunks_destinations():
+    client = _bulk_client(fail_emails={"u7@test.com"})
+    service = EmailService(ses_client=client, sender="gym@example.com", template_name="Reminder")
+    recipients = [{"email": f"u{i}@test.com", "name": f"U{i}"} for i in range(120)]
+    statuses = service.send_bulk_reminders(recipients, "Yoga", "2026-04-01", "10:00", "Gym")
+
+    calls = client.send_bulk_templated_email.call_args_list
+    assert [len(c.kwargs["Destinations"]) for c in calls] == [50, 50, 20]
+    first = calls[0].kwargs
+    assert first["Template"] == "Reminder"
+    assert first["Source"] == "gym@example.com"
+    assert json.loads(first["DefaultTemplateData"])["class_name"] == "Yoga"
+    assert json.loads(first["Destinations"][3]["ReplacementTemplateData"]) == {"name": "U3"}
+
+    assert len(statuses) == 120
+    assert statuses[7] == {"email": "u7@test.com", "status": "MessageRejected", "error": "Email address is not verified."}
+    assert sum(s["status"] == "Success" for s in statuses) == 119
+
+
+def test_send_bulk_reminders_marks_whole_chunk_failed_on_error():
+    client = MagicMock()
+    client.send_bulk_templated_email.side_effect = Exception("Throttling")
+    service = EmailService(ses_client=client, sender="gym@example.com")
+    statuses = service.send_bulk_reminders([{"email": "a@test.com"}, {"email": "b@test.com"}],
+                                           "Yoga", "2026-04-01", "10:00", "Gym")
+    assert [s["status"] for s in statuses] == ["Failed", "Failed"]
+    assert statuses[0]["error"] == "Throttling"
+
+
+def test_send_bulk_reminders_stops_after_throttling():
+    client = _bulk_client()
+    client.send_bulk_templated_email.side_effect = ClientError(
+        {"Error": {"Code": "Throttling", "Message": "Maximum sending rate exceeded."}}, "SendBulkTemplatedEmail",
+    )
+    service = EmailService(ses_client=client, sender="gym@example.com")
+    recipients = [{"email": f"u{i}@test.com"} for i in range(60)]
+    statuses = service.send_bulk_reminders(recipients, "Yoga", "2026-04-01", "10:00", "Gym")
+    assert client.send_bulk_templated_email.call_count == 1
+    assert {s["status"] for s in statuses} == {"Throttling"}
+    assert len(statuses) == 60
+
+
+def test_reminder_template_created_once_and_updated_if_present():
+    client = _bulk_client()
+    client.create_template.side_effect = ClientError({"Error": {"Code": "AlreadyExists"}}, "CreateTemplate")
+    service = EmailService(ses_client=client, sender="gym@example.com")
+    service.send_bulk_reminders([{"email": "a@test.com"}], "Yoga", "2026-04-01", "10:00", "Gym")
+    service.send_bulk_reminders([{"email": "b@test.com"}], "Yoga", "2026-04-01", "10:00", "Gym")
+    client.create_template.assert_called_once()
+    client.update_template.assert_called_once()
+    assert "{{class_name}}" in client.update_template.call_args.kwargs["Template"]["SubjectPart"]
+
+
+def test_email_notifier_bulk_returns_per_recipient_status():
+    client = _bulk_client(fail_emails={"b@test.com"})
+    notifier = EmailNotifier(EmailService(ses_client=client, sender="gym@example.com"))
+    results = notifier.send_reminders([{"email": "a@test.com"}, {"email": "b@test.com"}], {"name": "Yoga"})
+    assert results == [True, False]
+
+
+def test_email_notifier_raises_throttled_with_unsent_recipients():
+    service = MagicMock()
+    service.send_bulk_reminders.return_value = [
+        {"email": "a@test.com", "status": "Success", "error": ""},
+        {"email": "b@test.com", "status": "AccountThrottled", "error": ""},
+        {"email": "c@test.com", "status": "MessageRejected", "error": "Not verified"},
+    ]
+    notifier = EmailNotifier(service)
+    with pytest.raises(NotifierThrottled) as raised:
+        notifier.send_reminders([{"email": "a@test.com"}, {"email": "b@test.com"}, {"email": "c@test.com"}],
+                                {"name": "Yoga"})
+    assert raised.value.results == [True, None, False]
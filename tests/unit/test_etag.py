@@ -0,0 +1,113 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+from unittest.mock import patch
+
+from bson import ObjectId
+
+from app.db.counters import CounterResource
+from app.db.fitness_classes import FITNESS_CLASS, FitnessClassResource, catalogue_counter
+from tests.utils import auth_header, sample_class_data
+
+
+def test_list_sets_etag_and_cache_control(client):
+    resp = client.get("/classes/")
+    assert resp.headers["ETag"]
+    assert resp.headers["Cache-Control"] == "public, no-cache"
+
+
+def test_list_returns_304_when_unchanged(client, admin_token):
+    client.post("/classes/", json=sample_class_data(), headers=auth_header(admin_token))
+    etag = client.get("/classes/").headers["ETag"]
+    resp = client.get("/classes/", headers={"If-None-Match": etag})
+    assert resp.status_code == HTTPStatus.NOT_MODIFIED
+    assert resp.data == b""
+
+
+def test_list_etag_changes_after_write(client, admin_token):
+    etag = client.get("/classes/").headers["ETag"]
+    client.post("/classes/", json=sample_class_data(), headers=auth_header(admin_token))
+    resp = client.get("/classes/", headers={"If-None-Match": etag})
+    assert resp.status_code == HTTPStatus.OK
+    assert resp.headers["ETag"] != etag
+    assert len(resp.get_json()["message"]) == 1
+
+
+def test_list_etag_changes_after_booking(client, member_token, created_class_id):
+    etag = client.get("/classes/").headers["ETag"]
+    client.post(f"/classes/{created_class_id}/book", headers=auth_header(member_token))
+    resp = client.get("/classes/", headers={"If-None-Match": etag})
+    assert resp.status_code == HTTPStatus.OK
+
+
+def test_class_detail(client, created_class_id):
+    resp = client.get(f"/classes/{created_class_id}")
+    assert resp.status_code == HTTPStatus.OK
+    fitness_class = resp.get_json()["message"]
+    assert fitness_class["_id"] == created_class_id
+    assert "participants" not in fitness_class
+
+
+def test_class_detail_not_found(client):
+    resp = client.get("/classes/000000000000000000000000")
+    assert resp.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_class_detail_returns_304_when_unchanged(client, created_class_id):
+    etag = client.get(f"/classes/{created_class_id}").headers["ETag"]
+    resp = client.get(f"/classes/{created_class_id}", headers={"If-None-Match": etag})
+    assert resp.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def _write_from_another_worker(class_id):
+    """Change a class the way another worker would: bump the shared counter, leave this cache alone."""
+    fc = FitnessClassResource()
+    fc.collection.update_one({"_id": ObjectId(class_id)}, {"$inc": {"available_slots": -1}})
+    fc.counters.bump(FITNESS_CLASS)
+
+
+def test_list_etag_and_body_agree_after_other_worker_write(client, created_class_id, monkeypatch):
+    monkeypatch.setattr(catalogue_counter, "max_age", 0)
+    assert client.get("/classes/").get_json()["message"][0]["available_slots"] == 10
+    _write_from_another_worker(created_class_id)
+    resp = client.get("/classes/")
+    assert resp.headers["ETag"].startswith(f'"{FitnessClassResource().catalogue_version()}-')
+    assert resp.get_json()["message"][0]["available_slots"] == 9
+
+
+def test_detail_etag_and_body_agree_after_other_worker_write(client, created_class_id, monkeypatch):
+    monkeypatch.setattr(catalogue_counter, "max_age", 0)
+    etag = client.get(f"/classes/{created_class_id}").headers["ETag"]
+    _write_from_another_worker(created_class_id)
+    resp = client.get(f"/classes/{created_class_id}", headers={"If-None-Match": etag})
+    assert resp.status_code == HTTPStatus.OK
+    assert resp.headers["ETag"] == f'"{FitnessClassResource().catalogue_version()}"'
+    assert resp.get_json()["message"]["available_slots"] == 9
+
+
+def test_catalogue_version_read_at_most_once_per_max_age(client, created_class_id, monkeypatch):
+    monkeypatch.setattr(catalogue_counter, "max_age", 60)
+    fc = FitnessClassResource()
+    version = fc.catalogue_version()
+    with patch.object(CounterResource, "get", side_effect=AssertionError("counter read")):
+        for _ in range(3):
+            assert client.get(f"/classes/{created_class_id}").headers["ETag"] == f'"{version}"'
+    # Another worker's write shows up once the copy is older than max_age
+    _write_from_another_worker(created_class_id)
+    assert fc.catalogue_version() == version
+    monkeypatch.setattr(catalogue_counter, "max_age", 0)
+    assert fc.catalogue_version() == version + 1
+
+
+def test_upcoming_list_body_moves_with_the_minute_in_the_etag(client, created_class_id):
+    start_at = FitnessClassResource().get_fitness_class_by_id(created_class_id)["start_at"]
+    before, after = start_at - timedelta(minutes=1), start_at + timedelta(minutes=1)
+    with patch("app.db.fitness_classes.current_minute", return_value=before), \
+         patch("app.apis.classes.current_minute", return_value=before):
+        assert len(client.get("/classes/").get_json()["message"]) == 1
+    # Same catalogue version, next minute: the class has started and drops out
+    with patch("app.db.fitness_classes.current_minute", return_value=after), \
+         patch("app.apis.classes.current_minute", return_value=after):
+        resp = client.get("/classes/")
+    assert resp.headers["ETag"].endswith(after.strftime('-%Y%m%d%H%M"'))
+    assert resp.get_json()["message"] == []
@@ -0,0 +1,33 @@
+from http import HTTPStatus
+from unittest.mock import patch
+
+from app.db import DB
+
+
+def test_liveness(client):
+    resp = client.get("/health/live")
+    assert resp.status_code == HTTPStatus.OK
+
+
+def test_readiness_ok(client):
+    resp = client.get("/health/ready")
+    assert resp.status_code == HTTPStatus.OK
+    assert resp.get_json()["message"] == "ready"
+
+
+def test_readiness_database_down(client):
+    with patch.object(DB, "ping", side_effect=Exception("no primary")):
+        resp = client.get("/health/ready")
+    assert resp.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert "no primary" in resp.get_json()["message"]
+
+
+def test_client_recreated_after_fork():
+    db = DB._get()
+    client, pid = DB._client, DB._pid
+    try:
+        with patch("app.db.os.getpid", return_value=pid + 1):
+            assert DB._get() is not db
+            assert DB._pid == pid + 1
+    finally:
+        DB._client, DB._db, DB._pid = client, db, pid
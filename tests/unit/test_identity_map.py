@@ -0,0 +1,56 @@
+from unittest.mock import MagicMock
+
+from app.db.fitness_classes import FitnessClassResource
+from app.db.identity_map import current_identity_map
+from app.db.users import UserResource
+
+
+def _create_class():
+    return FitnessClassResource().create_fitness_class(
+        "Yoga", "desc", "2026-12-01", "10:00", "11:00",
+        "Gym", "Jane", 10, "admin@test.com",
+    )
+
+
+def test_no_identity_map_outside_request():
+    assert current_identity_map() is None
+
+
+def test_class_loaded_once_per_request(app):
+    class_id = _create_class()
+    with app.test_request_context():
+        fc = FitnessClassResource()
+        fc.collection = MagicMock(wraps=fc.collection)
+        first = fc.get_fitness_class_by_id(class_id)
+        assert FitnessClassResource().get_fitness_class_by_id(class_id) is first
+        fc.get_participants(class_id)
+        assert fc.collection.find_one.call_count == 1
+
+
+def test_booking_invalidates_class(app):
+    class_id = _create_class()
+    with app.test_request_context():
+        fc = FitnessClassResource()
+        assert fc.get_fitness_class_by_id(class_id)["available_slots"] == 10
+        fc.book_class(class_id, {"email": "a@test.com"})
+        assert fc.get_fitness_class_by_id(class_id)["available_slots"] == 9
+
+
+def test_user_loaded_once_per_request_by_email_or_id(app):
+    ur = UserResource()
+    user_id = str(ur.create_user("Alice", "alice@test.com", "+1", "member", "pass123"))
+    with app.test_request_context():
+        ur = UserResource()
+        ur.collection = MagicMock(wraps=ur.collection)
+        user = ur.get_user_by_email("alice@test.com")
+        assert ur.get_user_by_id(user_id) is user
+        assert ur.collection.find_one.call_count == 1
+
+
+def test_preference_update_invalidates_user(app):
+    UserResource().create_user("Alice", "alice@test.com", "+1", "member", "pass123")
+    with app.test_request_context():
+        ur = UserResource()
+        assert ur.get_user_by_email("alice@test.com")["notification_channels"] == ["email"]
+        ur.update_preferences("alice@test.com", ["telegram"], "42")
+        assert ur.get_user_by_email("alice@test.com")["notification_channels"] == ["telegram"]
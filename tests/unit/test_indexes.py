@@ -0,0 +1,88 @@
+import pytest
+from pymongo import ASCENDING, IndexModel
+
+from app.db import DB
+from app.db.fitness_classes import LISTING_SORT
+from app.db.indexes import (
+    INDEX_REGISTRY, ensure_indexes, verify_indexes, indexes_cli, check_indexes, missing_indexes,
+)
+from app.db.users import UserResource
+
+
+def test_ensure_indexes_is_idempotent():
+    ensure_indexes()
+    ensure_indexes()
+    report = verify_indexes()
+    for entry in report.values():
+        assert entry["missing"] == []
+
+
+def test_verify_reports_missing_index():
+    registry = {"index_probe": [IndexModel([("field", ASCENDING)], name="field_idx")]}
+    DB.get_collection("index_probe").drop()
+    report = verify_indexes(registry)
+    assert report["index_probe"]["missing"] == ["field_idx"]
+
+
+def test_verify_reports_extra_index():
+    collection = DB.get_collection("index_probe")
+    collection.drop()
+    collection.create_index([("stray", ASCENDING)], name="stray_idx")
+    report = verify_indexes({"index_probe": []})
+    assert report["index_probe"]["extra"] == ["stray_idx"]
+
+
+def test_registry_covers_user_email_uniqueness():
+    names = [model.document["name"] for model in INDEX_REGISTRY["users"]]
+    assert "email_unique" in names
+
+
+def test_filtered_listing_indexes_cover_listing_sort():
+    keys = {model.document["name"]: list(model.document["key"].items()) for model in INDEX_REGISTRY["fitness_class"]}
+    for name in ("trainer_start_at_id", "location_start_at_id"):
+        assert keys[name][1:] == LISTING_SORT
+
+
+def test_unique_email_index_rejects_duplicate_registration(monkeypatch):
+    ensure_indexes()
+    ur = UserResource()
+    ur.create_user("Alice", "alice@test.com", "+1", "member", "pass123")
+    # Simulate a concurrent registration that slipped past the existence check
+    monkeypatch.setattr(ur, "get_user_by_email", lambda email: None)
+    with pytest.raises(ValueError, match="already exists"):
+        ur.register_user("Alice", "alice@test.com", "+1", "pass123")
+
+
+def test_indexes_cli_verify(app):
+    runner = app.test_cli_runner()
+    assert runner.invoke(indexes_cli, ["ensure"]).exit_code == 0
+    result = runner.invoke(indexes_cli, ["verify"])
+    assert "missing=[]" in result.output
+
+
+def test_ensure_indexes_continues_past_failing_collection():
+    registry = {
+        "index_probe": [IndexModel([("email", ASCENDING)], name="email_unique", unique=True)],
+        "index_probe_other": [IndexModel([("field", ASCENDING)], name="field_idx")],
+    }
+    for name in registry:
+        DB.get_collection(name).drop()
+    DB.get_collection("index_probe").insert_many([{"email": "a@test.com"}, {"email": "a@test.com"}])
+    created, failed = ensure_indexes(registry)
+    assert list(failed) == ["index_probe"]
+    assert created == {"index_probe_other": ["field_idx"]}
+    assert verify_indexes(registry)["index_probe_other"]["missing"] == []
+
+
+def test_readiness_reports_missing_index(client):
+    bookings = DB.get_collection("bookings")
+    bookings.drop_index("class_id_email_unique")
+    check_indexes()
+    try:
+        resp = client.get("/health/ready")
+        assert resp.status_code == 503
+        assert "bookings.class_id_email_unique" in resp.get_json()["message"]
+    finally:
+        ensure_indexes()
+    assert missing_indexes() == {}
+    assert client.get("/health/ready").status_code == 200
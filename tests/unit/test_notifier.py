@@ -1,5 +1,14 @@
 from unittest.mock import MagicMock, patch
-from app.services.notifier import EmailNotifier, TelegramNotifier
+
+import pytest
+
+from app.services.notifier import EmailNotifier, NotifierThrottled, TelegramNotifier, TelegramRateLimited
+
+
+def _telegram_notifier(*args, **kwargs):
+   session = MagicMock()
+   session.post.return_value = MagicMock(status_code=200)
+   return TelegramNotifier(*args, session=session, **kwargs), session.post
 
 def test_email_notifier_calls_send_reminder():
    mock_svc = MagicMock()
@@ -24,46 +33,104 @@ def test_email_notifier_missing_fields_defaults_to_empty():
    )
 
 def test_telegram_notifier_sends_message():
-   with patch("app.services.notifier.requests.post") as mock_post:
-       notifier = TelegramNotifier("test-token")
-       recipient = {"email": "a@test.com", "telegram_chat_id": "123456"}
-       fitness_class = {"name": "Yoga", "date": "2026-05-01", "start_time": "10:00", "location": "Gym"}
-       notifier.send_reminder(recipient, fitness_class)
-       mock_post.assert_called_once()
-       call_kwargs = mock_post.call_args[1]
-       assert call_kwargs["json"]["chat_id"] == "123456"
-       assert "Yoga" in call_kwargs["json"]["text"]
-       assert "2026-05-01" in call_kwargs["json"]["text"]
+   notifier, mock_post = _telegram_notifier("test-token")
+   recipient = {"email": "a@test.com", "telegram_chat_id": "123456"}
+   fitness_class = {"name": "Yoga", "date": "2026-05-01", "start_time": "10:00", "location": "Gym"}
+   notifier.send_reminder(recipient, fitness_class)
+   mock_post.assert_called_once()
+   call_kwargs = mock_post.call_args[1]
+   assert call_kwargs["json"]["chat_id"] == "123456"
+   assert "Yoga" in call_kwargs["json"]["text"]
+   assert "2026-05-01" in call_kwargs["json"]["text"]
 
 def test_telegram_notifier_skips_when_no_chat_id():
-   with patch("app.services.notifier.requests.post") as mock_post:
-       notifier = TelegramNotifier("test-token")
-       recipient = {"email": "a@test.com", "telegram_chat_id": ""}
-       fitness_class = {"name": "Yoga", "date": "2026-05-01", "start_time": "10:00", "location": "Gym"}
-       notifier.send_reminder(recipient, fitness_class)
-       mock_post.assert_not_called()
+   notifier, mock_post = _telegram_notifier("test-token")
+   recipient = {"email": "a@test.com", "telegram_chat_id": ""}
+   fitness_class = {"name": "Yoga", "date": "2026-05-01", "start_time": "10:00", "location": "Gym"}
+   notifier.send_reminder(recipient, fitness_class)
+   mock_post.assert_not_called()
 
 def test_telegram_notifier_skips_when_chat_id_missing():
-   with patch("app.services.notifier.requests.post") as mock_post:
-       notifier = TelegramNotifier("test-token")
-       notifier.send_reminder({}, {"name": "Yoga"})
-       mock_post.assert_not_called()
+   notifier, mock_post = _telegram_notifier("test-token")
+   notifier.send_reminder({}, {"name": "Yoga"})
+   mock_post.assert_not_called()
 
 def test_telegram_notifier_uses_custom_base_url():
-   with patch("app.services.notifier.requests.post") as mock_post:
-       notifier = TelegramNotifier("mytoken", base_url="http://mock-telegram")
-       recipient = {"telegram_chat_id": "999"}
-       fitness_class = {"name": "Yoga", "date": "2026-05-01", "start_time": "10:00", "location": "Gym"}
-       notifier.send_reminder(recipient, fitness_class)
-       call_url = mock_post.call_args[0][0]
-       assert call_url.startswith("http://mock-telegram")
-       assert "mytoken" in call_url
+   notifier, mock_post = _telegram_notifier("mytoken", base_url="http://mock-telegram")
+   recipient = {"telegram_chat_id": "999"}
+   fitness_class = {"name": "Yoga", "date": "2026-05-01", "start_time": "10:00", "location": "Gym"}
+   notifier.send_reminder(recipient, fitness_class)
+   call_url = mock_post.call_args[0][0]
+   assert call_url.startswith("http://mock-telegram")
+   assert "mytoken" in call_url
 
 def test_telegram_notifier_message_contains_location():
-   with patch("app.services.notifier.requests.post") as mock_post:
-       notifier = TelegramNotifier("test-token")
-       recipient = {"telegram_chat_id": "111"}
-       fitness_class = {"name": "Pilates", "date": "2026-06-01", "start_time": "09:00", "location": "Studio A"}
-       notifier.send_reminder(recipient, fitness_class)
-       text = mock_post.call_args[1]["json"]["text"]
-       assert "Studio A" in text
+   notifier, mock_post = _telegram_notifier("test-token")
+   recipient = {"telegram_chat_id": "111"}
+   fitness_class = {"name": "Pilates", "date": "2026-06-01", "start_time": "09:00", "location": "Studio A"}
+   notifier.send_reminder(recipient, fitness_class)
+   text = mock_post.call_args[1]["json"]["text"]
+   assert "Studio A" in text
+
+def _response(status_code, body=None):
+   response = MagicMock(status_code=status_code, headers={})
+   response.json.return_value = body or {}
+   return response
+
+def test_telegram_notifier_retries_429_after_retry_after():
+   notifier, mock_post = _telegram_notifier("t", max_retries=2)
+   mock_post.side_effect = [
+      _response(429, {"ok": False, "parameters": {"retry_after": 3}}),
+      _response(200),
+   ]
+   with patch("app.services.notifier.time.sleep") as sleep:
+      notifier.send_reminder({"telegram_chat_id": "1"}, {"name": "Yoga"})
+   sleep.assert_called_once_with(3.0)
+   assert mock_post.call_count == 2
+
+def test_telegram_notifier_gives_up_after_max_retries():
+   notifier, mock_post = _telegram_notifier("t", max_retries=1)
+   mock_post.return_value = _response(429, {"parameters": {"retry_after": 1}})
+   with patch("app.services.notifier.time.sleep"), pytest.raises(TelegramRateLimited) as raised:
+      notifier.send_reminder({"telegram_chat_id": "1"}, {"name": "Yoga"})
+   assert raised.value.retry_after == 1.0
+   assert mock_post.call_count == 2
+
+def test_telegram_notifier_does_not_wait_past_max_retry_after():
+   notifier, mock_post = _telegram_notifier("t", max_retry_after=5)
+   mock_post.return_value = _response(429, {"parameters": {"retry_after": 60}})
+   with patch("app.services.notifier.time.sleep") as sleep, pytest.raises(TelegramRateLimited):
+      notifier.send_reminder({"telegram_chat_id": "1"}, {"name": "Yoga"})
+   sleep.assert_not_called()
+
+def test_telegram_notifier_uses_configured_timeouts():
+   notifier, mock_post = _telegram_notifier("t", connect_timeout=2, read_timeout=7)
+   notifier.send_reminder({"telegram_chat_id": "1"}, {"name": "Yoga"})
+   assert mock_post.call_args[1]["timeout"] == (2, 7)
+
+def test_telegram_batch_send_reports_each_recipient():
+   notifier, mock_post = _telegram_notifier("t")
+   failing = _response(400)
+   failing.raise_for_status.side_effect = Exception("Bad Request: chat not found")
+   mock_post.side_effect = [_response(200), failing]
+   results = notifier.send_reminders(
+      [{"telegram_chat_id": "1"}, {"telegram_chat_id": "2"}, {"telegram_chat_id": ""}], {"name": "Yoga"},
+   )
+   assert results == [True, False, True]
+   assert mock_post.call_count == 2
+
+def test_telegram_batch_send_hands_back_unsent_recipients_when_throttled():
+   notifier, mock_post = _telegram_notifier("t", max_retries=0)
+   mock_post.side_effect = [_response(200), _response(429, {"parameters": {"retry_after": 2}})]
+   with pytest.raises(NotifierThrottled) as raised:
+      notifier.send_reminders(
+         [{"telegram_chat_id": "1"}, {"telegram_chat_id": "2"}, {"telegram_chat_id": "3"}], {"name": "Yoga"},
+      )
+   assert raised.value.results == [True, None, None]
+   assert raised.value.retry_after == 2.0
+   assert mock_post.call_count == 2
+
+def test_telegram_notifier_pools_connections():
+   notifier = TelegramNotifier("t", pool_size=16)
+   adapter = notifier._session.get_adapter("https://api.telegram.org")
+   assert adapter._pool_maxsize == 16
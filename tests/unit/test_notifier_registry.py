@@ -0,0 +1,62 @@
+from unittest.mock import MagicMock, patch
+
+from app.config import Config
+from app.services.notifier import EmailNotifier, TelegramNotifier
+from app.services.notifier_registry import NotifierRegistry, notifier_registry
+
+
+def test_registry_builds_each_notifier_once():
+    factory = MagicMock(side_effect=lambda: MagicMock())
+    registry = NotifierRegistry({"email": factory})
+    first = registry.get("email")
+    assert registry.get("email") is first
+    assert registry.all() == {"email": first}
+    factory.assert_called_once()
+
+
+def test_registry_override_and_reset():
+    registry = NotifierRegistry({"email": MagicMock})
+    fake = MagicMock()
+    registry.override("email", fake)
+    assert registry.get("email") is fake
+    registry.reset()
+    assert registry.get("email") is not fake
+
+
+def test_registry_rebuilds_after_fork():
+    factory = MagicMock(side_effect=lambda: MagicMock())
+    registry = NotifierRegistry({"email": factory})
+    parent = registry.get("email")
+    with patch("app.services.notifier_registry.os.getpid", return_value=-1):
+        assert registry.get("email") is not parent
+    assert factory.call_count == 2
+
+
+def test_default_registry_reuses_ses_client():
+    notifier_registry.reset()
+    with patch("app.services.email_service.boto3.client") as boto_client:
+        notifiers = notifier_registry.all()
+        notifier_registry.all()
+    assert isinstance(notifiers["email"], EmailNotifier)
+    assert isinstance(notifiers["telegram"], TelegramNotifier)
+    boto_client.assert_called_once_with("ses", region_name=Config.AWS_SES_REGION)
+
+
+def test_registry_shares_one_limiter_per_limited_channel():
+    registry = NotifierRegistry({"email": MagicMock, "telegram": MagicMock},
+                                rate_limits={"email": 14, "telegram": 0})
+    limiters = registry.limiters()
+    assert list(limiters) == ["email"]
+    assert limiters["email"].max_rate == 14
+    assert registry.limiters()["email"] is limiters["email"]
+    registry.reset()
+    assert registry.limiters()["email"] is not limiters["email"]
+
+
+def test_default_telegram_notifier_leaves_429s_to_the_limiter():
+    notifier_registry.reset()
+    assert notifier_registry.get("telegram")._max_retries == 0
+    notifier_registry.reset()
+    with patch.object(Config, "NOTIFY_TELEGRAM_RATE_PER_SECOND", 0):
+        assert notifier_registry.get("telegram")._max_retries == Config.TELEGRAM_MAX_RETRIES
+    notifier_registry.reset()
@@ -0,0 +1,164 @@
+import threading
+import time
+from http import HTTPStatus
+from unittest.mock import patch
+
+import bcrypt
+import pytest
+
+import app.services.password_hasher as hasher_module
+from app.db.settings import SettingsResource
+from app.db.users import UserResource
+from app.services.password_hasher import (
+    PasswordHasher, PasswordPoolSaturated, ROUNDS_SETTING,
+    calibrate_rounds, hash_rounds, load_recorded_rounds, record_rounds,
+)
+from tests.utils import auth_header
+
+
+def test_pool_hash_and_verify_roundtrip():
+    hasher = PasswordHasher(workers=1, max_pending=2)
+    hashed = hasher.hash("pass123", rounds=4)
+    assert bcrypt.checkpw(b"pass123", hashed)
+    assert hasher.verify("pass123", hashed) is True
+    assert hasher.verify("wrong", hashed) is False
+    stats = hasher.stats()
+    assert stats["completed"] == 3
+    assert stats["in_flight"] == 0
+
+
+def test_saturated_hasher_rejects_immediately():
+    hasher = PasswordHasher(workers=0, max_pending=1)
+    started, release = threading.Event(), threading.Event()
+
+    def slow_hash(password, rounds):
+        started.set()
+        release.wait(5)
+        return b""
+
+    with patch.object(hasher_module, "_hash", slow_hash):
+        worker = threading.Thread(target=hasher.hash, args=("a",))
+        worker.start()
+        started.wait(5)
+        with pytest.raises(PasswordPoolSaturated):
+            hasher.hash("b")
+        assert hasher.stats()["in_flight"] == 1
+        release.set()
+        worker.join()
+
+    stats = hasher.stats()
+    assert stats["rejected"] == 1
+    assert stats["peak_in_flight"] == 1
+    assert stats["in_flight"] == 0
+
+
+def test_login_returns_503_when_pool_saturated(client, member_token):
+    with patch.object(hasher_module.password_hasher, "verify", side_effect=PasswordPoolSaturated("busy")):
+        res = client.post("/auth/login", json={"email": "member@test.com", "password": "pass123"})
+    assert res.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert res.headers["Retry-After"] == "1"
+
+
+def test_timed_out_hash_keeps_its_slot_until_the_worker_finishes():
+    hasher = PasswordHasher(workers=1, max_pending=1, timeout=0.05)
+    with pytest.raises(PasswordPoolSaturated, match="timed out"):
+        hasher.hash("pass123", rounds=13)
+    assert hasher.stats()["timed_out"] == 1
+    # The worker is still hashing, so the pool is still full
+    with pytest.raises(PasswordPoolSaturated, match="Too many"):
+        hasher.hash("pass123", rounds=4)
+    deadline = time.monotonic() + 30
+    while hasher.stats()["in_flight"] and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert hasher.stats()["in_flight"] == 0
+    hasher.timeout = 30
+    assert hasher.verify("pass123", hasher.hash("pass123", rounds=4))
+
+
+def test_login_returns_503_when_hash_times_out(client):
+    client.post("/auth/register", json={
+        "name": "A", "email": "a@test.com", "phone": "1", "password": "pass123",
+    })
+    with patch.object(hasher_module.password_hasher, "verify",
+                      side_effect=PasswordPoolSaturated("Password operation timed out")):
+        res = client.post("/auth/login", json={"email": "a@test.com", "password": "pass123"})
+    assert res.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert res.headers["Retry-After"]
+
+
+def test_register_returns_503_when_pool_saturated(client):
+    with patch.object(hasher_module.password_hasher, "hash", side_effect=PasswordPoolSaturated("busy")):
+        res = client.post("/auth/register", json={
+            "name": "A", "email": "a@test.com", "phone": "1", "password": "pass123",
+        })
+    assert res.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+
+
+def test_password_pool_stats_endpoint(client, admin_token, member_token):
+    res = client.get("/health/passwords", headers=auth_header(admin_token))
+    assert res.status_code == HTTPStatus.OK
+    assert {"workers", "max_pending", "in_flight", "rejected"} <= set(res.get_json()["message"])
+    res = client.get("/health/passwords", headers=auth_header(member_token))
+    assert res.status_code == HTTPStatus.FORBIDDEN
+
+
+def test_hash_uses_configured_rounds():
+    hasher = PasswordHasher(workers=0, max_pending=1, rounds=5)
+    hashed = hasher.hash("pass123")
+    assert hash_rounds(hashed) == 5
+    assert not hasher.needs_rehash(hashed)
+    hasher.rounds = 6
+    assert hasher.needs_rehash(hashed)
+
+
+def test_calibrate_rounds_stays_within_bounds():
+    rounds, elapsed_ms = calibrate_rounds(target_ms=0, min_rounds=4, max_rounds=6)
+    assert rounds == 4
+    assert elapsed_ms > 0
+    rounds, _ = calibrate_rounds(target_ms=10_000, min_rounds=4, max_rounds=6)
+    assert rounds == 6
+
+
+def test_recorded_rounds_are_adopted(client):
+    original = hasher_module.password_hasher.rounds
+    try:
+        record_rounds(11, 120.0, 250)
+        load_recorded_rounds()
+        assert hasher_module.password_hasher.rounds == 11
+        assert SettingsResource().get(ROUNDS_SETTING) == 11
+    finally:
+        SettingsResource().collection.delete_many({})
+        hasher_module.password_hasher.rounds = original
+
+
+def test_login_rehashes_when_cost_differs(client, member_token):
+    users = UserResource()
+    stored = users.collection.find_one({"email": "member@test.com"})["password"]
+    original = hasher_module.password_hasher.rounds
+    hasher_module.password_hasher.rounds = 4
+    try:
+        res = client.post("/auth/login", json={"email": "member@test.com", "password": "pass123"})
+        assert res.status_code == HTTPStatus.OK
+        rehashed = users.collection.find_one({"email": "member@test.com"})["password"]
+        assert hash_rounds(stored) == original
+        assert hash_rounds(rehashed) == 4
+        assert bcrypt.checkpw(b"pass123", rehashed)
+
+        res = client.post("/auth/login", json={"email": "member@test.com", "password": "pass123"})
+        assert res.status_code == HTTPStatus.OK
+        assert users.collection.find_one({"email": "member@test.com"})["password"] == rehashed
+    finally:
+        hasher_module.password_hasher.rounds = original
+
+
+def test_failed_login_does_not_rehash(client, member_token):
+    users = UserResource()
+    stored = users.collection.find_one({"email": "member@test.com"})["password"]
+    original = hasher_module.password_hasher.rounds
+    hasher_module.password_hasher.rounds = 4
+    try:
+        res = client.post("/auth/login", json={"email": "member@test.com", "password": "wrong"})
+        assert res.status_code == HTTPStatus.UNAUTHORIZED
+        assert users.collection.find_one({"email": "member@test.com"})["password"] == stored
+    finally:
+        hasher_module.password_hasher.rounds = original
@@ -0,0 +1,61 @@
+import threading
+import time
+
+from app.services.rate_limiter import TokenBucket
+
+
+def test_bucket_allows_burst_then_paces():
+    bucket = TokenBucket(rate=50, burst=5)
+    started = time.monotonic()
+    for _ in range(10):
+        assert bucket.acquire()
+    # 5 from the full bucket, 5 more at 50/s
+    assert 0.08 <= time.monotonic() - started < 0.5
+
+
+def test_bucket_large_request_waits_for_full_bucket_and_leaves_debt():
+    bucket = TokenBucket(rate=100, burst=10)
+    assert bucket.acquire(30)
+    started = time.monotonic()
+    assert bucket.acquire(1)
+    # the 20-token debt is paid off before the next send
+    assert time.monotonic() - started >= 0.18
+
+
+def test_bucket_acquire_times_out():
+    bucket = TokenBucket(rate=1, burst=1)
+    assert bucket.acquire()
+    started = time.monotonic()
+    assert bucket.acquire(timeout=0.05) is False
+    assert time.monotonic() - started < 0.05
+
+
+def test_backoff_pauses_and_halves_rate():
+    bucket = TokenBucket(rate=100, burst=10)
+    bucket.backoff(retry_after=0.1)
+    assert bucket.stats() == {"rate": 50, "max_rate": 100, "throttled": 1}
+    started = time.monotonic()
+    assert bucket.acquire()
+    assert time.monotonic() - started >= 0.1
+
+
+def test_backoff_floors_at_min_rate_and_recovers():
+    bucket = TokenBucket(rate=80, min_rate=20)
+    for _ in range(5):
+        bucket.backoff(retry_after=0.001)
+    assert bucket.rate == 20
+    for _ in range(20):
+        bucket.record_success()
+    assert bucket.rate == 80
+
+
+def test_bucket_shared_between_threads():
+    bucket = TokenBucket(rate=100, burst=1)
+    started = time.monotonic()
+    threads = [threading.Thread(target=lambda: [bucket.acquire() for _ in range(5)]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # 20 sends at 100/s no matter how many threads ask
+    assert time.monotonic() - started >= 0.18
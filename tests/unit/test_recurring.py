@@ -1,6 +1,8 @@
 from http import HTTPStatus
 from datetime import datetime, timedelta
+from unittest.mock import MagicMock
 
+from app.apis.classes import MAX_RECURRENCE_COUNT
 from app.db.fitness_classes import FitnessClassResource
 from tests.utils import auth_header, sample_class_data, future_date_str
 
@@ -30,6 +32,32 @@ def test_create_recurring_max_count(client, admin_token):
     assert len(resp.get_json()["class_ids"]) == 10
 
 
+def test_create_recurring_year_of_daily_sessions(client, admin_token):
+    base_date = future_date_str(days=1)
+    data = sample_class_data(date=base_date, recurrence="daily", recurrence_count=MAX_RECURRENCE_COUNT)
+    resp = client.post("/classes/", json=data, headers=auth_header(admin_token))
+    assert resp.status_code == HTTPStatus.CREATED
+
+    class_ids = resp.get_json()["class_ids"]
+    assert len(class_ids) == MAX_RECURRENCE_COUNT
+    fc = FitnessClassResource()
+    assert fc.get_fitness_class_by_id(class_ids[0])["date"] == base_date
+    last = datetime.strptime(base_date, "%Y-%m-%d") + timedelta(days=MAX_RECURRENCE_COUNT - 1)
+    assert fc.get_fitness_class_by_id(class_ids[-1])["date"] == last.strftime("%Y-%m-%d")
+
+
+def test_create_recurring_uses_single_batch_insert():
+    fc = FitnessClassResource()
+    fc.collection = MagicMock(wraps=fc.collection)
+    class_ids = fc.create_recurring_classes(
+        "Yoga", "desc", future_date_str(), "10:00", "11:00", "Gym", "Jane", 10,
+        "admin@test.com", recurrence="weekly", count=5,
+    )
+    assert len(class_ids) == 5
+    fc.collection.insert_many.assert_called_once()
+    fc.collection.insert_one.assert_not_called()
+
+
 def test_create_recurring_invalid_type(client, admin_token):
     data = sample_class_data(recurrence="monthly", recurrence_count=3)
     resp = client.post("/classes/", json=data, headers=auth_header(admin_token))
@@ -43,7 +71,7 @@ def test_create_recurring_count_too_small(client, admin_token):
 
 
 def test_create_recurring_count_too_large(client, admin_token):
-    data = sample_class_data(recurrence="daily", recurrence_count=11)
+    data = sample_class_data(recurrence="daily", recurrence_count=MAX_RECURRENCE_COUNT + 1)
     resp = client.post("/classes/", json=data, headers=auth_header(admin_token))
     assert resp.status_code == HTTPStatus.BAD_REQUEST
 
@@ -1,7 +1,16 @@
 from http import HTTPStatus
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
 
+from bson import ObjectId
+
+from app.db import DB
 from app.db.fitness_classes import FitnessClassResource
-from tests.utils import auth_header, sample_class_data, past_date_str
+from app.db.reminder_jobs import ReminderJobResource, ABANDONED_ERROR
+from app.db.users import UserResource
+from app.services.reminders import check_reminder_jobs
+from app.services.scheduler import worker_id
+from tests.utils import auth_header, sample_class_data, past_date_str, wait_for_reminder_job
 
 def _create_class_with_booking(client, admin_token, member_token):
     resp = client.post("/classes/", json=sample_class_data(),
@@ -17,8 +26,13 @@ def test_remind_success_trainer(client, admin_token, member_token,
 
     resp = client.post(f"/classes/{class_id}/remind",
                        headers=auth_header(trainer_token))
-    assert resp.status_code == HTTPStatus.OK
-    assert "1 participants" in resp.get_json()["message"]
+    assert resp.status_code == HTTPStatus.ACCEPTED
+    job_id = resp.get_json()["job_id"]
+    assert resp.headers["Location"].endswith(f"/classes/reminders/{job_id}")
+    job = wait_for_reminder_job(client, trainer_token, job_id)
+    assert job["status"] == "completed"
+    assert job["participants_reached"] == 1
+    assert job["channels"]["email"] == {"sent": 1, "failed": 0, "timed_out": 0}
     mock_email_service.send_reminder.assert_called_once()
 
 def test_remind_success_admin(client, admin_token, member_token,
@@ -27,7 +41,9 @@ def test_remind_success_admin(client, admin_token, member_token,
 
     resp = client.post(f"/classes/{class_id}/remind",
                        headers=auth_header(admin_token))
-    assert resp.status_code == HTTPStatus.OK
+    assert resp.status_code == HTTPStatus.ACCEPTED
+    job = wait_for_reminder_job(client, admin_token, resp.get_json()["job_id"])
+    assert job["participants_reached"] == 1
 
 def test_remind_forbidden_member(client, member_token, admin_token,
                                  created_class_id, mock_email_service):
@@ -77,8 +93,11 @@ def test_remind_email_service_failure(client, admin_token, member_token,
 
     resp = client.post(f"/classes/{class_id}/remind",
                        headers=auth_header(admin_token))
-    assert resp.status_code == HTTPStatus.OK
-    assert "0 participants" in resp.get_json()["message"]
+    assert resp.status_code == HTTPStatus.ACCEPTED
+    job = wait_for_reminder_job(client, admin_token, resp.get_json()["job_id"])
+    assert job["status"] == "completed"
+    assert job["participants_reached"] == 0
+    assert job["channels"]["email"]["failed"] == 1
 
 
 def test_remind_telegram_channel(client, admin_token, member_token,
@@ -93,8 +112,9 @@ def test_remind_telegram_channel(client, admin_token, member_token,
 
     resp = client.post(f"/classes/{class_id}/remind",
                        headers=auth_header(trainer_token))
-    assert resp.status_code == HTTPStatus.OK
-    assert "1 participants" in resp.get_json()["message"]
+    assert resp.status_code == HTTPStatus.ACCEPTED
+    job = wait_for_reminder_job(client, trainer_token, resp.get_json()["job_id"])
+    assert job["participants_reached"] == 1
     mock_telegram_requests.assert_called_once()
 
 
@@ -110,7 +130,74 @@ def test_remind_both_channels(client, admin_token, member_token,
 
     resp = client.post(f"/classes/{class_id}/remind",
                        headers=auth_header(trainer_token))
-    assert resp.status_code == HTTPStatus.OK
-    assert "1 participants" in resp.get_json()["message"]
+    assert resp.status_code == HTTPStatus.ACCEPTED
+    job = wait_for_reminder_job(client, trainer_token, resp.get_json()["job_id"])
+    assert job["participants_reached"] == 1
     mock_email_service.send_reminder.assert_called_once()
     mock_telegram_requests.assert_called_once()
+
+
+def test_remind_looks_up_participants_in_one_query(client, admin_token, member_token,
+                                                   trainer_token, mock_email_service):
+    class_id = _create_class_with_booking(client, admin_token, member_token)
+    for i in range(3):
+        client.post("/auth/register", json={
+            "name": f"Extra {i}", "email": f"extra{i}@test.com",
+            "phone": "+1", "password": "pass123",
+        })
+        login = client.post("/auth/login", json={"email": f"extra{i}@test.com", "password": "pass123"})
+        client.post(f"/classes/{class_id}/book",
+                    headers=auth_header(login.get_json()["access_token"]))
+
+    users = DB.get_collection("users")
+    with patch.object(UserResource, "get_user_by_email", side_effect=AssertionError("per-user lookup")), \
+         patch.object(users, "find", wraps=users.find) as find:
+        resp = client.post(f"/classes/{class_id}/remind",
+                           headers=auth_header(trainer_token))
+        job = wait_for_reminder_job(client, trainer_token, resp.get_json()["job_id"])
+    assert job["participants_reached"] == 4
+    assert job["sends_total"] == job["sends_completed"] == 4
+    assert find.call_count == 1
+    assert mock_email_service.send_reminder.call_count == 4
+
+
+def test_reminder_job_status_not_found(client, trainer_token):
+    for job_id in ("000000000000000000000000", "bad-id"):
+        resp = client.get(f"/classes/reminders/{job_id}", headers=auth_header(trainer_token))
+        assert resp.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_reminder_job_status_forbidden_member(client, member_token):
+    resp = client.get("/classes/reminders/000000000000000000000000", headers=auth_header(member_token))
+    assert resp.status_code == HTTPStatus.FORBIDDEN
+
+
+def test_reminder_job_records_failure(client, admin_token, member_token, trainer_token,
+                                      mock_email_service):
+    class_id = _create_class_with_booking(client, admin_token, member_token)
+    with patch("app.services.reminders.build_recipients", side_effect=RuntimeError("boom")):
+        resp = client.post(f"/classes/{class_id}/remind", headers=auth_header(trainer_token))
+        job = wait_for_reminder_job(client, trainer_token, resp.get_json()["job_id"])
+    assert job["status"] == "failed"
+    assert job["error"] == "boom"
+
+
+def test_abandoned_reminder_jobs_are_failed(client, trainer_token):
+    jobs = ReminderJobResource()
+    stale = datetime.now(timezone.utc) - timedelta(hours=1)
+    mine = jobs.create_job("class", "trainer@test.com", owner=worker_id())
+    gone = jobs.create_job("class", "trainer@test.com", owner="old-host:1")
+    legacy = jobs.create_job("class", "trainer@test.com", owner="old-host:1")
+    jobs._set(mine, {"status": "running", "heartbeat_at": stale})
+    jobs._set(gone, {"status": "running", "heartbeat_at": stale})
+    jobs.collection.update_one({"_id": ObjectId(legacy)}, {"$unset": {"heartbeat_at": "", "owner": ""}})
+
+    assert check_reminder_jobs(heartbeat_seconds=30) == 2
+
+    def status(job_id):
+        return client.get(f"/classes/reminders/{job_id}", headers=auth_header(trainer_token)).get_json()["message"]
+    assert status(mine)["status"] == "running"
+    for job_id in (gone, legacy):
+        assert status(job_id)["status"] == "failed"
+        assert status(job_id)["error"] == ABANDONED_ERROR
+    jobs.delete_all_jobs()
@@ -0,0 +1,58 @@
+import json
+from http import HTTPStatus
+
+from tests.unit.conftest import _get_token
+from tests.utils import auth_header, sample_class_data, future_date_str
+
+NDJSON = {"Accept": "application/x-ndjson"}
+
+
+def _lines(resp):
+    return [json.loads(line) for line in resp.get_data(as_text=True).splitlines()]
+
+
+def test_stream_classes_as_ndjson(client, admin_token):
+    for day in range(1, 4):
+        client.post("/classes/", json=sample_class_data(name=f"C{day}", date=future_date_str(days=day)),
+                    headers=auth_header(admin_token))
+    resp = client.get("/classes/", headers=NDJSON)
+    assert resp.status_code == HTTPStatus.OK
+    assert resp.mimetype == "application/x-ndjson"
+    classes = _lines(resp)
+    assert [c["name"] for c in classes] == ["C1", "C2", "C3"]
+    assert all("participants" not in c for c in classes)
+    assert classes[0]["start_at"].startswith(future_date_str(days=1))
+
+
+def test_stream_classes_applies_filters_and_limit(client, admin_token):
+    for day in range(1, 4):
+        client.post("/classes/", json=sample_class_data(name=f"C{day}", date=future_date_str(days=day)),
+                    headers=auth_header(admin_token))
+    resp = client.get(f"/classes/?limit=1&date_from={future_date_str(days=2)}", headers=NDJSON)
+    assert [c["name"] for c in _lines(resp)] == ["C2"]
+
+
+def test_stream_classes_not_capped_by_page_size(client, admin_token):
+    resp = client.get("/classes/?limit=1000", headers=NDJSON)
+    assert resp.status_code == HTTPStatus.OK
+
+
+def test_stream_classes_invalid_cursor(client):
+    resp = client.get("/classes/?after=bogus", headers=NDJSON)
+    assert resp.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_stream_participants(client, admin_token, created_class_id):
+    for i in range(3):
+        token = _get_token(client, f"M{i}", f"m{i}@test.com", "+1", "pass123", "member")
+        client.post(f"/classes/{created_class_id}/book", headers=auth_header(token))
+    resp = client.get(f"/classes/{created_class_id}/participants",
+                      headers={**NDJSON, **auth_header(admin_token)})
+    assert resp.status_code == HTTPStatus.OK
+    assert [p["email"] for p in _lines(resp)] == ["m0@test.com", "m1@test.com", "m2@test.com"]
+
+
+def test_stream_participants_class_not_found(client, admin_token):
+    resp = client.get("/classes/000000000000000000000000/participants",
+                      headers={**NDJSON, **auth_header(admin_token)})
+    assert resp.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,91 @@
+from http import HTTPStatus
+
+import pytest
+
+from app.db.users import UserResource, normalize_name
+from tests.utils import auth_header
+
+
+def _seed(ur):
+    ur.add_multiple_users([
+        {"name": "Zoë Adams", "email": "zoe@t.com", "role": "member"},
+        {"name": "zoe baker", "email": "zb@t.com", "role": "trainer"},
+        {"name": "Adam Zoeller", "email": "az@t.com", "role": "member"},
+        {"name": "Bob", "email": "bob@t.com", "role": "member"},
+    ])
+
+
+def test_normalize_name():
+    assert normalize_name("  Zoë   ADAMS ") == "zoe adams"
+
+
+def test_prefix_search_is_case_and_accent_insensitive():
+    ur = UserResource()
+    _seed(ur)
+    names = [u["name"] for u in ur.get_users(name="ZOE")]
+    assert names == ["Zoë Adams", "zoe baker"]
+
+
+def test_prefix_search_is_anchored():
+    ur = UserResource()
+    _seed(ur)
+    assert [u["name"] for u in ur.get_users(name="adams")] == []
+
+
+def test_token_search_matches_any_word():
+    ur = UserResource()
+    _seed(ur)
+    names = [u["name"] for u in ur.get_users(name="zoe", match="token")]
+    assert names == ["Adam Zoeller", "Zoë Adams", "zoe baker"]
+
+
+def test_search_with_role_filter():
+    ur = UserResource()
+    _seed(ur)
+    assert [u["name"] for u in ur.get_users(name="zoe", role="trainer")] == ["zoe baker"]
+
+
+def test_search_escapes_regex_characters():
+    ur = UserResource()
+    _seed(ur)
+    assert ur.get_users(name=".*") == []
+
+
+def test_search_never_returns_passwords():
+    ur = UserResource()
+    ur.create_user("Alice", "alice@test.com", "+1", "member", "pass123")
+    user = ur.get_users(name="ali")[0]
+    assert "password" not in user
+    assert "name_normalized" not in user
+
+
+def test_search_invalid_match():
+    with pytest.raises(ValueError):
+        UserResource().get_users(name="a", match="fuzzy")
+
+
+def test_backfill_search_fields():
+    ur = UserResource()
+    ur.collection.insert_one({"name": "Legacy User", "email": "legacy@t.com", "role": "member"})
+    assert ur.backfill_search_fields() == 1
+    assert [u["name"] for u in ur.get_users(name="legacy")] == ["Legacy User"]
+
+
+def test_search_endpoint_paginates(client, admin_token):
+    _seed(UserResource())
+    first = client.get("/users/?name=zoe&match=token&limit=2", headers=auth_header(admin_token)).get_json()
+    assert [u["name"] for u in first["message"]] == ["Adam Zoeller", "Zoë Adams"]
+    second = client.get(f"/users/?name=zoe&match=token&limit=2&after={first['next_cursor']}",
+                        headers=auth_header(admin_token)).get_json()
+    assert [u["name"] for u in second["message"]] == ["zoe baker"]
+    assert second["next_cursor"] is None
+
+
+def test_search_endpoint_forbidden_member(client, member_token):
+    resp = client.get("/users/", headers=auth_header(member_token))
+    assert resp.status_code == HTTPStatus.FORBIDDEN
+
+
+def test_search_endpoint_invalid_cursor(client, admin_token):
+    resp = client.get("/users/?after=bogus", headers=auth_header(admin_token))
+    assert resp.status_code == HTTPStatus.BAD_REQUEST
@@ -1,5 +1,6 @@
 from app.db.constants import ID
 from datetime import datetime, timedelta
+import time
 
 
 def exclude_keys(item: dict, keys_to_exclude: set):
@@ -38,4 +39,13 @@ def sample_class_data(**overrides):
         "capacity": 10,
     }
     data.update(overrides)
-    return data
\ No newline at end of file
+    return data
+
+def wait_for_reminder_job(client, token, job_id, timeout=5):
+    """Poll a reminder job until it completes or fails, returning its last status."""
+    deadline = time.monotonic() + timeout
+    while True:
+        job = client.get(f"/classes/reminders/{job_id}", headers=auth_header(token)).get_json()["message"]
+        if job["status"] in ("completed", "failed") or time.monotonic() > deadline:
+            return job
+        time.sleep(0.02)